@@ -1,15 +1,183 @@
 from Player import Player
-from Board import Board, spaceState
+from Board import spaceState
+import Bitboard
+import Endgame
+import Evaluation
+import OpeningBook
+import ParallelSearch
+import SearchStats
+import Symmetry
+import Trace
+import TranspositionTable as tt
+import contextlib
+from functools import lru_cache
 import logging
+import math
+import time
 
 logger = logging.getLogger(__name__)
 
+# Search algorithms choose_move_minimax can use
+SEARCH_MINIMAX = 'minimax'
+SEARCH_ALPHABETA = 'alphabeta'
+
+# In time-bounded mode, check the clock once every this many nodes
+_CLOCK_CHECK_NODES = 256
+
+
+class _SearchTimeout(Exception):
+    # Raised inside the search when the per-move time budget runs out
+    pass
+
+
+class _SearchCancelled(Exception):
+    # Raised inside the search when AI.cancel_event is set
+    pass
+
+
+@lru_cache(maxsize=None)
+def _square_priority(size):
+    # Static move-ordering rank per square index (lower is searched first):
+    # corners, then edges, then the interior, then the C- and X-squares
+    # next to the corners, which usually hand the corner to the opponent
+    last = size - 1
+    corners = {(0, 0), (last, 0), (0, last), (last, last)}
+    ranks = []
+    for y in range(size):
+        for x in range(size):
+            near_corner = any(abs(x - cx) <= 1 and abs(y - cy) <= 1 for cx, cy in corners)
+            on_edge = x in (0, last) or y in (0, last)
+            if (x, y) in corners:
+                rank = 0
+            elif near_corner and on_edge:
+                rank = 3  # C-square
+            elif near_corner:
+                rank = 4  # X-square
+            elif on_edge:
+                rank = 1
+            else:
+                rank = 2
+            ranks.append(rank)
+    return tuple(ranks)
+
+
+def _state_slots(cls):
+    # Every slot declared along `cls`'s class hierarchy
+    names = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get('__slots__', ()):
+            names.append(name)
+    return names
+
+
+# Bitboard core of the default evaluate_board, from the point of view of `own`
+_evaluate_bits = Evaluation.evaluate_mobility
+
+
 class AI(Player):
-    def __init__(self, color, depth=2):
+    __slots__ = ('debug', 'depth', 'search', 'nodes', '_next_check', 'tt_bytes', 'tt', 'time_ms',
+                 'completed_depth', '_deadline', 'cancel_event', 'workers', '_pool', 'evaluator',
+                 'endgame_empties', 'book', 'symmetric_tt', '_opponent', 'stats', 'profile_hook')
+
+    def __init__(self, color, depth=2, search=SEARCH_ALPHABETA, tt_bytes=tt.DEFAULT_BYTES, time_ms=None,
+                 workers=1, evaluator=None, endgame_empties=Endgame.DEFAULT_EMPTIES,
+                 book=None, symmetric_tt=None):
         super().__init__(color, mode="AI")
         self.debug = False
         # search depth for minimax
         self.depth = int(depth)
+        # which tree search choose_move_minimax runs (SEARCH_MINIMAX or SEARCH_ALPHABETA)
+        self.search = search
+        # nodes visited by the most recent search, for comparing algorithms
+        self.nodes = 0
+        # node count at which the alpha-beta search next checks its deadline/cancel hook
+        self._next_check = 0
+        # transposition table shared by alpha-beta searches (tt_bytes=0 disables it)
+        self.tt_bytes = tt_bytes
+        self.tt = tt.TranspositionTable(tt_bytes) if tt_bytes else None
+        # per-move time budget in milliseconds; when set, choose_move_minimax
+        # deepens iteratively until it runs out instead of stopping at self.depth
+        self.time_ms = time_ms
+        # depth of the last completed iteration of the most recent search
+        self.completed_depth = 0
+        self._deadline = None
+        # optional threading/multiprocessing Event; setting it stops a running
+        # search, which then returns None
+        self.cancel_event = None
+        # worker processes for fixed-depth alpha-beta searches; above 1 the root
+        # moves are split across a process pool (see ParallelSearch)
+        self.workers = int(workers)
+        self._pool = None
+        # static evaluation used at the search leaves: an Evaluation evaluator
+        # or its name ('mobility', the default, or 'pattern[:tables file]')
+        self.evaluator = Evaluation.get_evaluator(evaluator)
+        # with this many empty squares or fewer, choose_move_minimax solves the
+        # game exactly (see Endgame) instead of searching heuristically; 0 never does
+        self.endgame_empties = endgame_empties
+        # opening book (an OpeningBook or a path to one) consulted before searching
+        self.book = OpeningBook.open_book(book)
+        # key transposition-table entries by the position's canonical symmetric
+        # form, so rotated/reflected positions share entries (see Symmetry).
+        # None decides per search: only a root that is itself symmetric has
+        # mirror-image subtrees worth sharing, elsewhere the keys cost more than
+        # they find. Either way the keys are only used with an evaluator whose
+        # `symmetric` attribute is true: sharing entries between positions it
+        # scores differently would change the search result.
+        self.symmetric_tt = symmetric_tt
+        # Player for the other colour, made once and reused by Minimax's
+        # minimizing nodes
+        self._opponent = Player(self.opponent_color)
+        # SearchStats of the most recent choose_move_minimax (see SearchStats)
+        self.stats = SearchStats.SearchStats()
+        # optional callable returning a context manager each search runs inside,
+        # e.g. SearchStats.cprofile_hook() to profile moves
+        self.profile_hook = None
+
+    def __getstate__(self):
+        # The transposition table and cancel hook belong to this process; a
+        # pickled copy (e.g. one sent to a worker process) starts with an empty table
+        state = {name: getattr(self, name) for name in _state_slots(type(self))
+                 if hasattr(self, name)}
+        # subclasses that do not declare __slots__ keep the rest in a __dict__
+        state.update(getattr(self, '__dict__', {}))
+        state['tt'] = None
+        state['cancel_event'] = None
+        state['_deadline'] = None
+        state['_pool'] = None
+        state['profile_hook'] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.tt = tt.TranspositionTable(self.tt_bytes) if self.tt_bytes else None
+
+    def __copy__(self):
+        # A shallow copy in the same process shares the transposition table
+        # (and book) instead of allocating a fresh one. The worker pool stays
+        # with the original; a copy that searches in parallel starts its own
+        # and must close() it.
+        clone = object.__new__(type(self))
+        for name in _state_slots(type(self)):
+            if hasattr(self, name):
+                setattr(clone, name, getattr(self, name))
+        if hasattr(self, '__dict__'):
+            clone.__dict__.update(self.__dict__)
+        clone._pool = None
+        return clone
+
+    def close(self):
+        # Shut down the worker pool used by parallel searches, if any
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _check_stop(self):
+        # Called every _CLOCK_CHECK_NODES nodes while a deadline or cancel hook is armed
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise _SearchCancelled()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise _SearchTimeout()
 
     def choose_move(self, board):
         # This function should implement the logic for the AI to choose a move based on the current state of the board
@@ -32,71 +200,131 @@ class AI(Player):
         return None
     
     def evaluate_board(self, board):
+        # Score the board for this AI with self.evaluator. The default one is
         # Evaluation = 0.5 * (normalized number of possible moves)
         #            + 0.5 * (normalized piece difference)
-        # Normalise both terms by the total number of cells (board.size*board.size)
-        max_cells = board.size * board.size if board.size > 0 else 1
-
-        # number of possible moves for this player
-        possible_moves = 0
-        for y in range(board.size):
-            for x in range(board.size):
-                if board.is_empty(x, y) and self.can_flip(x, y, board):
-                    possible_moves += 1
-        moves_term = possible_moves / max_cells
-
-        # piece difference (my pieces - opponent pieces)
-        my_count = 0
-        opp_count = 0
-        for row in board.board:
-            for cell in row:
-                if cell == self.color:
-                    my_count += 1
-                elif cell == self.opponent_color:
-                    opp_count += 1
-        pieces_term = (my_count - opp_count) / max_cells
-
-        val = 0.5 * moves_term + 0.5 * pieces_term
-        logger.debug('evaluate_board -> moves_term=%s pieces_term=%s value=%s', moves_term, pieces_term, val)
+        # with both terms normalised by the total number of cells (board.size*board.size)
+        own, opp = board.bitboards(self.color)
+        val = self.evaluator.evaluate(own, opp, board.size)
+        if Trace.enabled and Trace.count('evaluate_board'):
+            logger.debug('evaluate_board -> value=%s', val)
         return val
     
     def Minimax(self, board, depth, maximizing_player):
         # This function should implement the minimax algorithm for the AI to evaluate the game tree and choose the best move
         # It would need to recursively evaluate the possible moves for both players and return the best move for the AI
+        self.nodes += 1
+        if self.cancel_event is not None and self.nodes % _CLOCK_CHECK_NODES == 0:
+            self._check_stop()
         if depth == 0:
+            self.stats.evaluations += 1
             return self.evaluate_board(board)
 
+        stats = self.stats
+        ply = stats.root_depth - depth
+        stats.expanded[ply] += 1
         if maximizing_player:
             max_eval = float('-inf')
             # iterate valid moves for this player
             for y in range(board.size):
                 for x in range(board.size):
                     if board.is_empty(x, y) and self.can_flip(x, y, board):
-                        # Simulate the move on a cloned board
-                        clone = self._clone_board(board)
-                        self.makeMove(x, y, clone)
-                        eval = self.Minimax(clone, depth - 1, False)
+                        # Simulate the move in place and take it back afterwards
+                        flipped = self.makeMove(x, y, board)
+                        stats.children[ply] += 1
+                        try:
+                            eval = self.Minimax(board, depth - 1, False)
+                        finally:
+                            board.undo_move(x, y, flipped)
                         max_eval = max(max_eval, eval)
             return max_eval
         else:
             min_eval = float('inf')
-            # simulate opponent moves using a temporary Player instance
-            from Player import Player as _Player
-            opponent = _Player(self.opponent_color)
+            # simulate opponent moves with the reused opponent Player
+            opponent = self._opponent
             for y in range(board.size):
                 for x in range(board.size):
                     if board.is_empty(x, y) and opponent.can_flip(x, y, board):
-                        clone = self._clone_board(board)
-                        opponent.makeMove(x, y, clone)
-                        eval = self.Minimax(clone, depth - 1, True)
+                        flipped = opponent.makeMove(x, y, board)
+                        stats.children[ply] += 1
+                        try:
+                            eval = self.Minimax(board, depth - 1, True)
+                        finally:
+                            board.undo_move(x, y, flipped)
                         min_eval = min(min_eval, eval)
             return min_eval
 
-    def choose_move_minimax(self, board, depth=None):
+    def choose_move_minimax(self, board, depth=None, time_ms=None):
+        # With a time budget (time_ms here or self.time_ms) the search always uses
+        # alpha-beta, and `depth`, if given, caps how deep it may go
+        if time_ms is None:
+            time_ms = self.time_ms
+        self.nodes = 0
+        self._next_check = 0
+        start = time.perf_counter()
+        if self.book is not None:
+            move = self.book.lookup(board, self.color)
+            if move is not None:
+                self.completed_depth = 0
+                self.stats = SearchStats.SearchStats('book')
+                self.stats.seconds = time.perf_counter() - start
+                if self.debug:
+                    logger.debug('AI debug: choose_move_minimax book move %s', move)
+                return move
+        empties = board.size * board.size - Bitboard.popcount(board.black | board.white)
+        if empties <= self.endgame_empties:
+            method = 'endgame'
+        elif time_ms is not None:
+            method = 'timed'
+        elif self.search == SEARCH_ALPHABETA and self.workers > 1:
+            method = 'parallel'
+        elif self.search == SEARCH_ALPHABETA:
+            method = SEARCH_ALPHABETA
+        else:
+            method = SEARCH_MINIMAX
+        stats = self.stats = SearchStats.SearchStats(method)
+        table = self.tt
+        tt_hits, tt_misses = (table.hits, table.misses) if table is not None else (0, 0)
+        hook = self.profile_hook() if self.profile_hook is not None else contextlib.nullcontext()
+        try:
+            with hook:
+                if method == 'endgame':
+                    best_move, best_value = self._endgame_root(board, empties)
+                elif method == 'timed':
+                    best_move, best_value = self._timed_root(board, time_ms, depth)
+                else:
+                    if depth is None:
+                        depth = getattr(self, 'depth', 2)
+                    if method == 'parallel':
+                        best_move, best_value = self._parallel_root(board, depth)
+                    elif method == SEARCH_ALPHABETA:
+                        best_move, best_value = self._alphabeta_root(board, depth)
+                    else:
+                        best_move, best_value = self._minimax_root(board, depth)
+        except _SearchCancelled:
+            logger.debug('search cancelled after %s nodes', self.nodes)
+            return None
+        finally:
+            stats.nodes = self.nodes
+            stats.seconds = time.perf_counter() - start
+            if table is not None:
+                stats.tt_hits += table.hits - tt_hits
+                stats.tt_probes += table.hits - tt_hits + table.misses - tt_misses
+            if Trace.enabled:
+                Trace.count('search_nodes', self.nodes)
+                Trace.flush(logger, 'choose_move_minimax')
+        if self.debug:
+            logger.debug('AI debug: choose_move_minimax selected %s value=%s nodes=%s depth=%s',
+                         best_move, best_value, self.nodes, self.completed_depth)
+        return best_move
+
+    def _minimax_root(self, board, depth):
+        start = time.perf_counter()
+        stats = self.stats
+        stats.enter_root(depth)
+        stats.expanded[0] += 1
         best_move = None
         best_value = float('-inf')
-        if depth is None:
-            depth = getattr(self, 'depth', 2)
         for y in range(board.size):
             for x in range(board.size):
                 if board.is_empty(x, y) and self.can_flip(x, y, board):
@@ -105,19 +333,259 @@ class AI(Player):
                         if self.debug:
                             logger.debug('AI debug: minimax candidate (%s,%s) ignored, flips=0', x, y)
                         continue
-                    # Simulate the move
-                    clone = self._clone_board(board)
-                    self.makeMove(x, y, clone)
-                    move_value = self.Minimax(clone, depth - 1, False)
+                    # Simulate the move in place and take it back afterwards
+                    flipped = self.makeMove(x, y, board)
+                    stats.children[0] += 1
+                    try:
+                        move_value = self.Minimax(board, depth - 1, False)
+                    finally:
+                        board.undo_move(x, y, flipped)
                     if move_value > best_value:
                         best_value = move_value
                         best_move = (x, y)
-        if self.debug:
-            logger.debug('AI debug: choose_move_minimax selected %s value=%s', best_move, best_value)
-        return best_move 
-
-    def _clone_board(self, board):
-        # Create a deep copy of the board instance for safe simulation
-        new_board = Board(board.size)
-        new_board.board = [row.copy() for row in board.board]
-        return new_board
+        self._record_depth(depth, start, 0)
+        return best_move, best_value
+
+    def _endgame_root(self, board, empties):
+        # Exact solve; the value is the final disc differential for this AI
+        own, opp = board.bitboards(self.color)
+        check = self._check_stop if self.cancel_event is not None else None
+        solver = Endgame.EndgameSolver(board.size, check=check)
+        start = time.perf_counter()
+        try:
+            value, move = solver.solve(own, opp)
+        finally:
+            self.nodes = solver.nodes
+        self.completed_depth = empties
+        self._record_depth(empties, start, 0)
+        logger.debug('endgame solve: empties=%s value=%s nodes=%s elapsed_ms=%.1f', empties, value,
+                     solver.nodes, (time.perf_counter() - start) * 1000.0)
+        if not move:
+            return None, value
+        index = move.bit_length() - 1
+        return (index % board.size, index // board.size), value
+
+    def _count_root(self, moves):
+        stats = self.stats
+        stats.expanded[0] += 1
+        stats.children[0] += len(moves)
+
+    def _record_depth(self, depth, start, nodes_before):
+        # Note a completed iteration to `depth` that began at perf_counter()
+        # `start` with self.nodes at `nodes_before`
+        self.stats.add_depth(depth, (time.perf_counter() - start) * 1000.0, self.nodes - nodes_before)
+
+    def _ordered_moves(self, own, opp, size, first=0):
+        # Legal moves as single-bit ints, `first` (if legal) then by square priority
+        priority = _square_priority(size)
+        legal = Bitboard.legal_moves(own, opp, size)
+        moves = sorted(Bitboard.iter_bits(legal), key=lambda m: priority[m.bit_length() - 1])
+        if first & legal:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _root_key(self, board):
+        # Search hash of the root: one Zobrist key, or with symmetric keys the
+        # hashes of all eight symmetric variants (tt.hash_variants); the search
+        # below follows whichever form it is given
+        black_to_move = self.color == spaceState.BLACK
+        symmetric = self.symmetric_tt
+        if not getattr(self.evaluator, 'symmetric', False):
+            symmetric = False
+        elif symmetric is None:
+            symmetric = Symmetry.is_symmetric(board.black, board.white, board.size)
+        if symmetric:
+            return tt.hash_variants(board.black, board.white, black_to_move, board.size)
+        return tt.hash_position(board.black, board.white, black_to_move, board.size)
+
+    def _alphabeta_root(self, board, depth):
+        # Iterative deepening over an alpha-beta root. Each iteration searches the
+        # previous iteration's best move first.
+        own, opp = board.bitboards(self.color)
+        key = self._root_key(board)
+        best_move = None
+        best_value = float('-inf')
+        pv = 0
+        self.completed_depth = 0
+        for iteration in range(1, depth + 1):
+            best_move, best_value, pv = self._alphabeta_iteration(own, opp, board.size, key, iteration, pv)
+            self.completed_depth = iteration
+            if best_move is None:
+                break
+        return best_move, best_value
+
+    def _parallel_root(self, board, depth):
+        # Shallower iterations run here to order the root moves; the final depth
+        # is split across self.workers processes. The result equals _alphabeta_root.
+        own, opp = board.bitboards(self.color)
+        size = board.size
+        key = self._root_key(board)
+        pv = 0
+        self.completed_depth = 0
+        for iteration in range(1, depth):
+            best_move, best_value, pv = self._alphabeta_iteration(own, opp, size, key, iteration, pv)
+            if best_move is None:
+                return best_move, best_value
+            self.completed_depth = iteration
+        start = time.perf_counter()
+        nodes_before = self.nodes
+        moves = self._ordered_moves(own, opp, size, first=pv)
+        self._count_root(moves)
+        if not moves:
+            return None, float('-inf')
+        if self._pool is None or self._pool.workers != self.workers:
+            self.close()
+            self._pool = ParallelSearch.RootSplitPool(self, self.workers)
+        try:
+            move, value, self.nodes = self._pool.search(self, own, opp, size, key, depth, moves,
+                                                        cancel_event=self.cancel_event)
+        except InterruptedError:
+            raise _SearchCancelled()
+        self.completed_depth = depth
+        self._record_depth(depth, start, nodes_before)
+        if not move:
+            return None, value
+        index = move.bit_length() - 1
+        return (index % size, index // size), value
+
+    def _timed_root(self, board, time_ms, max_depth=None):
+        # Deepen until the budget runs out and return the best move of the last
+        # completed iteration. Depth 1 always completes so there is a move to play.
+        own, opp = board.bitboards(self.color)
+        empties = board.size * board.size - Bitboard.popcount(board.black | board.white)
+        if max_depth is None:
+            max_depth = max(1, empties)
+        key = self._root_key(board)
+        start = time.perf_counter()
+        deadline = start + time_ms / 1000.0
+        best_move = None
+        best_value = float('-inf')
+        pv = 0
+        self.completed_depth = 0
+        try:
+            for iteration in range(1, max_depth + 1):
+                # arm the deadline only once a move is in hand
+                self._deadline = deadline if iteration > 1 else None
+                move, value, pv = self._alphabeta_iteration(own, opp, board.size, key, iteration, pv)
+                best_move, best_value = move, value
+                self.completed_depth = iteration
+                if best_move is None or time.perf_counter() >= deadline:
+                    break
+        except _SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+        logger.debug('timed search: depth=%s nodes=%s elapsed_ms=%.1f', self.completed_depth,
+                     self.nodes, (time.perf_counter() - start) * 1000.0)
+        return best_move, best_value
+
+    def _alphabeta_iteration(self, own, opp, size, key, depth, pv):
+        # One full-width alpha-beta pass at the root, `pv` (a move bit) first.
+        # Ties are broken towards the first move in row-major order so the
+        # result matches _minimax_root. Returns (move, value, move bit).
+        start = time.perf_counter()
+        nodes_before = self.nodes
+        best_move = None
+        best_value = float('-inf')
+        best_index = -1
+        moves = self._ordered_moves(own, opp, size, first=pv)
+        self._count_root(moves)
+        for move in moves:
+            index = move.bit_length() - 1
+            if best_move is not None and index < best_index:
+                # an earlier square wins ties, so it only needs to reach best_value
+                alpha = math.nextafter(best_value, float('-inf'))
+            else:
+                alpha = best_value
+            value = self._root_move_value(own, opp, size, key, depth, move, alpha)
+            if value > alpha:
+                best_value = value
+                best_move = (index % size, index // size)
+                best_index = index
+        self._record_depth(depth, start, nodes_before)
+        return best_move, best_value, (1 << best_index if best_move is not None else 0)
+
+    def _root_move_value(self, own, opp, size, key, depth, move, alpha):
+        # Value of root move `move` searched to `depth`; exact when it is above
+        # `alpha`, otherwise only known to be <= alpha
+        self.stats.enter_root(depth)
+        flips = Bitboard.flips_for_bit(own, opp, move, size)
+        update = tt.update_variants if type(key) is tuple else tt.update_hash
+        child_key = update(key, move, flips, self.color == spaceState.BLACK, size)
+        return -self._negamax(opp & ~flips, own | flips | move, size,
+                              depth - 1, float('-inf'), -alpha, False, child_key)
+
+    def _negamax(self, own, opp, size, depth, alpha, beta, own_is_self, key):
+        # Fail-soft alpha-beta over bitboards; `own` is the side to move and the
+        # value is from its point of view. Leaves use self.evaluator from this
+        # AI's side, as evaluate_board does, and, as in Minimax, a side with no
+        # moves scores -inf.
+        # `key` is the Zobrist hash of the position, updated move by move, or a
+        # tuple of the hashes of its eight symmetric variants (see _root_key).
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._next_check = self.nodes + _CLOCK_CHECK_NODES
+            if self._deadline is not None or self.cancel_event is not None:
+                self._check_stop()
+        stats = self.stats
+        if depth == 0:
+            stats.evaluations += 1
+            if own_is_self:
+                return self.evaluator.evaluate(own, opp, size)
+            return -self.evaluator.evaluate(opp, own, size)
+
+        table = self.tt
+        symmetric = type(key) is tuple
+        hash_move = 0
+        if table is not None:
+            if symmetric:
+                # entries and their moves live in the canonical variant's frame
+                table_key, t = tt.canonical_key(key)
+            else:
+                table_key = key
+            entry = table.probe(table_key)
+            if entry is not None:
+                _, entry_depth, score, bound, hash_move = entry
+                if symmetric and hash_move:
+                    hash_move = Symmetry.map_bit(hash_move, Symmetry.INVERSE[t], size)
+                # Only a search to the same depth gives the value this node would
+                # compute, so only those entries may cut; others still order moves.
+                if entry_depth == depth and (bound == tt.EXACT
+                                             or (bound == tt.LOWER and score >= beta)
+                                             or (bound == tt.UPPER and score <= alpha)):
+                    stats.tt_cutoffs += 1
+                    return score
+
+        mover_is_black = own_is_self == (self.color == spaceState.BLACK)
+        alpha_orig = alpha
+        best = float('-inf')
+        best_move = 0
+        update = tt.update_variants if symmetric else tt.update_hash
+        moves = self._ordered_moves(own, opp, size, first=hash_move)
+        ply = stats.root_depth - depth
+        stats.expanded[ply] += 1
+        stats.children[ply] += len(moves)
+        for move in moves:
+            flips = Bitboard.flips_for_bit(own, opp, move, size)
+            child_key = update(key, move, flips, mover_is_black, size)
+            value = -self._negamax(opp & ~flips, own | flips | move, size,
+                                   depth - 1, -beta, -max(alpha, best), not own_is_self, child_key)
+            if value > best:
+                best = value
+                best_move = move
+                if best >= beta:
+                    stats.cutoffs += 1
+                    break
+
+        if table is not None:
+            if best <= alpha_orig:
+                bound = tt.UPPER
+            elif best >= beta:
+                bound = tt.LOWER
+            else:
+                bound = tt.EXACT
+            if symmetric and best_move:
+                best_move = Symmetry.map_bit(best_move, t, size)
+            table.store(table_key, depth, best, bound, best_move)
+        return best
@@ -0,0 +1,109 @@
+"""NumPy-backed batch move generation and evaluation.
+
+Positions are stacked into boolean arrays of shape (N, size, size), indexed
+[n, y, x], one array for the side being evaluated (`own`) and one for its
+opponent (`opp`). Mobility, disc difference and optional positional weights
+are then computed for the whole batch with array operations instead of a
+Python loop per board. evaluate_batch without weights returns exactly what
+AI.evaluate_board returns for each position.
+
+This is for scoring many independent positions at once (training data,
+self-play records, analysis). The alpha-beta search does not use it: a search
+node has only about ten children and usually cuts off after the first few, too
+few to pay for building the arrays.
+
+NumPy is optional: without it this module imports, but every function raises
+ImportError.
+"""
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from Bitboard import DIRECTIONS
+
+
+def available():
+    return np is not None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for batch evaluation')
+
+
+def bits_to_array(values, size):
+    # Stack Python-int bitboards into a bool array of shape (len(values), size, size)
+    _require_numpy()
+    cells = size * size
+    nbytes = (cells + 7) // 8
+    buf = b''.join(v.to_bytes(nbytes, 'little') for v in values)
+    raw = np.frombuffer(buf, dtype=np.uint8).reshape(len(values), nbytes)
+    bits = np.unpackbits(raw, axis=1, bitorder='little')[:, :cells]
+    return bits.reshape(len(values), size, size).astype(bool)
+
+
+def stack_boards(boards, color):
+    # (own, opp) arrays for a list of Board objects from `color`'s point of view
+    _require_numpy()
+    if not boards:
+        raise ValueError('stack_boards needs at least one board')
+    size = boards[0].size
+    pairs = [board.bitboards(color) for board in boards]
+    return (bits_to_array([own for own, _ in pairs], size),
+            bits_to_array([opp for _, opp in pairs], size))
+
+
+def _shift(a, dx, dy):
+    # Move every cell of a (N, size, size) array one step by (dx, dy), dropping
+    # whatever falls off the edge (the array form of Bitboard._shift)
+    size = a.shape[-1]
+    out = np.zeros_like(a)
+    dst_y = slice(max(dy, 0), size + min(dy, 0))
+    src_y = slice(max(-dy, 0), size + min(-dy, 0))
+    dst_x = slice(max(dx, 0), size + min(dx, 0))
+    src_x = slice(max(-dx, 0), size + min(-dx, 0))
+    out[:, dst_y, dst_x] = a[:, src_y, src_x]
+    return out
+
+
+def legal_moves_batch(own, opp):
+    # Bool array of legal moves for `own` in every position of the batch
+    _require_numpy()
+    size = own.shape[-1]
+    empty = ~(own | opp)
+    moves = np.zeros_like(own)
+    for dx, dy in DIRECTIONS:
+        run = _shift(own, dx, dy) & opp
+        for _ in range(size - 3):
+            run |= _shift(run, dx, dy) & opp
+        moves |= _shift(run, dx, dy) & empty
+    return moves
+
+
+def mobility_batch(own, opp):
+    return legal_moves_batch(own, opp).sum(axis=(1, 2))
+
+
+def evaluate_batch(own, opp, weights=None):
+    # Evaluation of every position from `own`'s side:
+    #   0.5 * mobility / cells + 0.5 * disc difference / cells
+    # plus, if `weights` (a size x size array) is given, the weighted sum of
+    # own squares minus opponent squares
+    _require_numpy()
+    size = own.shape[-1]
+    max_cells = size * size if size > 0 else 1
+    moves_term = mobility_batch(own, opp) / max_cells
+    pieces_term = (own.sum(axis=(1, 2)) - opp.sum(axis=(1, 2))) / max_cells
+    value = 0.5 * moves_term + 0.5 * pieces_term
+    if weights is not None:
+        w = np.asarray(weights, dtype=np.float64)
+        value = value + (own * w).sum(axis=(1, 2)) - (opp * w).sum(axis=(1, 2))
+    return value
+
+
+def evaluate_bitboards(pairs, size, weights=None):
+    # evaluate_batch for a list of (own, opp) bitboard pairs; returns a list of floats
+    own = bits_to_array([o for o, _ in pairs], size)
+    opp = bits_to_array([p for _, p in pairs], size)
+    return evaluate_batch(own, opp, weights).tolist()
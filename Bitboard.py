@@ -0,0 +1,185 @@
+"""Bitboard rule engine used behind the Board/Player API.
+
+A position is two Python ints, one per colour, with bit (y * size + x) set
+when that colour occupies square (x, y). On an 8x8 board these are plain
+64-bit values; other sizes use the same code because Python ints are
+arbitrary precision. Move generation and flipping are done with
+shift-and-mask operations over whole bitboards instead of cell-by-cell walks.
+"""
+from functools import lru_cache
+
+# Same direction order as Player so flip lists come back in the same order
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+
+@lru_cache(maxsize=None)
+def rays(size):
+    # Per board size, for every square index and every direction (in DIRECTIONS
+    # order), the single-bit masks of the squares walked from that square
+    # outwards, nearest first. Shared by every Board/Player/AI of that size.
+    table = []
+    for index in range(size * size):
+        x, y = index % size, index // size
+        square_rays = []
+        for dx, dy in DIRECTIONS:
+            ray = []
+            cx, cy = x + dx, y + dy
+            while 0 <= cx < size and 0 <= cy < size:
+                ray.append(1 << (cy * size + cx))
+                cx += dx
+                cy += dy
+            square_rays.append(tuple(ray))
+        table.append(tuple(square_rays))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _capture_rays(size):
+    # rays() without the rays too short to capture anything (fewer than 2 squares)
+    return tuple(tuple(ray for ray in square_rays if len(ray) >= 2) for square_rays in rays(size))
+
+
+def ray_flips(own, opp, ray):
+    # Walk one ray once: the opponent discs captured along it, or 0 if the run
+    # of opponent discs is not capped by one of `own`
+    line = 0
+    for b in ray:
+        if opp & b:
+            line |= b
+            continue
+        if own & b:
+            return line
+        return 0
+    return 0
+
+
+@lru_cache(maxsize=None)
+def masks(size):
+    # Precompute, per board size, the full-board mask and for every direction
+    # the (shift, wrap mask) pair used to move a whole bitboard one step
+    full = (1 << (size * size)) - 1
+    not_first_col = 0
+    not_last_col = 0
+    for y in range(size):
+        for x in range(size):
+            bit = 1 << (y * size + x)
+            if x != 0:
+                not_first_col |= bit
+            if x != size - 1:
+                not_last_col |= bit
+    steps = []
+    for dx, dy in DIRECTIONS:
+        # A step east lands bits that wrapped from the last column in column 0,
+        # so those are masked away after the shift (and vice versa for west)
+        if dx == 1:
+            wrap = not_first_col
+        elif dx == -1:
+            wrap = not_last_col
+        else:
+            wrap = full
+        steps.append((dy * size + dx, wrap))
+    return full, tuple(steps)
+
+
+def bit(x, y, size):
+    return 1 << (y * size + x)
+
+
+def popcount(bb):
+    return bin(bb).count('1')
+
+
+def iter_squares(bb, size):
+    # Yield (x, y) for every set bit in row-major order (y, then x)
+    while bb:
+        low = bb & -bb
+        idx = low.bit_length() - 1
+        yield idx % size, idx // size
+        bb ^= low
+
+
+def iter_bits(bb):
+    # Yield each set bit of `bb` as its own single-bit int, lowest first
+    while bb:
+        low = bb & -bb
+        yield low
+        bb ^= low
+
+
+def _shift(bb, shift, wrap):
+    if shift > 0:
+        return (bb << shift) & wrap
+    return (bb >> -shift) & wrap
+
+
+def legal_moves(own, opp, size):
+    # Return a bitboard of every empty square where `own` would flip something.
+    # Per direction, `run` collects opponent discs reachable from an own disc;
+    # after two single steps it grows by doubling with `pairs` (opponent discs
+    # whose neighbour one step back is also an opponent disc), since a run of
+    # opponent discs can be at most size - 2 long.
+    full, steps = masks(size)
+    empty = ~(own | opp) & full
+    doublings = max(0, (size - 3) // 2)
+    moves = 0
+    for shift, wrap in steps:
+        mask = opp & wrap
+        if shift > 0:
+            run = (own << shift) & mask
+            run |= (run << shift) & mask
+            if doublings:
+                pairs = (mask << shift) & mask
+                double = shift + shift
+                for _ in range(doublings):
+                    run |= (run << double) & pairs
+            moves |= (run << shift) & wrap & empty
+        else:
+            shift = -shift
+            run = (own >> shift) & mask
+            run |= (run >> shift) & mask
+            if doublings:
+                pairs = (mask >> shift) & mask
+                double = shift + shift
+                for _ in range(doublings):
+                    run |= (run >> double) & pairs
+            moves |= (run >> shift) & wrap & empty
+    return moves
+
+
+def flip_mask(own, opp, x, y, size):
+    # Return the bitboard of opponent discs flipped by `own` playing at (x, y);
+    # 0 if the square is occupied or the move flips nothing
+    move = bit(x, y, size)
+    if (own | opp) & move:
+        return 0
+    return flips_for_bit(own, opp, move, size)
+
+
+def flips_for_bit(own, opp, move, size):
+    # Same as flip_mask for a single-bit `move` already known to be empty.
+    # Each ray is walked once, validating and collecting flips together.
+    flips = 0
+    for ray in _capture_rays(size)[move.bit_length() - 1]:
+        line = 0
+        for b in ray:
+            if opp & b:
+                line |= b
+                continue
+            if own & b:
+                flips |= line
+            break
+    return flips
+
+
+def flipped_squares(x, y, flips, size):
+    # Expand a flip mask into (x, y) coords ordered by direction, nearest first,
+    # which is the order Player.makeMove has always reported them in
+    out = []
+    for ray in rays(size)[y * size + x]:
+        for b in ray:
+            if not flips & b:
+                break
+            index = b.bit_length() - 1
+            out.append((index % size, index // size))
+    return out
@@ -1,6 +1,10 @@
 from enum import Enum
 import logging
 
+import Bitboard
+import Symmetry
+import Trace
+
 logger = logging.getLogger(__name__)
 
 class spaceState(Enum):
@@ -9,14 +13,107 @@ class spaceState(Enum):
     WHITE = 2
 
 class Board:
+    # No per-instance __dict__: a board is its size, two bitboards and the
+    # grid cache, and search/book code creates a great many of them
+    __slots__ = ('size', 'black', 'white', '_grid')
+
     def __init__(self, size):
         self.size = size
-        self.board = [[spaceState.EMPTY for _ in range(size)] for _ in range(size)]
+        # Bitboards are the source of truth; `board` is a cached grid view of them
+        self.black = 0
+        self.white = 0
+        self._grid = None
         mid = size // 2 # set mid to centre of the board (upper if even, centre if odd)
-        self.board[mid - 1][mid - 1] = spaceState.WHITE
-        self.board[mid][mid] = spaceState.WHITE
-        self.board[mid - 1][mid] = spaceState.BLACK
-        self.board[mid][mid - 1] = spaceState.BLACK
+        self.place_piece(mid - 1, mid - 1, spaceState.WHITE)
+        self.place_piece(mid, mid, spaceState.WHITE)
+        self.place_piece(mid, mid - 1, spaceState.BLACK)
+        self.place_piece(mid - 1, mid, spaceState.BLACK)
+
+    @property
+    def board(self):
+        # List-of-lists of spaceState indexed [y][x], rebuilt only after a change.
+        # Treat it as read-only; mutate through place_piece or assign a whole grid.
+        if self._grid is None:
+            size = self.size
+            grid = [[spaceState.EMPTY] * size for _ in range(size)]
+            for x, y in Bitboard.iter_squares(self.black, size):
+                grid[y][x] = spaceState.BLACK
+            for x, y in Bitboard.iter_squares(self.white, size):
+                grid[y][x] = spaceState.WHITE
+            self._grid = grid
+        return self._grid
+
+    @board.setter
+    def board(self, grid):
+        black = 0
+        white = 0
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if cell == spaceState.BLACK:
+                    black |= Bitboard.bit(x, y, self.size)
+                elif cell == spaceState.WHITE:
+                    white |= Bitboard.bit(x, y, self.size)
+        self.set_bitboards(black, white)
+
+    def canonical(self):
+        # (black, white, t): the position's canonical form under the board's
+        # eight symmetries and the Symmetry transform index that maps it there;
+        # Symmetry.INVERSE[t] maps squares of the canonical form back
+        return Symmetry.canonical(self.black, self.white, self.size)
+
+    def bitboards(self, color):
+        # Return (own, opponent) bitboards from the point of view of `color`
+        if color == spaceState.BLACK:
+            return self.black, self.white
+        return self.white, self.black
+
+    def set_bitboards(self, black, white):
+        self.black = black
+        self.white = white
+        self._grid = None
+
+    def get_piece(self, x, y):
+        b = Bitboard.bit(x, y, self.size)
+        if self.black & b:
+            return spaceState.BLACK
+        if self.white & b:
+            return spaceState.WHITE
+        return spaceState.EMPTY
+
+    def apply_move(self, x, y, color):
+        # Play `color` at (x, y) in place, flipping what it captures. Returns the
+        # flipped coords (ordered by direction, nearest first); an empty list means
+        # the move was illegal and the board is unchanged.
+        if not self.is_empty(x, y):
+            return []
+        own, opp = self.bitboards(color)
+        flips = Bitboard.flip_mask(own, opp, x, y, self.size)
+        if not flips:
+            return []
+        own |= flips | Bitboard.bit(x, y, self.size)
+        opp &= ~flips
+        self._set_from(color, own, opp)
+        return Bitboard.flipped_squares(x, y, flips, self.size)
+
+    def undo_move(self, x, y, flipped):
+        # Exactly reverse apply_move (or Player.makeMove) given the same (x, y)
+        # and the flipped coords it returned
+        color = self.get_piece(x, y)
+        if color == spaceState.EMPTY:
+            raise ValueError("No move to undo at (%s,%s)" % (x, y))
+        mask = 0
+        for fx, fy in flipped:
+            mask |= Bitboard.bit(fx, fy, self.size)
+        own, opp = self.bitboards(color)
+        own &= ~(mask | Bitboard.bit(x, y, self.size))
+        opp |= mask
+        self._set_from(color, own, opp)
+
+    def _set_from(self, color, own, opp):
+        if color == spaceState.BLACK:
+            self.set_bitboards(own, opp)
+        else:
+            self.set_bitboards(opp, own)
 
     def display(self):
         for row in self.board:
@@ -26,20 +123,29 @@ class Board:
 
     def place_piece(self, x, y, piece):
         if 0 <= x < self.size and 0 <= y < self.size:
-            self.board[y][x] = piece
-            logger.debug('Placed piece %s at (%s,%s)', piece, x, y)
+            b = Bitboard.bit(x, y, self.size)
+            black = self.black & ~b
+            white = self.white & ~b
+            if piece == spaceState.BLACK:
+                black |= b
+            elif piece == spaceState.WHITE:
+                white |= b
+            self.set_bitboards(black, white)
+            if Trace.enabled and Trace.count('place_piece'):
+                logger.debug('Placed piece %s at (%s,%s)', piece, x, y)
         else:
             raise ValueError("Coordinates out of bounds")
 
     def is_empty(self, x, y):
         if 0 <= x < self.size and 0 <= y < self.size:
-            empty = self.board[y][x] == spaceState.EMPTY
-            logger.debug('is_empty(%s,%s) -> %s', x, y, empty)
+            empty = not (self.black | self.white) & Bitboard.bit(x, y, self.size)
+            if Trace.enabled and Trace.count('is_empty'):
+                logger.debug('is_empty(%s,%s) -> %s', x, y, empty)
             return empty
         else:
             raise ValueError("Coordinates out of bounds")
 
     def clear_board(self):
-        self.board = [[spaceState.EMPTY for _ in range(self.size)] for _ in range(self.size)]
+        self.set_bitboards(0, 0)
         logger.debug('Cleared board')
-    
\ No newline at end of file
+    
@@ -0,0 +1,320 @@
+"""Pluggable static evaluators for the AI search.
+
+An evaluator scores a position given as two bitboards, from the point of
+view of `own`:
+
+    evaluator.evaluate(own, opp, size) -> float
+
+AI takes one through its `evaluator` argument, either as an object or by name
+(see EVALUATORS / get_evaluator):
+
+- 'mobility': the original 50/50 blend of mobility and disc difference.
+- 'pattern': a table-driven evaluator combining a square-weight matrix, edge
+  patterns (each board edge read as a base-3 index into a table), mobility,
+  potential mobility and frontier discs. 'pattern:weights.bin' loads its
+  tables from a file written by PatternTables.save (a compact float32 binary
+  file, or .npz when NumPy is installed).
+
+Run `python Evaluation.py out.bin [--size N]` to write the default tables as a
+starting point for tuning.
+"""
+from array import array
+from functools import lru_cache
+import argparse
+import struct
+import sys
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+import Bitboard
+import Symmetry
+
+# Binary table file: magic, board size, the scalar weights, then the square
+# weights (size * size) and edge table (3 ** size) as little-endian float32
+_MAGIC = b'OTHEVAL1'
+_HEADER = struct.Struct('<H4f')
+
+
+def evaluate_mobility(own, opp, size):
+    # 0.5 * (normalised number of possible moves) + 0.5 * (normalised disc
+    # difference), both normalised by the number of cells
+    max_cells = size * size if size > 0 else 1
+    moves_term = Bitboard.popcount(Bitboard.legal_moves(own, opp, size)) / max_cells
+    pieces_term = (Bitboard.popcount(own) - Bitboard.popcount(opp)) / max_cells
+    return 0.5 * moves_term + 0.5 * pieces_term
+
+
+class MobilityEvaluator:
+    name = 'mobility'
+    # scores all eight symmetric forms of a position alike, so AI may share
+    # transposition-table entries between them (see AI.symmetric_tt)
+    symmetric = True
+
+    def evaluate(self, own, opp, size):
+        return evaluate_mobility(own, opp, size)
+
+
+class PatternTables:
+    # Weights for PatternEvaluator on one board size. `squares` has one weight
+    # per square index; `edges` is indexed by the base-3 code of an edge line
+    # (digit i is the i-th square along the edge: 0 empty, 1 own, 2 opponent).
+    def __init__(self, size, squares, edges, mobility=0.0, potential=0.0, frontier=0.0, discs=0.0):
+        if len(squares) != size * size:
+            raise ValueError('expected %d square weights, got %d' % (size * size, len(squares)))
+        if len(edges) != 3 ** size:
+            raise ValueError('expected %d edge weights, got %d' % (3 ** size, len(edges)))
+        self.size = size
+        self.squares = list(squares)
+        self.edges = list(edges)
+        self.mobility = mobility
+        self.potential = potential
+        self.frontier = frontier
+        self.discs = discs
+
+    def save(self, path):
+        if path.endswith('.npz'):
+            if np is None:
+                raise ImportError('numpy is required to write .npz tables')
+            np.savez(path, size=self.size, squares=np.asarray(self.squares, dtype=np.float32),
+                     edges=np.asarray(self.edges, dtype=np.float32),
+                     scalars=np.asarray(self._scalars(), dtype=np.float32))
+            return
+        with open(path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(self.size, *self._scalars()))
+            f.write(array('f', self.squares).tobytes())
+            f.write(array('f', self.edges).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        if path.endswith('.npz'):
+            if np is None:
+                raise ImportError('numpy is required to read .npz tables')
+            with np.load(path) as data:
+                return cls(int(data['size']), data['squares'].tolist(), data['edges'].tolist(),
+                           *data['scalars'].tolist())
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if raw[:len(_MAGIC)] != _MAGIC:
+            raise ValueError('%s is not an evaluation table file' % path)
+        offset = len(_MAGIC)
+        size, *scalars = _HEADER.unpack_from(raw, offset)
+        offset += _HEADER.size
+        squares = array('f')
+        squares.frombytes(raw[offset:offset + 4 * size * size])
+        offset += 4 * size * size
+        edges = array('f')
+        edges.frombytes(raw[offset:offset + 4 * 3 ** size])
+        if sys.byteorder != 'little':
+            squares.byteswap()
+            edges.byteswap()
+        return cls(size, squares, edges, *scalars)
+
+    def _scalars(self):
+        return (self.mobility, self.potential, self.frontier, self.discs)
+
+    def is_symmetric(self):
+        # True when the tables score all eight symmetric forms of a position
+        # alike: every symmetry maps each square onto one of equal weight, and
+        # an edge line scores the same read in either direction (a symmetry
+        # maps each edge onto an edge, possibly reversed)
+        squares = self.squares
+        for indices in Symmetry.square_indices(self.size):
+            if any(squares[dest] != squares[index] for index, dest in enumerate(indices)):
+                return False
+        size = self.size
+        for code in range(3 ** size):
+            reverse = 0
+            rest = code
+            for _ in range(size):
+                reverse = reverse * 3 + rest % 3
+                rest //= 3
+            if self.edges[reverse] != self.edges[code]:
+                return False
+        return True
+
+
+def _default_square_weights(size):
+    # The classic corner/X/C weighting, generalised to any board size
+    last = size - 1
+    corners = {(0, 0), (last, 0), (0, last), (last, last)}
+    weights = []
+    for y in range(size):
+        for x in range(size):
+            near_corner = any(abs(x - cx) <= 1 and abs(y - cy) <= 1 for cx, cy in corners)
+            on_edge = x in (0, last) or y in (0, last)
+            if (x, y) in corners:
+                w = 100
+            elif near_corner and on_edge:
+                w = -20  # C-square
+            elif near_corner:
+                w = -50  # X-square
+            elif on_edge:
+                # A-squares two steps from a corner are the strong edge squares
+                w = 10 if min(x, last - x) == 2 or min(y, last - y) == 2 else 5
+            elif x in (1, last - 1) or y in (1, last - 1):
+                w = -2
+            else:
+                w = -1
+            weights.append(w)
+    return weights
+
+
+def _default_edge_weights(size, stable=12):
+    # Score each edge configuration by its stable discs: runs of one colour
+    # anchored in a corner (the whole line once it is full)
+    edges = []
+    for index in range(3 ** size):
+        cells = []
+        code = index
+        for _ in range(size):
+            cells.append(code % 3)
+            code //= 3
+        if 0 not in cells:
+            anchored = cells
+        else:
+            anchored = []
+            for line in (cells, cells[::-1]):
+                if line[0]:
+                    run = 0
+                    while line[run] == line[0]:
+                        run += 1
+                    anchored.extend(line[:run])
+        edges.append(stable * (anchored.count(1) - anchored.count(2)))
+    return edges
+
+
+@lru_cache(maxsize=None)
+def default_tables(size):
+    return PatternTables(size, _default_square_weights(size), _default_edge_weights(size),
+                         mobility=6.0, potential=2.0, frontier=-3.0, discs=1.0)
+
+
+class _Lookups:
+    # Index tables precomputed from PatternTables for one board size
+    def __init__(self, tables):
+        size = tables.size
+        self.size = size
+        self.full = (1 << (size * size)) - 1
+        self.row = (1 << size) - 1
+        self.bottom_shift = size * (size - 1)
+        # bits of column 0; multiplying by `gather` moves column bit i to bit
+        # bottom_shift + i, without carries, so a column reads like a row
+        self.column = sum(1 << (y * size) for y in range(size))
+        self.gather = sum(1 << (size * (size - 1) - j * (size - 1)) for j in range(size))
+        # base-3 code of an edge line is ternary[own bits] + 2 * ternary[opp bits]
+        self.ternary = [sum(3 ** i for i in range(size) if m >> i & 1) for m in range(1 << size)]
+        self.edges = tables.edges
+        # square weights summed per byte of the bitboard, so a board's weighted
+        # sum is one lookup per byte
+        self.nbytes = (size * size + 7) // 8
+        self.byte_weights = []
+        for chunk in range(self.nbytes):
+            base = chunk * 8
+            weights = [tables.squares[base + i] if base + i < size * size else 0.0 for i in range(8)]
+            self.byte_weights.append([sum(w for i, w in enumerate(weights) if b >> i & 1) for b in range(256)])
+        self.mobility = tables.mobility
+        self.potential = tables.potential
+        self.frontier = tables.frontier
+        self.discs = tables.discs
+
+    def square_sum(self, bb):
+        return sum(t[b] for t, b in zip(self.byte_weights, bb.to_bytes(self.nbytes, 'little')))
+
+    def edge_lines(self, bb):
+        # The four edges as `size`-bit ints: top and bottom rows left to right,
+        # left and right columns top to bottom
+        row, shift = self.row, self.bottom_shift
+        left = ((bb & self.column) * self.gather >> shift) & row
+        right = (((bb >> (self.size - 1)) & self.column) * self.gather >> shift) & row
+        return bb & row, (bb >> shift) & row, left, right
+
+
+def _neighbours(bb, size):
+    # Every square adjacent to a set square of `bb`
+    _, steps = Bitboard.masks(size)
+    out = 0
+    for shift, wrap in steps:
+        out |= Bitboard._shift(bb, shift, wrap)
+    return out
+
+
+class PatternEvaluator:
+    name = 'pattern'
+
+    def __init__(self, tables=None):
+        # `tables` covers one board size; other sizes use default_tables
+        self.tables = {tables.size: tables} if tables is not None else {}
+        self._lookups = {}
+        # loaded tables need not be symmetric (the defaults are); see
+        # MobilityEvaluator.symmetric
+        self.symmetric = all(t.is_symmetric() for t in self.tables.values())
+
+    def __getstate__(self):
+        # the lookups are rebuilt on demand rather than pickled
+        return {'tables': self.tables, '_lookups': {}, 'symmetric': self.symmetric}
+
+    def lookups(self, size):
+        found = self._lookups.get(size)
+        if found is None:
+            tables = self.tables.get(size) or default_tables(size)
+            found = self._lookups[size] = _Lookups(tables)
+        return found
+
+    def evaluate(self, own, opp, size):
+        lk = self._lookups.get(size) or self.lookups(size)
+        value = lk.square_sum(own) - lk.square_sum(opp)
+        edges, ternary = lk.edges, lk.ternary
+        for own_line, opp_line in zip(lk.edge_lines(own), lk.edge_lines(opp)):
+            value += edges[ternary[own_line] + 2 * ternary[opp_line]]
+        if lk.mobility:
+            value += lk.mobility * (Bitboard.popcount(Bitboard.legal_moves(own, opp, size))
+                                    - Bitboard.popcount(Bitboard.legal_moves(opp, own, size)))
+        empty = ~(own | opp) & lk.full
+        if lk.potential:
+            # empty squares next to the opponent are future moves for this side
+            value += lk.potential * (Bitboard.popcount(_neighbours(opp, size) & empty)
+                                     - Bitboard.popcount(_neighbours(own, size) & empty))
+        if lk.frontier:
+            near_empty = _neighbours(empty, size)
+            value += lk.frontier * (Bitboard.popcount(own & near_empty) - Bitboard.popcount(opp & near_empty))
+        if lk.discs:
+            value += lk.discs * (Bitboard.popcount(own) - Bitboard.popcount(opp))
+        return value
+
+
+# evaluator name -> factory(arg), where arg is the text after ':' (or None)
+EVALUATORS = {
+    'mobility': lambda arg: MobilityEvaluator(),
+    'pattern': lambda arg: PatternEvaluator(PatternTables.load(arg) if arg else None),
+}
+
+
+def get_evaluator(spec=None):
+    # An evaluator from a name such as 'pattern' or 'pattern:weights.bin';
+    # None gives the default mobility evaluator and objects pass through
+    if spec is None:
+        return MobilityEvaluator()
+    if not isinstance(spec, str):
+        return spec
+    name, _, arg = spec.partition(':')
+    if name not in EVALUATORS:
+        raise ValueError('Unknown evaluator %r (choose from %s)' % (spec, ', '.join(sorted(EVALUATORS))))
+    return EVALUATORS[name](arg or None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write the default pattern evaluation tables.')
+    parser.add_argument('out', help='output path (.bin, or .npz with numpy installed)')
+    parser.add_argument('--size', type=int, default=8)
+    args = parser.parse_args(argv)
+    default_tables(args.size).save(args.out)
+    print('wrote %s tables for size %d to %s' % (PatternEvaluator.name, args.size, args.out))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,8 @@
 from Board import Board, spaceState
 from Player import Player
 from AI import AI
+import Bitboard
+import Trace
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +15,63 @@ class Game:
         self.player1 = player1 if player1 is not None else Player(spaceState.BLACK, mode="human")
         self.player2 = player2 if player2 is not None else Player(spaceState.WHITE, mode="human")
         self.current_player = self.player1
+        # (x, y) of every move played through play_turn, with None where a
+        # side had to pass (see GameRecord)
+        self.history = []
+        self._invalidate()
+
+    def _invalidate(self):
+        # Drop the cached rule state; it is rebuilt from the board on next use
+        self._state_key = None
+        self._legal = {}
+        self._counts = {}
+        self._moves = {}
+
+    def _rules_state(self):
+        # Per-colour legal-move bitboards and piece counts for the current board.
+        # play_turn keeps them up to date as it goes; the bitboard key only catches
+        # a board changed behind Game's back (e.g. a direct Player.makeMove).
+        key = (self.board.black, self.board.white)
+        if self._state_key != key:
+            black, white = key
+            self._counts = {spaceState.BLACK: Bitboard.popcount(black),
+                            spaceState.WHITE: Bitboard.popcount(white)}
+            self._refresh_legal()
+        return self._legal, self._counts
+
+    def _refresh_legal(self):
+        black, white = self.board.black, self.board.white
+        size = self.board.size
+        self._legal = {spaceState.BLACK: Bitboard.legal_moves(black, white, size),
+                       spaceState.WHITE: Bitboard.legal_moves(white, black, size)}
+        self._moves = {}
+        self._state_key = (black, white)
+
+    def moves_for(self, player):
+        # Cached tuple of (x, y) legal moves for `player`, in the same order as
+        # Player.getPossibleMoves; rebuilt only after the board changes
+        legal, _ = self._rules_state()
+        moves = self._moves.get(player.color)
+        if moves is None:
+            moves = tuple(Bitboard.iter_squares(legal[player.color], self.board.size))
+            self._moves[player.color] = moves
+        return moves
+
+    @property
+    def current_moves(self):
+        return self.moves_for(self.current_player)
+
+    def score_for(self, player):
+        _, counts = self._rules_state()
+        return counts[player.color]
+
+    @property
+    def black_score(self):
+        return self._rules_state()[1][spaceState.BLACK]
+
+    @property
+    def white_score(self):
+        return self._rules_state()[1][spaceState.WHITE]
 
     def switch_player(self):
         if self.current_player == self.player1:
@@ -27,7 +86,8 @@ class Game:
             logger.info('Invalid move: Space is not empty at (%s,%s)', x, y)
             return None
 
-        if not self.current_player.can_flip(x, y, self.board):
+        legal, counts = self._rules_state()
+        if not legal[self.current_player.color] & Bitboard.bit(x, y, self.board.size):
             logger.info('Invalid move: No pieces would be flipped at (%s,%s) for %s', x, y, getattr(self.current_player, 'color', None))
             return None
 
@@ -35,6 +95,13 @@ class Game:
         mover = self.current_player
         flipped = mover.makeMove(x, y, self.board)
         logger.debug('play_turn result flipped=%s', flipped)
+        self.history.append((x, y))
+
+        # Update piece counts from the move itself and legal moves once per turn
+        other = spaceState.WHITE if mover.color == spaceState.BLACK else spaceState.BLACK
+        counts[mover.color] += 1 + len(flipped)
+        counts[other] -= len(flipped)
+        self._refresh_legal()
 
         # After a successful move, switch to the other player
         self.switch_player()
@@ -42,26 +109,28 @@ class Game:
         # If neither player has moves, the game is over
         if self.check_game_over():
             logger.info('Game over detected')
-            return {'flipped': flipped, 'placed': (x, y), 'mover_color': mover.color}
-
         # If the next player has no moves, skip their turn back to the previous player
-        if not self.current_player.getPossibleMoves(self.board):
+        elif not self.current_moves:
             logger.info('No valid moves for the next player; skipping turn.')
+            self.history.append(None)
             self.switch_player()
 
+        # one aggregated record of the rule-engine work this turn did
+        Trace.flush(logger, 'play_turn')
         return {'flipped': flipped, 'placed': (x, y), 'mover_color': mover.color}
             
     def check_game_over(self):
         # This function should check if the game is over, which happens when neither player has a valid move
         # It would need to check for valid moves for both players and return True if there are no valid moves, otherwise False
-        if not self.player1.getPossibleMoves(self.board) and not self.player2.getPossibleMoves(self.board):
+        legal, _ = self._rules_state()
+        if not legal[self.player1.color] and not legal[self.player2.color]:
             return True
         return False
     
     def get_winner(self):  
         #get the winner of the game using Player.calculateScore() and return the player with the higher score, or None if it's a tie
-        score1 = self.player1.calculateScore(self.board)
-        score2 = self.player2.calculateScore(self.board)
+        score1 = self.score_for(self.player1)
+        score2 = self.score_for(self.player2)
         if score1 > score2:
             return self.player1
         elif score2 > score1:
@@ -80,3 +149,5 @@ class Game:
             self.player2 = player2
 
         self.current_player = self.player1
+        self.history = []
+        self._invalidate()
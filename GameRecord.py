@@ -0,0 +1,407 @@
+"""Game records: every move, pass and the result of a game in a compact binary
+form, kept in an append-only archive with an offset index for random access.
+
+A game is encoded (little-endian) as a 6-byte header
+
+    size (u8)           board size
+    flags (u8)          FINISHED when the game ran to its end
+    black score (u8)    final piece counts
+    white score (u8)
+    plies (u16)         number of move bytes that follow
+
+and then one byte per ply: the square index y * size + x of the move, or
+PASS when the side to move had none. A full 8x8 game is about 66 bytes.
+
+An archive file is the magic b'OTHGAME1' followed by encoded games, only
+ever appended to. Its index, the same path plus '.idx', is the magic
+b'OTHGIDX1' followed by the u64 file offset of each game, so game i is one
+seek away. ArchiveWriter repairs a torn tail (a crash between the two
+writes) when it reopens an archive:
+
+    with ArchiveWriter('games.bin') as archive:
+        archive.append(GameRecord.from_game(game))
+    with ArchiveReader('games.bin') as archive:
+        game = replay(archive[12345])
+
+    python GameRecord.py info games.bin
+    python GameRecord.py verify games.bin [--engine game]
+    python GameRecord.py show games.bin 12345
+"""
+import argparse
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+
+import Bitboard
+from Board import Board
+from Game import Game
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'OTHGAME1'
+_INDEX_MAGIC = b'OTHGIDX1'
+_GAME = struct.Struct('<BBBBH')
+_OFFSET = struct.Struct('<Q')
+
+# Move byte of a pass
+PASS = 0xFF
+# Header flag of a game played to its end
+FINISHED = 0x01
+# Largest board whose squares fit in a move byte next to PASS
+MAX_SIZE = 15
+
+
+class GameRecord:
+    __slots__ = ('size', 'moves', 'black_score', 'white_score', 'finished')
+
+    def __init__(self, size, moves, black_score, white_score, finished=True):
+        if size > MAX_SIZE:
+            raise ValueError('board size %d does not fit a game record (max %d)' % (size, MAX_SIZE))
+        self.size = size
+        # one byte per ply, as stored
+        self.moves = bytes(moves)
+        self.black_score = black_score
+        self.white_score = white_score
+        self.finished = finished
+
+    @classmethod
+    def from_game(cls, game):
+        # Record of a game played through Game.play_turn, from its history
+        size = game.board.size
+        moves = bytes(PASS if move is None else move[1] * size + move[0] for move in game.history)
+        return cls(size, moves, game.black_score, game.white_score, game.check_game_over())
+
+    @property
+    def winner(self):
+        if self.black_score > self.white_score:
+            return 'black'
+        if self.white_score > self.black_score:
+            return 'white'
+        return 'draw'
+
+    def plies(self):
+        # The moves as (x, y), with None for a pass
+        size = self.size
+        return [None if byte == PASS else (byte % size, byte // size) for byte in self.moves]
+
+    def encode(self):
+        flags = FINISHED if self.finished else 0
+        return _GAME.pack(self.size, flags, self.black_score, self.white_score,
+                          len(self.moves)) + self.moves
+
+    @classmethod
+    def decode(cls, data, offset=0):
+        # (record, offset just past it) for the game encoded at `offset`
+        size, flags, black_score, white_score, plies = _GAME.unpack_from(data, offset)
+        start = offset + _GAME.size
+        end = start + plies
+        if end > len(data):
+            raise ValueError('game record at offset %d is truncated' % offset)
+        return cls(size, data[start:end], black_score, white_score, bool(flags & FINISHED)), end
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return 'GameRecord(size=%d, plies=%d, %d-%d%s)' % (
+            self.size, len(self.moves), self.black_score, self.white_score,
+            '' if self.finished else ', unfinished')
+
+
+def replay(record, game=None):
+    """Play `record` through Game.play_turn (on `game`, reset first, or a new
+    Game) and return the game. Raises ValueError if a move is illegal, a
+    recorded pass does not happen or the final score differs."""
+    if game is None:
+        game = Game(record.size)
+    else:
+        game.reset()
+    for ply, move in enumerate(record.plies()):
+        if move is None:
+            # play_turn passes for a side with no moves itself
+            if not game.history or game.history[-1] is not None:
+                raise ValueError('ply %d: pass recorded but the side to move has moves' % ply)
+            continue
+        if game.play_turn(*move) is None:
+            raise ValueError('ply %d: illegal move %s' % (ply, move))
+    if game.history != record.plies():
+        raise ValueError('replayed passes differ from the recorded ones')
+    if (game.black_score, game.white_score) != (record.black_score, record.white_score):
+        raise ValueError('replayed score %d-%d, recorded %d-%d' % (
+            game.black_score, game.white_score, record.black_score, record.white_score))
+    return game
+
+
+def replay_bitboards(record):
+    """Replay `record` on bitboards alone; returns the final (black, white).
+    Raises ValueError on an illegal move or pass, or a score mismatch."""
+    size = record.size
+    start = Board(size)
+    own, opp = start.black, start.white
+    black_to_move = True
+    for ply, byte in enumerate(record.moves):
+        if byte == PASS:
+            if Bitboard.legal_moves(own, opp, size):
+                raise ValueError('ply %d: pass recorded but the side to move has moves' % ply)
+        else:
+            move = 1 << byte
+            flips = 0 if (own | opp) & move else Bitboard.flips_for_bit(own, opp, move, size)
+            if not flips:
+                raise ValueError('ply %d: illegal move at square %d' % (ply, byte))
+            own, opp = own | flips | move, opp & ~flips
+        own, opp = opp, own
+        black_to_move = not black_to_move
+    black, white = (own, opp) if black_to_move else (opp, own)
+    if (Bitboard.popcount(black), Bitboard.popcount(white)) != (record.black_score, record.white_score):
+        raise ValueError('replayed score %d-%d, recorded %d-%d' % (
+            Bitboard.popcount(black), Bitboard.popcount(white), record.black_score, record.white_score))
+    return black, white
+
+
+def _game_end(data, offset):
+    # Offset just past the game at `offset`, or None if it runs past the data
+    if offset + _GAME.size > len(data):
+        return None
+    end = offset + _GAME.size + _GAME.unpack_from(data, offset)[4]
+    return end if end <= len(data) else None
+
+
+def _scan(data, offset):
+    # Offsets of the complete games from `offset` on, and where the complete
+    # part ends (a crash can leave a partly written game after it)
+    offsets = []
+    end = len(data)
+    while offset < end:
+        following = _game_end(data, offset)
+        if following is None:
+            break
+        offsets.append(offset)
+        offset = following
+    return offsets, offset
+
+
+def index_path(path):
+    return path + '.idx'
+
+
+class ArchiveWriter:
+    """Appends game records to an archive, creating it (and its index) if
+    needed. Games the index is missing are indexed and a partly written last
+    game is cut off before anything is appended."""
+
+    def __init__(self, path):
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'ab+')
+        self._index = None
+        try:
+            # the header is checked before the index is opened, so no index
+            # is left behind next to a file that is not an archive
+            if not new:
+                self._file.seek(0)
+                if self._file.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError('%s is not a game archive' % self.path)
+            self._index = open(index_path(path), 'ab+')
+            if new:
+                self._file.write(_MAGIC)
+                self._index.truncate(0)
+                self._index.write(_INDEX_MAGIC)
+            else:
+                self._recover()
+            self.count = (self._index.tell() - len(_INDEX_MAGIC)) // _OFFSET.size
+        except Exception:
+            self.close()
+            raise
+
+    def _recover(self):
+        # Only the ends of the files are read: the last indexed game that is
+        # complete, and whatever follows it
+        archive_size = self._file.seek(0, os.SEEK_END)
+        index_size = self._index.seek(0, os.SEEK_END)
+        self._index.seek(0)
+        if self._index.read(len(_INDEX_MAGIC)) != _INDEX_MAGIC:
+            self._index.truncate(0)
+            self._index.write(_INDEX_MAGIC)
+            index_size = len(_INDEX_MAGIC)
+        count = (index_size - len(_INDEX_MAGIC)) // _OFFSET.size
+        resume = len(_MAGIC)
+        while count:
+            self._index.seek(len(_INDEX_MAGIC) + (count - 1) * _OFFSET.size)
+            last, = _OFFSET.unpack(self._index.read(_OFFSET.size))
+            if len(_MAGIC) <= last < archive_size:
+                self._file.seek(last)
+                end = _game_end(self._file.read(_GAME.size + 0xFFFF), 0)
+                if end is not None:
+                    resume = last + end
+                    break
+            count -= 1
+        self._file.seek(resume)
+        tail = self._file.read()
+        offsets, end = _scan(tail, 0)
+        keep = len(_INDEX_MAGIC) + count * _OFFSET.size
+        if offsets or end != len(tail) or keep != index_size:
+            logger.warning('%s: indexing %d unindexed games, dropping %d trailing bytes',
+                           self.path, len(offsets), len(tail) - end)
+            self._index.truncate(keep)
+            self._index.write(b''.join(_OFFSET.pack(resume + offset) for offset in offsets))
+            self._file.truncate(resume + end)
+        self._file.seek(0, os.SEEK_END)
+        self._index.seek(0, os.SEEK_END)
+
+    def append(self, record):
+        # Write one GameRecord; returns its index in the archive
+        offset = self._file.tell()
+        self._file.write(record.encode())
+        self._index.write(_OFFSET.pack(offset))
+        self.count += 1
+        return self.count - 1
+
+    def flush(self):
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        for f in (self._file, self._index):
+            if f is not None and not f.closed:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArchiveReader:
+    """Read-only view of an archive through mmap: len(), archive[i] by index
+    and iteration in file order. Without an index file (or with a stale one)
+    the offsets are found by scanning the archive once."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = self._index_file = self._index_map = None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(_MAGIC)] != _MAGIC:
+                raise ValueError('%s is not a game archive' % path)
+            self._offsets = None
+            self.count = self._open_index()
+            if self.count is None:
+                self._offsets, _ = _scan(self._map, len(_MAGIC))
+                self.count = len(self._offsets)
+        except Exception:
+            self.close()
+            raise
+
+    def _open_index(self):
+        # Number of games the index covers, or None when it cannot be used
+        path = index_path(self.path)
+        if not os.path.exists(path) or os.path.getsize(path) < len(_INDEX_MAGIC):
+            return None
+        self._index_file = open(path, 'rb')
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        count = (len(self._index_map) - len(_INDEX_MAGIC)) // _OFFSET.size
+        if self._index_map[:len(_INDEX_MAGIC)] != _INDEX_MAGIC:
+            return None
+        end = _game_end(self._map, self._offset(count - 1)) if count else len(_MAGIC)
+        if end != len(self._map):
+            logger.warning('%s: index does not match the archive; scanning it', self.path)
+            return None
+        return count
+
+    def _offset(self, i):
+        if self._offsets is not None:
+            return self._offsets[i]
+        return _OFFSET.unpack_from(self._index_map, len(_INDEX_MAGIC) + i * _OFFSET.size)[0]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError('game %d out of range (%d games)' % (i, self.count))
+        return GameRecord.decode(self._map, self._offset(i))[0]
+
+    def __iter__(self):
+        # Sequential scan; no index needed
+        data = self._map
+        offset = len(_MAGIC)
+        for _ in range(self.count):
+            record, offset = GameRecord.decode(data, offset)
+            yield record
+
+    def close(self):
+        for handle in (self._index_map, self._index_file, self._map, self._file):
+            if handle is not None and not handle.closed:
+                handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _square_name(byte, size):
+    if byte == PASS:
+        return 'pass'
+    return '%s%d' % (chr(ord('a') + byte % size), byte // size + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect and verify an Othello game archive.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help='count games, bytes and results')
+    info.add_argument('archive')
+    verify = sub.add_parser('verify', help='replay every game and check it')
+    verify.add_argument('archive')
+    verify.add_argument('--engine', choices=('bitboard', 'game'), default='bitboard',
+                        help='replay on bitboards (fast) or through Game.play_turn')
+    show = sub.add_parser('show', help='print one game')
+    show.add_argument('archive')
+    show.add_argument('index', type=int)
+    args = parser.parse_args(argv)
+
+    with ArchiveReader(args.archive) as archive:
+        if args.command == 'show':
+            record = archive[args.index]
+            print(repr(record), record.winner)
+            print(' '.join(_square_name(byte, record.size) for byte in record.moves))
+            return 0
+        if args.command == 'info':
+            results = {'black': 0, 'white': 0, 'draw': 0}
+            plies = 0
+            for record in archive:
+                results[record.winner] += 1
+                plies += len(record.moves)
+            size = os.path.getsize(args.archive)
+            print('%s: %d games, %d plies, %d bytes (%.1f per game)' % (
+                args.archive, len(archive), plies, size, size / len(archive) if len(archive) else 0.0))
+            print('black %(black)d  white %(white)d  draw %(draw)d' % results)
+            return 0
+        check = replay_bitboards if args.engine == 'bitboard' else replay
+        bad = 0
+        started = time.perf_counter()
+        for i, record in enumerate(archive):
+            try:
+                check(record)
+            except ValueError as e:
+                bad += 1
+                print('game %d: %s' % (i, e))
+        seconds = time.perf_counter() - started
+        rate = len(archive) / seconds if seconds > 0 else 0.0
+        print('%d games replayed (%s) in %.2fs, %.0f games/s, %d bad' % (
+            len(archive), args.engine, seconds, rate, bad))
+        return 1 if bad else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,8 @@
 import logging
 import sys
 
+# Hot-path rule/search calls no longer log individually; set OTHELLO_TRACE=1
+# (and optionally OTHELLO_TRACE_SAMPLE=N) for per-turn summaries, see Trace.py
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 
 from Game import Game
@@ -0,0 +1,271 @@
+"""Opening book: searched moves for early positions, stored in a sorted binary
+file and looked up through mmap without parsing the file.
+
+File layout (little-endian): a 16-byte header
+
+    magic b'OTHBOOK1', board size (u16), record size (u16), record count (u32)
+
+followed by fixed-size records sorted by key:
+
+    key (u64)    Zobrist hash of the position's canonical symmetric form
+                 (Symmetry.canonical), side to move included
+    move (u16)   square index of the book move in the canonical frame
+    depth (u16)  depth of the search that chose the move
+    score (f32)  search value of the move for the side to move
+
+so a lookup is a binary search over the mapped file. Build a book with
+
+    python OpeningBook.py build opening.book --plies 6 --depth 6
+
+which searches every position up to `plies` moves deep ('all' lines), or
+with --selfplay N the positions seen in N self-play games at the search depth.
+"""
+import argparse
+import logging
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+import Bitboard
+import Symmetry
+import TranspositionTable as tt
+from Board import Board, spaceState
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'OTHBOOK1'
+_HEADER = struct.Struct('<8sHHI')
+_RECORD = struct.Struct('<QHHf')
+_KEY = struct.Struct('<Q')
+
+# Book file the UI uses when it exists
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening.book')
+
+
+def position_key(black, white, black_to_move, size):
+    # (key, t): the book key of a position and the symmetry mapping it onto the
+    # canonical form the key was computed from
+    cb, cw, t = Symmetry.canonical(black, white, size)
+    return tt.hash_position(cb, cw, black_to_move, size), t
+
+
+class OpeningBook:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        magic, self.size, record_size, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or record_size != _RECORD.size:
+            self.close()
+            raise ValueError('%s is not an opening book' % path)
+        if len(self._map) < _HEADER.size + self.count * _RECORD.size:
+            self.close()
+            raise ValueError('%s is truncated' % path)
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # The mapping belongs to this process; a pickled copy reopens the file
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def probe(self, key):
+        # (move index, depth, score) stored for `key`, or None
+        lo, hi = 0, self.count
+        data = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found, = _KEY.unpack_from(data, _HEADER.size + mid * _RECORD.size)
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                _, move, depth, score = _RECORD.unpack_from(data, _HEADER.size + mid * _RECORD.size)
+                return move, depth, score
+        return None
+
+    def lookup(self, board, color):
+        # The book move (x, y) for `color` to play on `board`, or None
+        if board.size != self.size:
+            return None
+        key, t = position_key(board.black, board.white, color == spaceState.BLACK, board.size)
+        entry = self.probe(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        index = entry[0]
+        x, y = Symmetry.transform_square(index % self.size, index // self.size,
+                                         Symmetry.INVERSE[t], self.size)
+        own, opp = board.bitboards(color)
+        if not Bitboard.flip_mask(own, opp, x, y, board.size):
+            # a hash collision with some other position
+            self.misses += 1
+            return None
+        self.hits += 1
+        return x, y
+
+
+def open_book(book):
+    # An OpeningBook from a path, or `book` itself if it already is one (or None)
+    if isinstance(book, str):
+        return OpeningBook(book)
+    return book
+
+
+def write_book(path, entries, size):
+    # Write {key: (move index, depth, score)} as a sorted book file
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, size, _RECORD.size, len(entries)))
+        for key in sorted(entries):
+            move, depth, score = entries[key]
+            f.write(_RECORD.pack(key, move, depth, score))
+
+
+class _Builder:
+    def __init__(self, size, depth, evaluator=None):
+        # deferred import: AI imports this module to consult books
+        from AI import AI
+        self.size = size
+        self.depth = depth
+        # one searcher per colour so transposition tables carry over between positions
+        self._searchers = {color: AI(color, depth=depth, evaluator=evaluator, endgame_empties=0)
+                           for color in (spaceState.BLACK, spaceState.WHITE)}
+        self.entries = {}
+        self.searched = 0
+
+    def record(self, black, white, color):
+        # Search the position (in its canonical form) unless it is already in
+        # the book; returns the book move (x, y) in the position's own frame
+        size = self.size
+        black_to_move = color == spaceState.BLACK
+        key, t = position_key(black, white, black_to_move, size)
+        entry = self.entries.get(key)
+        if entry is None:
+            board = Board(size)
+            board.set_bitboards(Symmetry.transform(black, t, size), Symmetry.transform(white, t, size))
+            move, value = self._searchers[color]._alphabeta_root(board, self.depth)
+            self.searched += 1
+            if move is None:
+                return None
+            entry = self.entries[key] = (move[1] * size + move[0], self.depth, value)
+        index = entry[0]
+        return Symmetry.transform_square(index % size, index // size, Symmetry.INVERSE[t], size)
+
+
+def _play(black, white, color, move, size):
+    # (black, white, color to move) after `color` plays single-bit `move`,
+    # handling a forced pass; None when the game is over
+    own, opp = (black, white) if color == spaceState.BLACK else (white, black)
+    flips = Bitboard.flips_for_bit(own, opp, move, size)
+    own, opp = own | flips | move, opp & ~flips
+    black, white = (own, opp) if color == spaceState.BLACK else (opp, own)
+    if Bitboard.legal_moves(opp, own, size):
+        return black, white, spaceState.WHITE if color == spaceState.BLACK else spaceState.BLACK
+    if Bitboard.legal_moves(own, opp, size):
+        return black, white, color
+    return None
+
+
+def _children(black, white, color, size):
+    # Every position one legal move on that the game continues from
+    own, opp = (black, white) if color == spaceState.BLACK else (white, black)
+    children = (_play(black, white, color, move, size)
+                for move in Bitboard.iter_bits(Bitboard.legal_moves(own, opp, size)))
+    return [child for child in children if child is not None]
+
+
+def build_book(size=8, plies=6, depth=6, selfplay=0, random_plies=2, seed=0, evaluator=None):
+    # Returns {key: (move index, depth, score)}. With selfplay=0 every position
+    # up to `plies` moves from the start is searched; otherwise the positions
+    # of `selfplay` games (seeded random first moves, then book moves).
+    builder = _Builder(size, depth, evaluator)
+    start = Board(size)
+    started = time.perf_counter()
+    if not selfplay:
+        frontier = [(start.black, start.white, spaceState.BLACK)]
+        seen = set()
+        for ply in range(plies):
+            next_frontier = []
+            for black, white, color in frontier:
+                key, _ = position_key(black, white, color == spaceState.BLACK, size)
+                if key in seen:
+                    continue
+                seen.add(key)
+                builder.record(black, white, color)
+                next_frontier.extend(_children(black, white, color, size))
+            frontier = next_frontier
+            logger.info('book ply %d: %d positions searched, %.1fs', ply + 1, builder.searched,
+                        time.perf_counter() - started)
+    else:
+        rng = random.Random(seed)
+        for game in range(selfplay):
+            black, white, color = start.black, start.white, spaceState.BLACK
+            for ply in range(plies):
+                if ply < random_plies:
+                    choices = _children(black, white, color, size)
+                    if not choices:
+                        break
+                    black, white, color = rng.choice(choices)
+                    continue
+                move = builder.record(black, white, color)
+                if move is None:
+                    break
+                position = _play(black, white, color, Bitboard.bit(move[0], move[1], size), size)
+                if position is None:
+                    break
+                black, white, color = position
+            logger.info('book game %d: %d positions searched, %.1fs', game + 1, builder.searched,
+                        time.perf_counter() - started)
+    return builder.entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or inspect an Othello opening book.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='search opening positions and write a book')
+    build.add_argument('out')
+    build.add_argument('--size', type=int, default=8)
+    build.add_argument('--plies', type=int, default=6, help='moves from the start position to cover')
+    build.add_argument('--depth', type=int, default=6, help='search depth per book position')
+    build.add_argument('--selfplay', type=int, default=0,
+                       help='build from this many self-play games instead of every line')
+    build.add_argument('--random-plies', type=int, default=2)
+    build.add_argument('--seed', type=int, default=0)
+    build.add_argument('--evaluator', default=None, help="e.g. 'pattern'")
+    info = sub.add_parser('info', help='print a book\'s header')
+    info.add_argument('book')
+    args = parser.parse_args(argv)
+
+    if args.command == 'info':
+        book = OpeningBook(args.book)
+        print('%s: size %d, %d positions, %d bytes' % (args.book, book.size, len(book),
+                                                        os.path.getsize(args.book)))
+        book.close()
+        return 0
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    entries = build_book(args.size, args.plies, args.depth, args.selfplay, args.random_plies,
+                         args.seed, args.evaluator)
+    write_book(args.out, entries, args.size)
+    print('wrote %d positions to %s' % (len(entries), args.out))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
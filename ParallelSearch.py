@@ -0,0 +1,135 @@
+"""Root-split parallel alpha-beta search over a concurrent.futures process pool.
+
+The parent searches the first (best-ordered) root move itself to establish a
+bound, then farms the remaining root moves out to worker processes
+(young-brothers-wait at the root). Positions travel as (own, opp, size) ints.
+Workers share the best value found so far: each task searches with that bound
+as alpha, so moves that cannot beat the current best are refuted cheaply.
+"""
+import concurrent.futures
+import logging
+import math
+import multiprocessing
+
+import SearchStats
+
+logger = logging.getLogger(__name__)
+
+# Per-worker-process state, set up by _init_worker
+_worker_ai = None
+_best = None            # best root value found so far in the current search
+_search_id = None       # id of the search _best belongs to
+_cancelled_upto = None  # searches with id <= this are cancelled
+
+
+class _CancelFlag:
+    # Event-like view of the shared cancel counter for one search
+    def __init__(self, cancelled_upto, search_id):
+        self._cancelled_upto = cancelled_upto
+        self._search_id = search_id
+
+    def is_set(self):
+        return self._cancelled_upto.value >= self._search_id
+
+
+def _init_worker(ai, best, search_id, cancelled_upto):
+    global _worker_ai, _best, _search_id, _cancelled_upto
+    # each worker keeps its own AI copy, and so its own transposition table
+    _worker_ai = ai
+    _best = best
+    _search_id = search_id
+    _cancelled_upto = cancelled_upto
+
+
+def _offer(best, current_id, search_id, value):
+    # Raise the shared bound if `value` beats it and belongs to the live search
+    with best.get_lock():
+        if current_id.value == search_id and value > best.value:
+            best.value = value
+
+
+def _search_move(search_id, own, opp, size, key, depth, move):
+    # Worker task: returns (move, value, exact, nodes, stats). A move whose value
+    # is not exact cannot be the best one, so its value is only an upper bound.
+    ai = _worker_ai
+    ai.cancel_event = _CancelFlag(_cancelled_upto, search_id)
+    ai.nodes = 0
+    ai._next_check = 0
+    stats = ai.stats = SearchStats.SearchStats()
+    table = ai.tt
+    tt_hits, tt_misses = (table.hits, table.misses) if table is not None else (0, 0)
+    with _best.get_lock():
+        bound = _best.value if _search_id.value == search_id else float('-inf')
+    # just below the bound, so moves that tie the best still get exact values
+    # and the parent can break ties by board order like the serial search
+    alpha = math.nextafter(bound, float('-inf'))
+    try:
+        value = ai._root_move_value(own, opp, size, key, depth, move, alpha)
+    finally:
+        ai.cancel_event = None
+    if table is not None:
+        stats.tt_hits = table.hits - tt_hits
+        stats.tt_probes = stats.tt_hits + table.misses - tt_misses
+    exact = value > alpha
+    if exact:
+        _offer(_best, _search_id, search_id, value)
+    return move, value, exact, ai.nodes, stats
+
+
+class RootSplitPool:
+    def __init__(self, ai, workers):
+        self.workers = workers
+        ctx = multiprocessing.get_context('spawn')
+        self._best = ctx.Value('d', float('-inf'))
+        self._search_id = ctx.Value('q', 0, lock=False)
+        self._cancelled_upto = ctx.Value('q', 0, lock=False)
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, initializer=_init_worker,
+            initargs=(ai, self._best, self._search_id, self._cancelled_upto))
+
+    def search(self, ai, own, opp, size, key, depth, moves, cancel_event=None):
+        # Search ordered root `moves` (single-bit ints) to `depth`. Returns
+        # (best move bit or 0, value, nodes); raises InterruptedError if
+        # cancel_event is set before the search finishes. The workers' search
+        # statistics are merged into ai.stats.
+        with self._best.get_lock():
+            self._search_id.value += 1
+            self._best.value = float('-inf')
+        search_id = self._search_id.value
+
+        eldest = moves[0]
+        value = ai._root_move_value(own, opp, size, key, depth, eldest, float('-inf'))
+        _offer(self._best, self._search_id, search_id, value)
+        exact = {eldest: value}
+        nodes = ai.nodes
+
+        pending = {self._executor.submit(_search_move, search_id, own, opp, size, key, depth, move)
+                   for move in moves[1:]}
+        try:
+            while pending:
+                done, pending = concurrent.futures.wait(pending, timeout=0.05)
+                for future in done:
+                    move, value, is_exact, task_nodes, task_stats = future.result()
+                    nodes += task_nodes
+                    ai.stats.merge_worker(task_stats)
+                    if is_exact:
+                        exact[move] = value
+                if cancel_event is not None and cancel_event.is_set():
+                    raise InterruptedError('root-split search cancelled')
+        except BaseException:
+            self._cancelled_upto.value = search_id
+            for future in pending:
+                future.cancel()
+            raise
+
+        best_value = max(exact.values())
+        if best_value == float('-inf'):
+            return 0, best_value, nodes
+        # lowest square index wins ties, as in the serial root
+        best_move = min((m for m, v in exact.items() if v == best_value),
+                        key=lambda m: m.bit_length())
+        return best_move, best_value, nodes
+
+    def close(self):
+        self._cancelled_upto.value = self._search_id.value
+        self._executor.shutdown(wait=True, cancel_futures=True)
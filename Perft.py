@@ -0,0 +1,373 @@
+"""Perft: count the leaf positions of the game tree to a fixed depth.
+
+A correctness oracle and a raw move-generation benchmark. Every rules backend
+below counts the same tree, so any backend that disagrees with the others has
+a bug:
+
+- 'bitboard':  Bitboard.legal_moves / flips_for_bit on int bitboards, as the
+               search uses them;
+- 'game':      the rules the UI plays by: Player.can_flip on every empty
+               square and Game.play_turn to move, following its skip-turn
+               branch for passes (whose turn it leaves and the pass it
+               records are checked against the new position's legal moves);
+- 'grid':      a plain list-of-lists board walking the eight directions
+               square by square, sharing no code with the engine;
+- 'numpy':     BatchEval.legal_moves_batch over each ply's positions at once
+               (only when NumPy is installed).
+
+A side with no legal move passes, and the pass counts as a move (one ply); a
+position where neither side can move is a leaf wherever it occurs. From the
+8x8 start position the counts are 4, 12, 56, 244, 1396, 8200, 55092, 390216
+for depths 1 to 8.
+
+    python Perft.py 6                      # all backends, cross-checked
+    python Perft.py 7 --backends bitboard  # throughput of one backend
+    python Perft.py 5 --divide             # per-root-move counts
+"""
+import argparse
+import sys
+import time
+
+import BatchEval
+import Bitboard
+from Board import spaceState
+from Game import Game
+from Player import Player
+
+# Leaf counts from the 8x8 start position, by depth
+START_COUNTS = (1, 4, 12, 56, 244, 1396, 8200, 55092, 390216)
+
+# (dx, dy) steps for the grid backend
+_DIRECTIONS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+def start_position(size=8):
+    # (black, white, black_to_move) of the standard start position
+    mid = size // 2
+    white = Bitboard.bit(mid - 1, mid - 1, size) | Bitboard.bit(mid, mid, size)
+    black = Bitboard.bit(mid, mid - 1, size) | Bitboard.bit(mid - 1, mid, size)
+    return black, white, True
+
+
+class _BitboardRules:
+    # State: (own, opp), side to move first
+    name = 'bitboard'
+
+    def __init__(self, size):
+        self.size = size
+
+    def load(self, black, white, black_to_move):
+        return (black, white) if black_to_move else (white, black)
+
+    def children(self, state):
+        own, opp = state
+        size = self.size
+        legal = Bitboard.legal_moves(own, opp, size)
+        if not legal:
+            if Bitboard.legal_moves(opp, own, size):
+                return [('pass', (opp, own))]
+            return []
+        out = []
+        for move in Bitboard.iter_bits(legal):
+            flips = Bitboard.flips_for_bit(own, opp, move, size)
+            out.append((move, (opp & ~flips, own | flips | move)))
+        return out
+
+    def leaves(self, state):
+        # Leaves one ply down: every move, or the pass, or the end of the game
+        return Bitboard.popcount(Bitboard.legal_moves(state[0], state[1], self.size)) or 1
+
+    def label(self, move):
+        return move if move == 'pass' else _square_name(move.bit_length() - 1, self.size)
+
+
+class _GameRules:
+    # State: (black, white, black to move, pass), played out on one Game
+    # whose board is reset to the state for every expansion. `pass` is None,
+    # or for a move after which play_turn skipped the opponent, the state
+    # play_turn left: the opponent's pass is then this state's only child.
+    name = 'game'
+
+    def __init__(self, size):
+        self.size = size
+        self.game = Game(size, player1=Player(spaceState.BLACK), player2=Player(spaceState.WHITE))
+
+    def load(self, black, white, black_to_move):
+        return black, white, black_to_move, None
+
+    def _enter(self, state):
+        black, white, black_to_move, _ = state
+        game = self.game
+        game.board.set_bitboards(black, white)
+        game.current_player = game.player1 if black_to_move else game.player2
+        # positions are set directly, so the move history means nothing here
+        game.history.clear()
+        return game
+
+    def children(self, state):
+        if state[3] is not None:
+            return [('pass', state[3])]
+        game = self._enter(state)
+        size = self.size
+        mover = game.current_player
+        moves = [(x, y) for y in range(size) for x in range(size)
+                 if game.board.is_empty(x, y) and mover.can_flip(x, y, game.board)]
+        if not moves:
+            # only a loaded position gets here; play_turn makes the passes
+            # that come up during play (see below)
+            if game.check_game_over():
+                return []
+            game.switch_player()
+            return [('pass', (state[0], state[1], game.current_player is game.player1, None))]
+        out = []
+        for x, y in moves:
+            game = self._enter(state)
+            if game.play_turn(x, y) is None:
+                raise AssertionError('play_turn rejected can_flip move (%s,%s)' % (x, y))
+            out.append(((x, y), self._after_turn(game, state, (x, y))))
+        return out
+
+    def _after_turn(self, game, state, move):
+        # The child state after play_turn, built from what play_turn did: whose
+        # turn it left and whether it recorded a pass. Both are checked against
+        # the legal moves of the new position.
+        black, white = game.board.black, game.board.white
+        black_next = game.current_player is game.player1
+        skipped = game.history[-1] is None
+        mover, other = (black, white) if state[2] else (white, black)
+        expect_skip = (not Bitboard.legal_moves(other, mover, self.size)
+                       and bool(Bitboard.legal_moves(mover, other, self.size)))
+        if skipped != expect_skip or black_next != (state[2] if skipped else not state[2]):
+            raise AssertionError('play_turn%s left %s to move (recorded pass: %s)'
+                                 % (move, 'black' if black_next else 'white', skipped))
+        if skipped:
+            # perft counts the pass play_turn made as a ply of its own
+            return black, white, not state[2], (black, white, black_next, None)
+        return black, white, black_next, None
+
+    def leaves(self, state):
+        return len(self.children(state)) or 1
+
+    def label(self, move):
+        return move if move == 'pass' else _square_name(move[1] * self.size + move[0], self.size)
+
+
+class _GridRules:
+    # State: (grid, color) with grid a tuple of row tuples holding
+    # spaceState values; moves are found by walking each direction
+    name = 'grid'
+
+    def __init__(self, size):
+        self.size = size
+
+    def load(self, black, white, black_to_move):
+        size = self.size
+        grid = tuple(tuple(spaceState.BLACK if black >> (y * size + x) & 1 else
+                           spaceState.WHITE if white >> (y * size + x) & 1 else spaceState.EMPTY
+                           for x in range(size))
+                     for y in range(size))
+        return grid, spaceState.BLACK if black_to_move else spaceState.WHITE
+
+    def _flips(self, grid, x, y, color):
+        size = self.size
+        other = spaceState.WHITE if color == spaceState.BLACK else spaceState.BLACK
+        flips = []
+        for dx, dy in _DIRECTIONS:
+            run = []
+            cx, cy = x + dx, y + dy
+            while 0 <= cx < size and 0 <= cy < size and grid[cy][cx] == other:
+                run.append((cx, cy))
+                cx += dx
+                cy += dy
+            if run and 0 <= cx < size and 0 <= cy < size and grid[cy][cx] == color:
+                flips.extend(run)
+        return flips
+
+    def _moves(self, grid, color):
+        size = self.size
+        out = []
+        for y in range(size):
+            for x in range(size):
+                if grid[y][x] == spaceState.EMPTY:
+                    flips = self._flips(grid, x, y, color)
+                    if flips:
+                        out.append((x, y, flips))
+        return out
+
+    def children(self, state):
+        grid, color = state
+        other = spaceState.WHITE if color == spaceState.BLACK else spaceState.BLACK
+        moves = self._moves(grid, color)
+        if not moves:
+            if self._moves(grid, other):
+                return [('pass', (grid, other))]
+            return []
+        out = []
+        for x, y, flips in moves:
+            rows = [list(row) for row in grid]
+            rows[y][x] = color
+            for fx, fy in flips:
+                rows[fy][fx] = color
+            out.append(((x, y), (tuple(tuple(row) for row in rows), other)))
+        return out
+
+    def leaves(self, state):
+        return len(self.children(state)) or 1
+
+    def label(self, move):
+        return move if move == 'pass' else _square_name(move[1] * self.size + move[0], self.size)
+
+
+class _BatchRules(_BitboardRules):
+    # The bitboard tree walked one ply at a time, with each ply's legal moves
+    # generated for all of its positions in one BatchEval call
+    name = 'numpy'
+
+    def _legal(self, states):
+        own = BatchEval.bits_to_array([s[0] for s in states], self.size)
+        opp = BatchEval.bits_to_array([s[1] for s in states], self.size)
+        flat = BatchEval.legal_moves_batch(own, opp).reshape(len(states), -1)
+        packed = BatchEval.np.packbits(flat, axis=1, bitorder='little')
+        return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+    def count(self, state, depth):
+        if depth == 0:
+            return 1
+        frontier = [state]
+        leaves = 0
+        size = self.size
+        for ply in range(depth):
+            if not frontier:
+                break
+            legal = self._legal(frontier)
+            replies = None
+            next_frontier = []
+            for index, ((own, opp), moves) in enumerate(zip(frontier, legal)):
+                if not moves:
+                    if replies is None:
+                        replies = self._legal([(o, w) for w, o in frontier])
+                    if not replies[index]:
+                        leaves += 1  # game over before the last ply
+                        continue
+                    if ply == depth - 1:
+                        leaves += 1
+                    else:
+                        next_frontier.append((opp, own))
+                    continue
+                if ply == depth - 1:
+                    leaves += Bitboard.popcount(moves)
+                    continue
+                for move in Bitboard.iter_bits(moves):
+                    flips = Bitboard.flips_for_bit(own, opp, move, size)
+                    next_frontier.append((opp & ~flips, own | flips | move))
+            frontier = next_frontier
+        return leaves
+
+
+BACKENDS = {rules.name: rules for rules in (_BitboardRules, _GameRules, _GridRules, _BatchRules)}
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != 'numpy' or BatchEval.available()]
+
+
+def _square_name(index, size):
+    x, y = index % size, index // size
+    return '%s%d' % (chr(ord('a') + x), y + 1) if size <= 26 else '%d,%d' % (x, y)
+
+
+def _count(rules, state, depth):
+    if depth == 1:
+        return rules.leaves(state)
+    children = rules.children(state)
+    if not children:
+        return 1
+    return sum(_count(rules, child, depth - 1) for _, child in children)
+
+
+def _make(backend, size):
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend %r (choose from %s)' % (backend, ', '.join(BACKENDS)))
+    if backend == 'numpy' and not BatchEval.available():
+        raise ImportError('the numpy backend needs NumPy')
+    return BACKENDS[backend](size)
+
+
+def _subtree(rules, state, depth):
+    if hasattr(rules, 'count'):
+        return rules.count(state, depth)
+    if depth == 0:
+        return 1
+    return _count(rules, state, depth)
+
+
+def perft(black, white, black_to_move, depth, size=8, backend='bitboard'):
+    # Leaf positions `depth` plies below the position (see the module docstring)
+    rules = _make(backend, size)
+    return _subtree(rules, rules.load(black, white, black_to_move), depth)
+
+
+def divide(black, white, black_to_move, depth, size=8, backend='bitboard'):
+    # {root move name ('pass' for a pass): leaves below it}; sums to perft
+    # unless the game is already over
+    rules = _make(backend, size)
+    if depth == 0:
+        return {}
+    return {rules.label(move): _subtree(rules, child, depth - 1)
+            for move, child in rules.children(rules.load(black, white, black_to_move))}
+
+
+def cross_check(black, white, black_to_move, depth, size=8, backends=None):
+    # Run perft under each backend. Returns ({backend: (leaves, seconds)},
+    # agreed); agreed is False when the backends' counts differ.
+    results = {}
+    for backend in backends or available_backends():
+        start = time.perf_counter()
+        leaves = perft(black, white, black_to_move, depth, size, backend)
+        results[backend] = (leaves, time.perf_counter() - start)
+    return results, len({leaves for leaves, _ in results.values()}) <= 1
+
+
+def _parse_position(text, size):
+    # 'black:white:B' (hex bitboards, side to move B or W) or 'start'
+    if text == 'start':
+        return start_position(size)
+    black, white, side = text.split(':')
+    return int(black, 16), int(white, 16), side.upper() == 'B'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Count Othello game-tree leaves (perft).')
+    parser.add_argument('depth', type=int)
+    parser.add_argument('--size', type=int, default=8)
+    parser.add_argument('--position', default='start',
+                        help="'start' or 'black:white:B|W' with hex bitboards")
+    parser.add_argument('--backends', help='comma-separated, default: every available one (%s)'
+                        % ', '.join(BACKENDS))
+    parser.add_argument('--divide', action='store_true',
+                        help='print leaves per root move, per backend')
+    args = parser.parse_args(argv)
+
+    black, white, black_to_move = _parse_position(args.position, args.size)
+    backends = args.backends.split(',') if args.backends else available_backends()
+    results, agreed = cross_check(black, white, black_to_move, args.depth, args.size, backends)
+    for backend, (leaves, seconds) in results.items():
+        rate = leaves / seconds if seconds > 0 else 0.0
+        print(f'{backend:<9} perft({args.depth}) = {leaves}  {seconds:.3f}s  {rate:,.0f} nodes/s')
+    if args.size == 8 and args.position == 'start' and args.depth < len(START_COUNTS):
+        expected = START_COUNTS[args.depth]
+        agreed = agreed and all(leaves == expected for leaves, _ in results.values())
+        print(f'expected {expected}')
+    if args.divide or not agreed:
+        splits = {backend: divide(black, white, black_to_move, args.depth, args.size, backend)
+                  for backend in backends}
+        for move in sorted(set().union(*splits.values())):
+            counts = [splits[backend].get(move) for backend in backends]
+            flag = '' if len(set(counts)) == 1 else '   MISMATCH'
+            print(f'  {move:<5} ' + '  '.join(f'{b}={c}' for b, c in zip(backends, counts)) + flag)
+    print('backends agree' if agreed else 'BACKENDS DISAGREE')
+    return 0 if agreed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,14 @@
 from Board import spaceState
+import Bitboard
+import Trace
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class Player:
+    __slots__ = ('color', 'mode')
+
     def __init__(self, color, mode = "human"):
         self.color = color
         self.mode = mode
@@ -16,94 +20,56 @@ class Player:
         return spaceState.BLACK
     def getPossibleMoves(self, board):
         # Return a list of (x, y) tuples representing valid moves for this player
-        moves = []
-        for y in range(board.size):
-            for x in range(board.size):
-                if board.is_empty(x, y):
-                    if self.can_flip(x, y, board):
-                        moves.append((x, y))
-        logger.debug('getPossibleMoves for %s -> %s', self.color, moves)
+        own, opp = board.bitboards(self.color)
+        moves = list(Bitboard.iter_squares(Bitboard.legal_moves(own, opp, board.size), board.size))
+        if Trace.enabled and Trace.count('getPossibleMoves'):
+            logger.debug('getPossibleMoves for %s -> %s', self.color, moves)
         return moves
 
     def can_flip(self, x, y, board):
-        # This function should check if placing a piece at (x, y) would flip any opponent pieces
-        # It would need to check in all 8 directions for a valid move
-        # Check in each direction for opponent pieces followed by a piece of the player's color
+        # Check if placing a piece at (x, y) would flip any opponent pieces,
+        # i.e. some direction has opponent pieces capped by one of ours
         if board.is_empty(x, y):
-            for direction in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-                dx, dy = direction
-                if self.check_direction(x, y, dx, dy, self.opponent_color, board):
+            own, opp = board.bitboards(self.color)
+            if Bitboard.flip_mask(own, opp, x, y, board.size):
+                if Trace.enabled and Trace.count('can_flip'):
                     logger.debug('can_flip(%s,%s) for %s -> True', x, y, self.color)
-                    return True
-        logger.debug('can_flip(%s,%s) for %s -> False', x, y, self.color)
+                return True
+        if Trace.enabled and Trace.count('can_flip'):
+            logger.debug('can_flip(%s,%s) for %s -> False', x, y, self.color)
         return False
                 
     def check_direction(self, x, y, dx, dy, opponent_color, board):
-        # This function should check in a specific direction (dx, dy) for opponent pieces followed by a piece of the player's color
-        # It would return True if it finds a valid move in that direction, otherwise False
-        
-        x += dx
-        y += dy
-    
-        # Check if the first piece in this direction is an opponent's piece
-        if 0 <= x < board.size and 0 <= y < board.size and board.board[y][x] == opponent_color:
-            # Continue checking in this direction
-            while 0 <= x < board.size and 0 <= y < board.size:
-                x += dx
-                y += dy
-                if 0 <= x < board.size and 0 <= y < board.size:
-                    # If we find an empty space, then this is not a valid move
-                    if board.board[y][x] == spaceState.EMPTY:
-                        break
-                    # If we find a piece of the player's color, then this is a valid move
-                    if board.board[y][x] == self.color:
-                        return True
-        return False
+        # Check in direction (dx, dy) for a run of opponent pieces capped by a piece
+        # of the player's color, walking the precomputed ray for this square once
+        ray = Bitboard.rays(board.size)[y * board.size + x][Bitboard.DIRECTION_INDEX[(dx, dy)]]
+        own = board.bitboards(self.color)[0]
+        opp = board.bitboards(opponent_color)[0]
+        return Bitboard.ray_flips(own, opp, ray) != 0
     
     def numberOfAddedPieces(self, x, y, board):
-        # This function should return the number of opponent pieces that would be flipped if the player places a piece at (x, y)
-        # It would need to check in all 8 directions and count the number of pieces that would be flipped
-        count = 0
-        for direction in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-            dx, dy = direction
-            if self.check_direction(x, y, dx, dy, self.opponent_color, board):
-                # Count the number of opponent pieces flipped in this direction
-                x_temp = x + dx
-                y_temp = y + dy
-                while 0 <= x_temp < board.size and 0 <= y_temp < board.size and board.board[y_temp][x_temp] == self.opponent_color:
-                    count += 1
-                    x_temp += dx
-                    y_temp += dy
-                logger.debug('numberOfAddedPieces(%s,%s) for %s -> %s', x, y, self.color, count)
+        # Return the number of opponent pieces flipped along the first direction
+        # (in the usual direction order) that captures anything, or None if none does
+        own, opp = board.bitboards(self.color)
+        for ray in Bitboard.rays(board.size)[y * board.size + x]:
+            line = Bitboard.ray_flips(own, opp, ray)
+            if line:
+                count = Bitboard.popcount(line)
+                if Trace.enabled and Trace.count('numberOfAddedPieces'):
+                    logger.debug('numberOfAddedPieces(%s,%s) for %s -> %s', x, y, self.color, count)
                 return count
     
     def calculateScore(self, board):
-        # This function should calculate the player's score based on the current state of the board
-        # It would count the number of pieces of the player's color on the board
-        score = 0
-        for row in board.board:
-            for cell in row:
-                if cell == self.color:
-                    score += 1
-        return score
+        # The player's score is the number of pieces of their colour on the board
+        own, _ = board.bitboards(self.color)
+        return Bitboard.popcount(own)
     
     def makeMove(self, x, y, board):
-        # This function should place a piece at (x, y) and flip the opponent's pieces accordingly
-        flipped = []
-        if board.is_empty(x, y) and self.can_flip(x, y, board):
-            board.place_piece(x, y, self.color)
-            # Flip the opponent's pieces in all 8 directions and record flipped coords
-            for direction in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-                dx, dy = direction
-                if self.check_direction(x, y, dx, dy, self.opponent_color, board):
-                    x_temp = x + dx
-                    y_temp = y + dy
-                    while 0 <= x_temp < board.size and 0 <= y_temp < board.size and board.board[y_temp][x_temp] == self.opponent_color:
-                        board.place_piece(x_temp, y_temp, self.color)
-                        flipped.append((x_temp, y_temp))
-                        x_temp += dx
-                        y_temp += dy
-        logger.debug('makeMove by %s placed (%s,%s) flipped=%s', self.color, x, y, flipped)
+        # Place a piece at (x, y) and flip the opponent's pieces accordingly,
+        # returning the flipped coords ordered by direction, nearest first.
+        # Pass the result to board.undo_move(x, y, flipped) to take the move back.
+        flipped = board.apply_move(x, y, self.color)
+        if Trace.enabled and Trace.count('makeMove'):
+            logger.debug('makeMove by %s placed (%s,%s) flipped=%s', self.color, x, y, flipped)
         return flipped
 
-    
\ No newline at end of file
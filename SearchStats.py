@@ -0,0 +1,207 @@
+"""Search statistics and profiling hooks for AI.
+
+After every choose_move_minimax the AI leaves a SearchStats in `ai.stats`:
+nodes visited, leaf evaluations, beta cutoffs, transposition-table probes and
+hits (and the hits that cut the search off outright), branching factor per
+ply, and time and nodes per iterative-deepening depth. merge() adds another
+search's numbers in, so a match runner can aggregate them over many moves
+(Tournament --stats), and to_dict()/from_dict() carry them across processes
+and into JSON.
+
+`ai.profile_hook`, when set, is called before each search and returns a
+context manager the search runs inside, so a profiler can wrap exactly one
+move. cprofile_hook() builds one around cProfile; profile_move() profiles a
+single move directly.
+"""
+import contextlib
+import cProfile
+import io
+import logging
+import pstats
+
+logger = logging.getLogger(__name__)
+
+# Plain counters, in to_dict() order
+_COUNTERS = ('searches', 'nodes', 'evaluations', 'cutoffs', 'tt_probes', 'tt_hits', 'tt_cutoffs')
+# Lists indexed by ply (expanded/children) or by depth (the rest)
+_SERIES = ('expanded', 'children', 'depth_searches', 'depth_ms', 'depth_nodes')
+
+
+def _add_into(target, source):
+    # Element-wise target += source, growing target as needed
+    if len(target) < len(source):
+        target.extend([0] * (len(source) - len(target)))
+    for index, value in enumerate(source):
+        target[index] += value
+
+
+def _trimmed(values):
+    end = len(values)
+    while end and not values[end - 1]:
+        end -= 1
+    return values[:end]
+
+
+class SearchStats:
+    __slots__ = ('method', 'depth', 'seconds', 'root_depth') + _COUNTERS + _SERIES
+
+    def __init__(self, method=None):
+        # how the move was found: 'book', 'endgame', 'minimax', 'alphabeta',
+        # 'parallel' or 'timed' ('mixed' once merged with a different one)
+        self.method = method
+        # deepest completed depth (empties for an endgame solve)
+        self.depth = 0
+        self.seconds = 0.0
+        # depth of the root the search is currently under, so a node at
+        # remaining depth d sits at ply root_depth - d
+        self.root_depth = 0
+        self.searches = 1 if method is not None else 0
+        self.nodes = 0
+        self.evaluations = 0
+        self.cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        # per ply: nodes whose moves were generated, and how many moves they had
+        self.expanded = [0]
+        self.children = [0]
+        # per depth: searches that completed it, and their time/nodes for it
+        self.depth_searches = []
+        self.depth_ms = []
+        self.depth_nodes = []
+
+    def enter_root(self, depth):
+        # A root search to `depth` starts: nodes below it count by ply from it
+        self.root_depth = depth
+        if len(self.expanded) <= depth:
+            grow = depth + 1 - len(self.expanded)
+            self.expanded.extend([0] * grow)
+            self.children.extend([0] * grow)
+
+    def add_depth(self, depth, ms, nodes):
+        # Record one completed iteration to `depth`
+        for series, value in ((self.depth_searches, 1), (self.depth_ms, ms), (self.depth_nodes, nodes)):
+            if len(series) <= depth:
+                series.extend([0] * (depth + 1 - len(series)))
+            series[depth] += value
+        self.depth = max(self.depth, depth)
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def branching(self):
+        # Mean moves per expanded node, by ply from the root
+        return [children / expanded if expanded else 0.0
+                for expanded, children in zip(_trimmed(self.expanded), self.children)]
+
+    def mean_branching(self):
+        expanded = sum(self.expanded)
+        return sum(self.children) / expanded if expanded else 0.0
+
+    def merge(self, other):
+        # Add `other`'s numbers to these; returns self
+        if other.method is not None and other.method != self.method:
+            self.method = other.method if self.method is None else 'mixed'
+        self.depth = max(self.depth, other.depth)
+        self.seconds += other.seconds
+        for name in _COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in _SERIES:
+            _add_into(getattr(self, name), getattr(other, name))
+        return self
+
+    def merge_worker(self, other):
+        # Fold in a helper process's share of this search: its tree counters
+        # and per-ply numbers. Not its time or search count, nor its nodes,
+        # which the searching AI already adds up.
+        for name in _COUNTERS[2:]:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        _add_into(self.expanded, other.expanded)
+        _add_into(self.children, other.children)
+
+    def to_dict(self):
+        out = {'method': self.method, 'depth': self.depth, 'seconds': self.seconds}
+        for name in _COUNTERS:
+            out[name] = getattr(self, name)
+        for name in _SERIES:
+            out[name] = _trimmed(getattr(self, name))
+        return out
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.method = data.get('method')
+        stats.depth = data.get('depth', 0)
+        stats.seconds = data.get('seconds', 0.0)
+        for name in _COUNTERS:
+            setattr(stats, name, data.get(name, 0))
+        for name in _SERIES:
+            setattr(stats, name, list(data.get(name, ())))
+        return stats
+
+    def summary(self):
+        # One line for status bars and logs
+        if not self.searches:
+            return 'no searches'
+        if self.method == 'book':
+            return 'book move'
+        depth = 'd%d' % self.depth if self.searches == 1 else 'max d%d' % self.depth
+        text = '%s %s  %d nodes  %.0f nps  %.0f ms' % (self.method, depth, self.nodes,
+                                                      self.nodes_per_second, self.seconds * 1000.0)
+        if self.tt_probes:
+            text += '  tt %.0f%%' % (self.tt_hit_rate * 100.0)
+        if sum(self.expanded):
+            text += '  bf %.1f' % self.mean_branching()
+        return text
+
+    def __repr__(self):
+        return 'SearchStats(%s)' % self.summary()
+
+
+def aggregate(stats):
+    # One SearchStats summing an iterable of them (None entries are skipped)
+    total = SearchStats()
+    for item in stats:
+        if item is not None:
+            total.merge(item)
+    return total
+
+
+def cprofile_hook(path=None, sort='cumulative', limit=25):
+    # A profile_hook that runs cProfile around each search. With `path`, each
+    # move's profile is dumped there (a '%d' in the path is replaced by the
+    # move number); otherwise the top `limit` functions are logged.
+    moves = [0]
+
+    @contextlib.contextmanager
+    def hook():
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            moves[0] += 1
+            if path is not None:
+                profiler.dump_stats(path % moves[0] if '%d' in path else path)
+            else:
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+                logger.info('search profile, move %d:\n%s', moves[0], out.getvalue())
+    return hook
+
+
+def profile_move(ai, board, depth=None, time_ms=None):
+    # Run one choose_move_minimax under cProfile; returns (move, pstats.Stats)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        move = ai.choose_move_minimax(board, depth, time_ms)
+    finally:
+        profiler.disable()
+    return move, pstats.Stats(profiler)
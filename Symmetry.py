@@ -0,0 +1,104 @@
+"""Board symmetries over bitboards.
+
+A square board has eight symmetries: the identity, three rotations and four
+reflections. transform(bb, t, size) maps a bitboard through symmetry `t`
+(an index into TRANSFORMS) using per-size byte lookup tables, and canonical()
+picks the symmetric form of a position with the smallest (black, white)
+bitboards, so all eight variants of a position share one key.
+"""
+from functools import lru_cache
+
+# Symmetry index -> (name, square mapping (x, y) -> (x', y') on a board whose
+# last index is `last`)
+TRANSFORMS = (
+    ('identity', lambda x, y, last: (x, y)),
+    ('rot90', lambda x, y, last: (last - y, x)),
+    ('rot180', lambda x, y, last: (last - x, last - y)),
+    ('rot270', lambda x, y, last: (y, last - x)),
+    ('mirror_x', lambda x, y, last: (last - x, y)),
+    ('mirror_y', lambda x, y, last: (x, last - y)),
+    ('transpose', lambda x, y, last: (y, x)),
+    ('anti_transpose', lambda x, y, last: (last - y, last - x)),
+)
+IDENTITY = 0
+
+# Symmetry that undoes each symmetry: the two quarter turns undo each other,
+# everything else is its own inverse
+INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+@lru_cache(maxsize=None)
+def square_indices(size):
+    # Per symmetry, the destination square index of every square index
+    last = size - 1
+    out = []
+    for _, mapping in TRANSFORMS:
+        dest = []
+        for index in range(size * size):
+            x, y = mapping(index % size, index // size, last)
+            dest.append(y * size + x)
+        out.append(tuple(dest))
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _byte_tables(size):
+    # Per symmetry, per byte of the bitboard, the 256 possible byte values
+    # already mapped to their destination bits
+    cells = size * size
+    nbytes = (cells + 7) // 8
+    tables = []
+    for indices in square_indices(size):
+        dest = [1 << index for index in indices]
+        per_byte = []
+        for chunk in range(nbytes):
+            bits = [dest[chunk * 8 + i] if chunk * 8 + i < cells else 0 for i in range(8)]
+            table = [0] * 256
+            for value in range(1, 256):
+                low = value & -value
+                table[value] = table[value ^ low] | bits[low.bit_length() - 1]
+            per_byte.append(table)
+        tables.append(tuple(per_byte))
+    return tuple(tables), nbytes
+
+
+def transform(bb, t, size):
+    # Bitboard `bb` mapped through symmetry `t`
+    if t == IDENTITY:
+        return bb
+    tables, nbytes = _byte_tables(size)
+    out = 0
+    for table, byte in zip(tables[t], bb.to_bytes(nbytes, 'little')):
+        if byte:
+            out |= table[byte]
+    return out
+
+
+def transform_square(x, y, t, size):
+    return TRANSFORMS[t][1](x, y, size - 1)
+
+
+def map_bit(move, t, size):
+    # Single-bit `move` mapped through symmetry `t`
+    return 1 << square_indices(size)[t][move.bit_length() - 1]
+
+
+def is_symmetric(black, white, size):
+    # True when some symmetry other than the identity leaves the position unchanged
+    return any(transform(black, t, size) == black and transform(white, t, size) == white
+               for t in range(1, len(TRANSFORMS)))
+
+
+def canonical(black, white, size):
+    # (black, white, t): the symmetric form of the position with the smallest
+    # (black, white) pair, and the symmetry `t` that maps the position onto it.
+    # transform(..., INVERSE[t], size) maps back.
+    best = (black, white, IDENTITY)
+    for t in range(1, len(TRANSFORMS)):
+        b = transform(black, t, size)
+        if b > best[0]:
+            continue
+        w = transform(white, t, size)
+        if (b, w) < best[:2]:
+            best = (b, w, t)
+    return best
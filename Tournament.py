@@ -0,0 +1,290 @@
+"""Headless AI-vs-AI match runner.
+
+Plays N games between two agents across a process pool, streaming one record
+per game to a JSONL or CSV file, and prints win rates, an Elo estimate and
+throughput when done:
+
+    python Tournament.py greedy alphabeta:4 -n 200 --workers 4 --out results.jsonl
+
+Agents are named by spec strings, see AGENTS; a '@<evaluator>' suffix such as
+'alphabeta:4@pattern' picks the agent's evaluation (see Evaluation). Each game opens with a few seeded
+random plies so games do not repeat; colours alternate from game to game.
+With --stats each agent's search statistics (see SearchStats) are summed over
+all its moves and printed, and JSONL records carry each side's totals.
+--archive appends every game's moves to a binary game archive (see
+GameRecord), in the order the games finish.
+"""
+import argparse
+import concurrent.futures
+import csv
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+
+from AI import AI, SEARCH_ALPHABETA, SEARCH_MINIMAX
+from Board import spaceState
+from Game import Game
+import Evaluation
+import GameRecord
+import SearchStats
+
+logger = logging.getLogger(__name__)
+
+# Column order for CSV output (JSONL uses the same keys)
+RECORD_FIELDS = ('game', 'black', 'white', 'black_score', 'white_score', 'winner',
+                 'opening', 'moves', 'seconds')
+
+
+class _Greedy(AI):
+    # Plays AI.choose_move (most flips) instead of searching
+    __slots__ = ()
+
+    def choose_move_minimax(self, board, depth=None, time_ms=None):
+        return None
+
+
+# spec name -> factory(color, arg) where arg is the text after ':' (or None)
+AGENTS = {
+    'greedy': lambda color, arg: _Greedy(color),
+    'minimax': lambda color, arg: AI(color, depth=int(arg or 2), search=SEARCH_MINIMAX),
+    'alphabeta': lambda color, arg: AI(color, depth=int(arg or 4), search=SEARCH_ALPHABETA),
+    'time': lambda color, arg: AI(color, time_ms=int(arg or 500)),
+}
+
+
+def make_agent(spec, color):
+    # Build an agent from a spec such as 'greedy', 'minimax:3', 'time:250' or
+    # 'alphabeta:4@pattern'
+    spec, _, evaluator = spec.partition('@')
+    name, _, arg = spec.partition(':')
+    if name not in AGENTS:
+        raise ValueError('Unknown agent %r (choose from %s)' % (spec, ', '.join(sorted(AGENTS))))
+    agent = AGENTS[name](color, arg or None)
+    if evaluator:
+        agent.evaluator = Evaluation.get_evaluator(evaluator)
+    return agent
+
+
+def _square_name(move, size):
+    x, y = move
+    return '%s%d' % (chr(ord('a') + x), y + 1) if size <= 26 else '%d,%d' % (x, y)
+
+
+def _random_opening(game, rng, plies):
+    # Play `plies` random legal moves through Game so passes are handled as usual
+    played = []
+    for _ in range(plies):
+        if game.check_game_over():
+            break
+        moves = game.current_player.getPossibleMoves(game.board)
+        move = rng.choice(moves)
+        game.play_turn(*move)
+        played.append(move)
+    return played
+
+
+def play_game(index, black_spec, white_spec, size=8, random_plies=4, seed=0, stats=False,
+              archive=False):
+    # Play one game and return its record. The opening is drawn from a
+    # per-game seed so any game can be replayed from (seed, index) alone.
+    # With stats=True the record also holds each side's summed SearchStats
+    # (as dicts) under 'black_stats' and 'white_stats'; with archive=True it
+    # holds the game's GameRecord under 'game_record'.
+    started = time.perf_counter()
+    black = make_agent(black_spec, spaceState.BLACK)
+    white = make_agent(white_spec, spaceState.WHITE)
+    game = Game(size, player1=black, player2=white)
+    rng = random.Random(seed * 1000003 + index)
+    opening = _random_opening(game, rng, random_plies)
+    moves = list(opening)
+    totals = {black: SearchStats.SearchStats(), white: SearchStats.SearchStats()}
+    while not game.check_game_over():
+        player = game.current_player
+        move = player.choose_move_minimax(game.board)
+        if stats:
+            totals[player].merge(player.stats)
+        if move is None:
+            move = player.choose_move(game.board)
+        game.play_turn(*move)
+        moves.append(move)
+    black_score = black.calculateScore(game.board)
+    white_score = white.calculateScore(game.board)
+    if black_score > white_score:
+        winner = 'black'
+    elif white_score > black_score:
+        winner = 'white'
+    else:
+        winner = 'draw'
+    record = {
+        'game': index,
+        'black': black_spec,
+        'white': white_spec,
+        'black_score': black_score,
+        'white_score': white_score,
+        'winner': winner,
+        'opening': ''.join(_square_name(m, size) for m in opening),
+        'moves': ''.join(_square_name(m, size) for m in moves),
+        'seconds': round(time.perf_counter() - started, 4),
+    }
+    if stats:
+        record['black_stats'] = totals[black].to_dict()
+        record['white_stats'] = totals[white].to_dict()
+    if archive:
+        record['game_record'] = GameRecord.GameRecord.from_game(game)
+    return record
+
+
+def elo_difference(score):
+    # Elo difference implied by an expected score in [0, 1]
+    if score <= 0.0:
+        return float('-inf')
+    if score >= 1.0:
+        return float('inf')
+    return -400.0 * math.log10(1.0 / score - 1.0) + 0.0  # + 0.0 turns -0.0 into 0.0
+
+
+class _RecordWriter:
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='')
+        self._csv = None
+        if path.endswith('.csv'):
+            # search stats are nested, so only JSONL records keep them
+            self._csv = csv.DictWriter(self._file, fieldnames=RECORD_FIELDS, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, record):
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _schedule(agent_a, agent_b, games, size, random_plies, seed, stats=False, archive=False):
+    # Game arguments with colours alternating; openings already used in this
+    # run are skipped by drawing the next index so no two games repeat
+    seen = set()
+    index = 0
+    attempts = 0
+    scheduled = []
+    while len(scheduled) < games:
+        black, white = (agent_a, agent_b) if len(scheduled) % 2 == 0 else (agent_b, agent_a)
+        if random_plies > 0:
+            probe = Game(size)
+            opening = tuple(_random_opening(probe, random.Random(seed * 1000003 + index), random_plies))
+            key = (opening, black)
+            attempts += 1
+            if key in seen and attempts < games * 20:
+                index += 1
+                continue
+            seen.add(key)
+        scheduled.append((index, black, white, size, random_plies, seed, stats, archive))
+        index += 1
+    return scheduled
+
+
+def run_match(agent_a, agent_b, games, workers=1, size=8, random_plies=4, seed=0, out=None,
+              stats=False, archive=None):
+    # Play the match and return a summary dict; records are streamed to `out`
+    # and the games appended to the GameRecord archive at `archive`.
+    # With stats=True the summary's 'stats' maps 'a' and 'b' to each agent's
+    # SearchStats summed over the match.
+    for spec in (agent_a, agent_b):
+        make_agent(spec, spaceState.BLACK)  # fail fast on a bad spec
+    scheduled = _schedule(agent_a, agent_b, games, size, random_plies, seed, stats, archive is not None)
+    # by schedule position, not spec, so a self-play match (agent_a == agent_b) tallies too
+    a_is_black = {args[0]: position % 2 == 0 for position, args in enumerate(scheduled)}
+    writer = _RecordWriter(out) if out else None
+    games_out = GameRecord.ArchiveWriter(archive) if archive else None
+    tally = {'wins': 0, 'losses': 0, 'draws': 0}
+    search_stats = {'a': SearchStats.SearchStats(), 'b': SearchStats.SearchStats()}
+    started = time.perf_counter()
+
+    def _record(record):
+        game_record = record.pop('game_record', None)
+        if games_out is not None:
+            games_out.append(game_record)
+        if writer is not None:
+            writer.write(record)
+        a_color = 'black' if a_is_black[record['game']] else 'white'
+        if stats:
+            b_color = 'white' if a_color == 'black' else 'black'
+            search_stats['a'].merge(SearchStats.SearchStats.from_dict(record[a_color + '_stats']))
+            search_stats['b'].merge(SearchStats.SearchStats.from_dict(record[b_color + '_stats']))
+        if record['winner'] == 'draw':
+            tally['draws'] += 1
+        elif record['winner'] == a_color:
+            tally['wins'] += 1
+        else:
+            tally['losses'] += 1
+
+    try:
+        if workers <= 1:
+            for args in scheduled:
+                _record(play_game(*args))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(play_game, *args) for args in scheduled]
+                for future in concurrent.futures.as_completed(futures):
+                    _record(future.result())
+    finally:
+        if writer is not None:
+            writer.close()
+        if games_out is not None:
+            games_out.close()
+
+    elapsed = time.perf_counter() - started
+    played = sum(tally.values())
+    score = (tally['wins'] + 0.5 * tally['draws']) / played if played else 0.0
+    summary = dict(tally, games=played, score=score, elo=elo_difference(score),
+                   seconds=elapsed, games_per_second=played / elapsed if elapsed > 0 else 0.0)
+    if stats:
+        summary['stats'] = search_stats
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play AI-vs-AI Othello matches headlessly.')
+    parser.add_argument('agent_a', help="agent spec, e.g. 'greedy', 'minimax:2', 'alphabeta:4', 'time:250', "
+                             "'alphabeta:4@pattern'")
+    parser.add_argument('agent_b')
+    parser.add_argument('-n', '--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--size', type=int, default=8)
+    parser.add_argument('--random-plies', type=int, default=4,
+                        help='random opening moves per game, to avoid duplicate games')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='stream per-game records to this .jsonl or .csv file')
+    parser.add_argument('--stats', action='store_true',
+                        help="sum and print each agent's search statistics")
+    parser.add_argument('--archive', help='append every game to this binary game archive')
+    args = parser.parse_args(argv)
+
+    summary = run_match(args.agent_a, args.agent_b, args.games, workers=args.workers,
+                        size=args.size, random_plies=args.random_plies, seed=args.seed,
+                        out=args.out, stats=args.stats, archive=args.archive)
+    played = summary['games']
+    print(f"{args.agent_a} vs {args.agent_b}: {played} games, "
+          f"+{summary['wins']} -{summary['losses']} ={summary['draws']}")
+    if played:
+        print(f"win rate {args.agent_a}: {summary['wins'] / played:.1%}  "
+              f"{args.agent_b}: {summary['losses'] / played:.1%}  draws: {summary['draws'] / played:.1%}")
+    print(f"score {summary['score']:.3f}  Elo({args.agent_a} - {args.agent_b}) {summary['elo']:+.0f}")
+    print(f"{summary['seconds']:.2f}s, {summary['games_per_second']:.2f} games/s")
+    if args.stats:
+        for label, spec in (('a', args.agent_a), ('b', args.agent_b)):
+            totals = summary['stats'][label]
+            print(f"{spec} search: {totals.searches} searches, {totals.summary()}, "
+                  f"{totals.evaluations} evals, {totals.cutoffs} cutoffs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
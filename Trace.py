@@ -0,0 +1,53 @@
+"""Opt-in, aggregated tracing for the rule-engine and search hot paths.
+
+Hot-path functions (Board.is_empty, Player.can_flip, ...) used to emit a
+logger.debug record on every call, which dominated search time whenever
+logging was configured at DEBUG. They now only do
+
+    if Trace.enabled and Trace.count('can_flip'):
+        logger.debug(...)
+
+so a disabled tracer costs one attribute check. When enabled, every call is
+counted and only every `sample_every`-th call per name (0 = none) is logged in
+full; Game.play_turn and AI searches log one summary line of the counts.
+
+Enable with OTHELLO_TRACE=1 (and OTHELLO_TRACE_SAMPLE=N for sampled per-call
+lines) or by calling Trace.enable().
+"""
+from collections import Counter
+import os
+
+enabled = os.environ.get('OTHELLO_TRACE', '') not in ('', '0')
+sample_every = int(os.environ.get('OTHELLO_TRACE_SAMPLE', '0') or 0)
+
+_counts = Counter()
+
+
+def enable(sample=0):
+    global enabled, sample_every
+    enabled = True
+    sample_every = int(sample)
+
+
+def disable():
+    global enabled
+    enabled = False
+    _counts.clear()
+
+
+def count(name, n=1):
+    # Record `n` calls of `name`; True when this call should be logged in full
+    _counts[name] += n
+    return sample_every > 0 and _counts[name] % sample_every == 0
+
+
+def snapshot():
+    return dict(_counts)
+
+
+def flush(log, label):
+    # Log the counts gathered since the last flush as one record, then reset
+    if enabled and _counts:
+        log.debug('%s trace: %s', label,
+                  ' '.join('%s=%d' % item for item in sorted(_counts.items())))
+    _counts.clear()
@@ -0,0 +1,154 @@
+"""Zobrist hashing and a bounded transposition table for the AI search."""
+from functools import lru_cache
+import random
+
+import Symmetry
+
+# Bound types stored with each entry
+EXACT = 0
+LOWER = 1  # search failed high: true score >= stored score
+UPPER = 2  # search failed low: true score <= stored score
+
+# Rough size of one stored entry (tuple + its ints/float) used to turn a
+# memory cap into a slot count
+ENTRY_BYTES = 160
+DEFAULT_BYTES = 16 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size):
+    # Per-square random keys for each colour plus a side-to-move key.
+    # Seeded so hashes (and therefore searches) are reproducible between runs.
+    rng = random.Random(0x07E110 + size)
+    cells = size * size
+    black = tuple(rng.getrandbits(64) for _ in range(cells))
+    white = tuple(rng.getrandbits(64) for _ in range(cells))
+    # XOR-ing flip[i] swaps the colour of the disc on square i
+    flip = tuple(b ^ w for b, w in zip(black, white))
+    side = rng.getrandbits(64)
+    return black, white, flip, side
+
+
+def hash_position(black, white, black_to_move, size):
+    # Full Zobrist hash of a position; searches update it incrementally instead
+    keys_black, keys_white, _, side = zobrist_keys(size)
+    key = side if black_to_move else 0
+    for bits, keys in ((black, keys_black), (white, keys_white)):
+        while bits:
+            low = bits & -bits
+            key ^= keys[low.bit_length() - 1]
+            bits ^= low
+    return key
+
+
+@lru_cache(maxsize=None)
+def _variant_keys(size):
+    # Per symmetry, Zobrist keys permuted so that hashing a position with them
+    # gives the hash of the position mapped through that symmetry
+    keys_black, keys_white, flip, side = zobrist_keys(size)
+    variants = []
+    for dest in Symmetry.square_indices(size):
+        variants.append((tuple(keys_black[d] for d in dest), tuple(keys_white[d] for d in dest),
+                         tuple(flip[d] for d in dest)))
+    return tuple(variants), side
+
+
+def hash_variants(black, white, black_to_move, size):
+    # Hashes of the position's eight symmetric variants, in Symmetry.TRANSFORMS
+    # order. The smallest is the position's canonical key (see canonical_key).
+    return tuple(hash_position(Symmetry.transform(black, t, size), Symmetry.transform(white, t, size),
+                               black_to_move, size)
+                 for t in range(len(Symmetry.TRANSFORMS)))
+
+
+def update_variants(keys, move, flips, mover_is_black, size):
+    # update_hash for every hash of hash_variants at once
+    variants, side = _variant_keys(size)
+    index = move.bit_length() - 1
+    squares = []
+    while flips:
+        low = flips & -flips
+        squares.append(low.bit_length() - 1)
+        flips ^= low
+    out = []
+    for key, (keys_black, keys_white, flip) in zip(keys, variants):
+        key ^= side ^ (keys_black[index] if mover_is_black else keys_white[index])
+        for square in squares:
+            key ^= flip[square]
+        out.append(key)
+    return tuple(out)
+
+
+def canonical_key(keys):
+    # (key, t) for hash_variants output: the key shared by all symmetric
+    # variants and the symmetry that maps this position onto the keyed form
+    key = min(keys)
+    return key, keys.index(key)
+
+
+def update_hash(key, move, flips, mover_is_black, size):
+    # Hash after the side to move plays single-bit `move` flipping `flips`
+    keys_black, keys_white, flip, side = zobrist_keys(size)
+    index = move.bit_length() - 1
+    key ^= side ^ (keys_black[index] if mover_is_black else keys_white[index])
+    while flips:
+        low = flips & -flips
+        key ^= flip[low.bit_length() - 1]
+        flips ^= low
+    return key
+
+
+class TranspositionTable:
+    # Two-tier table: each bucket has a depth-preferred slot, which is only
+    # replaced by an equal or deeper search, and an always-replace slot that
+    # holds whatever the depth-preferred slot turned away.
+    def __init__(self, max_bytes=DEFAULT_BYTES):
+        self.max_bytes = max_bytes
+        self.buckets = max(1, max_bytes // (2 * ENTRY_BYTES))
+        self.clear()
+
+    def clear(self):
+        # entries are (key, depth, score, bound, best_move) tuples
+        self._deep = [None] * self.buckets
+        self._recent = [None] * self.buckets
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def probe(self, key):
+        # Return the entry stored for `key`, or None
+        bucket = key % self.buckets
+        for entry in (self._deep[bucket], self._recent[bucket]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        if self._deep[bucket] is not None or self._recent[bucket] is not None:
+            # bucket is in use by other positions
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, best_move):
+        bucket = key % self.buckets
+        entry = (key, depth, score, bound, best_move)
+        self.stores += 1
+        deep = self._deep[bucket]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            if deep is not None and deep[0] != key:
+                # demote the shallower entry rather than dropping it outright
+                self._recent[bucket] = deep
+            self._deep[bucket] = entry
+        else:
+            self._recent[bucket] = entry
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'buckets': self.buckets,
+        }
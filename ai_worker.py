@@ -0,0 +1,208 @@
+"""Background AI search so the pygame loop keeps rendering while the AI thinks."""
+import copy
+import logging
+import multiprocessing
+import threading
+
+from Board import Board
+
+logger = logging.getLogger(__name__)
+
+
+def _pick_move(player, board):
+    # Same choice PygameUI has always made: minimax first, greedy as a fallback
+    move = None
+    if hasattr(player, 'choose_move_minimax'):
+        move = player.choose_move_minimax(board)
+    if move is None and not _cancelled(player) and hasattr(player, 'choose_move'):
+        move = player.choose_move(board)
+    return move
+
+
+def _stats(player):
+    # The player's SearchStats for the move just picked, if it keeps any
+    return getattr(player, 'stats', None)
+
+
+def _cancelled(player):
+    event = getattr(player, 'cancel_event', None)
+    return event is not None and event.is_set()
+
+
+class _CancelToken:
+    # Event-like view of a shared "cancelled up to request id" counter, so a
+    # cancel can never be lost to, or leak into, a neighbouring request
+    def __init__(self, cancelled_upto, request_id):
+        self._cancelled_upto = cancelled_upto
+        self._request_id = request_id
+
+    def is_set(self):
+        return self._cancelled_upto.value >= self._request_id
+
+
+def _process_main(conn, cancelled_upto):
+    # Worker process loop: receive (request_id, token, player, black, white, size),
+    # answer (request_id, move, search stats). Players sent with a token are cached so an AI
+    # keeps its transposition table warm across the moves of one game.
+    players = {}
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        request_id, token, player, black, white, size = request
+        if token is not None:
+            if token not in players:
+                if len(players) >= 8:
+                    players.clear()
+                players[token] = player
+            player = players[token]
+        player.cancel_event = _CancelToken(cancelled_upto, request_id)
+        board = Board(size)
+        board.set_bitboards(black, white)
+        try:
+            move = None if player.cancel_event.is_set() else _pick_move(player, board)
+        except Exception:
+            logger.exception('Error during AI search in worker process')
+            move = None
+        conn.send((request_id, move, _stats(player)))
+
+
+class AIWorker:
+    # Runs one AI move search at a time off the calling thread. submit() starts a
+    # search on a snapshot of the board, poll() returns its move once it is done,
+    # and cancel() abandons it; last_stats then holds the search's SearchStats
+    # (None for players that keep none). By default the search runs in a separate process
+    # so it does not compete with rendering for the GIL; use_process=False runs
+    # it on a thread instead (no extra process, but rendering shares the GIL).
+    def __init__(self, use_process=True):
+        self.use_process = use_process
+        self._request_id = 0
+        self._pending = None  # request id of the search we are waiting on
+        self._result = None
+        self.last_stats = None
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._cancelled_upto = None
+        self._thread_cancel = None
+
+    @property
+    def busy(self):
+        return self._pending is not None
+
+    def submit(self, player, board, token=None):
+        # Start searching for `player`'s move on a copy of `board`. Pass a token
+        # that identifies this player for the whole game to let the worker reuse
+        # its search state between moves.
+        self.cancel()
+        self._request_id += 1
+        self._pending = self._request_id
+        self._result = None
+        if self.use_process:
+            try:
+                self._ensure_process()
+                self._conn.send((self._request_id, token, player,
+                                 board.black, board.white, board.size))
+                return
+            except Exception:
+                logger.exception('AI worker process unavailable; falling back to a thread')
+                self.use_process = False
+                self._stop_process()
+        snapshot = Board(board.size)
+        snapshot.set_bitboards(board.black, board.white)
+        # Search on a copy so an abandoned search still winding down never shares
+        # counters or its cancel hook with the next one; AI's __copy__ shares the
+        # table on purpose
+        searcher = copy.copy(player)
+        self._thread_cancel = threading.Event()
+        searcher.cancel_event = self._thread_cancel
+        thread = threading.Thread(target=self._thread_main, name='ai-search',
+                                  args=(self._request_id, searcher, snapshot), daemon=True)
+        thread.start()
+
+    def poll(self):
+        # Return (True, move) once the pending search finished, else (False, None)
+        if self._pending is None:
+            return False, None
+        if self.use_process and self._conn is not None:
+            while self._conn.poll():
+                request_id, move, stats = self._conn.recv()
+                if request_id == self._pending:
+                    self._pending = None
+                    self.last_stats = stats
+                    return True, move
+            if not self._process.is_alive():
+                # worker died mid-search; report no move so the caller can retry
+                logger.error('AI worker process exited unexpectedly')
+                self._pending = None
+                self._stop_process()
+                return True, None
+            return False, None
+        with self._lock:
+            if self._result is not None and self._result[0] == self._pending:
+                _, move, self.last_stats = self._result
+                self._pending = None
+                self._result = None
+                return True, move
+        return False, None
+
+    def cancel(self):
+        # Abandon the pending search; its result, if it still arrives, is ignored
+        if self._pending is None:
+            return
+        if self._cancelled_upto is not None:
+            self._cancelled_upto.value = self._pending
+        if self._thread_cancel is not None:
+            self._thread_cancel.set()
+        self._pending = None
+
+    def close(self):
+        self.cancel()
+        self._stop_process()
+
+    def _thread_main(self, request_id, player, board):
+        try:
+            move = _pick_move(player, board)
+        except Exception:
+            logger.exception('Error during AI search in worker thread')
+            move = None
+        finally:
+            # the copy's parallel-search pool, if it started one, dies with it
+            close = getattr(player, 'close', None)
+            if close is not None:
+                close()
+        with self._lock:
+            # an abandoned search finishing late must not overwrite a newer result
+            if self._result is None or self._result[0] < request_id:
+                self._result = (request_id, move, _stats(player))
+
+    def _ensure_process(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        ctx = multiprocessing.get_context('spawn')
+        self._conn, child_conn = ctx.Pipe()
+        self._cancelled_upto = ctx.Value('q', 0, lock=False)
+        self._process = ctx.Process(target=_process_main, name='ai-search',
+                                    args=(child_conn, self._cancelled_upto), daemon=True)
+        self._process.start()
+        child_conn.close()
+
+    def _stop_process(self):
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except Exception:
+            pass
+        self._process.join(timeout=0.2)
+        if self._process.is_alive():
+            # still deep in a search: nothing worth waiting for
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        self._cancelled_upto = None
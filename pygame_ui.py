@@ -3,15 +3,24 @@ import sys
 import time
 import math
 import logging
+from collections import OrderedDict
 try:
     import pygame
 except Exception:
     pygame = None
 
+import OpeningBook
 from Board import spaceState
+from ai_worker import AIWorker
 
 logger = logging.getLogger(__name__)
 
+# (rim, face, edge) colours of a disc per side
+_PIECE_COLORS = {
+    spaceState.BLACK: ((18, 18, 18), (38, 38, 38), (10, 10, 10)),
+    spaceState.WHITE: ((190, 190, 190), (235, 235, 235), (155, 155, 155)),
+}
+
 
 class PygameUI:
     def __init__(self, game, cell_size=90):
@@ -30,12 +39,31 @@ class PygameUI:
         pygame.display.set_caption('Othello')
         self.screen = pygame.display.set_mode((self.width, self.height))
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 32)
+        # frame rate while animating or waiting on the AI; when idle the loop
+        # blocks on events, waking at least every idle_timeout_ms
+        self.fps = 30
+        self.idle_timeout_ms = 500
+        # Every font the UI draws with, looked up once here; text is drawn
+        # by name through _text(), which keeps the last text_cache_size
+        # rendered surfaces
+        self.fonts = {
+            'body': pygame.font.SysFont(None, 32),
+            'small': pygame.font.SysFont(None, 24),
+            'sub': pygame.font.SysFont(None, 30),
+            'modal_title': pygame.font.SysFont(None, 48),
+            'title': pygame.font.SysFont(None, 68),
+        }
+        self.text_cache_size = 256
+        self._text_cache = OrderedDict()
 
         # Menu state
         self.black_mode = 'Human'
         self.white_mode = 'Human'
         self.ai_depth = 2
+        # per-move think time in ms; None plays at the fixed ai_depth instead
+        self.ai_time_ms = None
+        # static evaluation the AI players search with (see Evaluation.EVALUATORS)
+        self.ai_evaluator = 'mobility'
         self.running = True
         self.in_menu = True
         self.game_over = False
@@ -46,6 +74,43 @@ class PygameUI:
         # Animation queue: list of dicts describing in-progress piece animations
         self._animations = []
 
+        # AI moves are searched in the background so rendering never stalls.
+        # _game_generation changes on every reset so stale searches are never replayed.
+        self._ai_worker = AIWorker()
+        self._ai_pending_move = None
+        self._game_generation = 0
+        # (color, SearchStats) of the last finished AI search, for the status panel
+        self._ai_stats = None
+        # AI players share the default opening book when one has been built;
+        # it is opened once here and closed when run() exits
+        self._book = None
+        if os.path.exists(OpeningBook.DEFAULT_PATH):
+            self._book = OpeningBook.OpeningBook(OpeningBook.DEFAULT_PATH)
+
+        # Render caches: surfaces that only depend on the window size, disc
+        # sprites per (color, cell size), and what the screen currently shows
+        # so each frame only redraws the parts that changed. None forces a
+        # full redraw.
+        self._layers = {}
+        self._piece_sprites = {}
+        self._drawn_frame = None
+        self._drawn_menu = None
+
+    def _text(self, font, text, color):
+        """Antialiased surface of `text` in the registered font `font`, from
+        an LRU cache keyed by (font, text, color)."""
+        key = (font, text, color)
+        cache = self._text_cache
+        surf = cache.get(key)
+        if surf is not None:
+            cache.move_to_end(key)
+            return surf
+        surf = self.fonts[font].render(text, True, color)
+        cache[key] = surf
+        if len(cache) > self.text_cache_size:
+            cache.popitem(last=False)
+        return surf
+
     def _lerp_color(self, color_a, color_b, t):
         return (
             int(color_a[0] + (color_b[0] - color_a[0]) * t),
@@ -53,47 +118,112 @@ class PygameUI:
             int(color_a[2] + (color_b[2] - color_a[2]) * t),
         )
 
-    def _draw_vertical_gradient(self, rect, top_color, bottom_color):
+    def _draw_vertical_gradient(self, rect, top_color, bottom_color, surface=None):
+        if surface is None:
+            surface = self.screen
         if rect.height <= 1:
-            pygame.draw.rect(self.screen, top_color, rect)
+            pygame.draw.rect(surface, top_color, rect)
             return
         for i in range(rect.height):
             t = i / max(1, rect.height - 1)
             color = self._lerp_color(top_color, bottom_color, t)
-            pygame.draw.line(self.screen, color, (rect.left, rect.top + i), (rect.right - 1, rect.top + i))
+            pygame.draw.line(surface, color, (rect.left, rect.top + i), (rect.right - 1, rect.top + i))
 
-    def _draw_cell(self, x, y):
-        left = x * self.cell_size
-        top = self.board_top + y * self.cell_size
-        outer_rect = pygame.Rect(left, top, self.cell_size, self.cell_size)
+    def _draw_cell(self, x, y, surface=None):
+        if surface is None:
+            surface = self.screen
+        outer_rect = self._cell_rect(x, y)
         inner_rect = outer_rect.inflate(-4, -4)
 
-        self._draw_vertical_gradient(outer_rect, (46, 122, 62), (34, 96, 48))
-        self._draw_vertical_gradient(inner_rect, (34, 110, 52), (26, 78, 40))
-        pygame.draw.line(self.screen, (76, 156, 88), outer_rect.topleft, outer_rect.topright, 1)
-        pygame.draw.line(self.screen, (18, 54, 28), outer_rect.bottomleft, outer_rect.bottomright, 1)
-        pygame.draw.line(self.screen, (76, 156, 88), outer_rect.topleft, outer_rect.bottomleft, 1)
-        pygame.draw.line(self.screen, (18, 54, 28), outer_rect.topright, outer_rect.bottomright, 1)
+        self._draw_vertical_gradient(outer_rect, (46, 122, 62), (34, 96, 48), surface)
+        self._draw_vertical_gradient(inner_rect, (34, 110, 52), (26, 78, 40), surface)
+        pygame.draw.line(surface, (76, 156, 88), outer_rect.topleft, outer_rect.topright, 1)
+        pygame.draw.line(surface, (18, 54, 28), outer_rect.bottomleft, outer_rect.bottomright, 1)
+        pygame.draw.line(surface, (76, 156, 88), outer_rect.topleft, outer_rect.bottomleft, 1)
+        pygame.draw.line(surface, (18, 54, 28), outer_rect.topright, outer_rect.bottomright, 1)
+
+    def _cell_rect(self, x, y):
+        return pygame.Rect(x * self.cell_size, self.board_top + y * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def _static_layer(self, name, build, flags=0):
+        """Window-sized surface drawn once by build(surface) and then reused
+        until the window size changes."""
+        key = (name, self.width, self.height)
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = pygame.Surface((self.width, self.height), flags)
+            layer = layer.convert_alpha() if flags & pygame.SRCALPHA else layer.convert()
+            build(layer)
+            self._layers[key] = layer
+        return layer
+
+    def _build_board_layer(self, surface):
+        # Everything behind the pieces: background, top bar, frame, cells and
+        # the status panel
+        board_px = self.size * self.cell_size
+        board_bottom = self.board_top + board_px
+        self._draw_vertical_gradient(pygame.Rect(0, 0, self.width, self.height), (52, 36, 22), (30, 20, 12), surface)
+
+        bar = pygame.Rect(0, 0, self.width, self.top_bar_height)
+        self._draw_vertical_gradient(bar, (44, 44, 52), (30, 30, 36), surface)
+        pygame.draw.line(surface, (82, 82, 95), (0, self.top_bar_height - 1), (self.width, self.top_bar_height - 1), 1)
+        label = self._text('body', 'Othello', (214, 214, 226))
+        surface.blit(label, (12, 10))
+
+        frame_outer = pygame.Rect(14, self.board_top + 14, board_px - 28, board_px - 28)
+        frame_inner = frame_outer.inflate(-16, -16)
+        self._draw_vertical_gradient(frame_outer, (129, 89, 49), (83, 52, 28), surface)
+        pygame.draw.rect(surface, (158, 116, 67), frame_outer, 2)
+        self._draw_vertical_gradient(frame_inner, (44, 118, 58), (22, 76, 38), surface)
+
+        for y in range(self.size):
+            for x in range(self.size):
+                self._draw_cell(x, y, surface)
+
+        panel_rect = pygame.Rect(0, board_bottom, self.width, self.window_margin)
+        self._draw_vertical_gradient(panel_rect, (34, 34, 34), (20, 20, 20), surface)
+        pygame.draw.line(surface, (66, 66, 66), (0, board_bottom), (self.width, board_bottom), 2)
+
+    def _build_menu_layer(self, surface):
+        self._draw_vertical_gradient(pygame.Rect(0, 0, self.width, self.height), (22, 22, 30), (12, 12, 20), surface)
+
+    def _build_shade_layer(self, surface):
+        surface.fill((0, 0, 0, 120))
+
+    def _piece_sprite(self, piece_color):
+        """Full-size disc with its shadow, pre-rendered onto a cell-sized
+        transparent surface."""
+        key = (piece_color, self.cell_size)
+        sprite = self._piece_sprites.get(key)
+        if sprite is None:
+            rim_color, face_fill, _ = _PIECE_COLORS[piece_color]
+            c = self.cell_size // 2
+            r = int(self.cell_size * 0.38)
+            shadow_offset = max(2, self.cell_size // 18)
+            sprite = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA).convert_alpha()
+            pygame.draw.circle(sprite, (0, 0, 0, 80), (c + shadow_offset, c + shadow_offset), r)
+            pygame.draw.circle(sprite, rim_color, (c, c), r)
+            pygame.draw.circle(sprite, face_fill, (c, c), r - 2)
+            self._piece_sprites[key] = sprite
+        return sprite
 
     def _draw_piece_at(self, x, y, piece_color, x_scale=1.0, y_scale=1.0, lift_px=0, edge_t=0.0):
         """Draw a disc at board position (x,y) with optional scale for animations.
         x_scale/y_scale squish for flip/drop. lift_px raises centre.
         edge_t (0..1) darkens the face toward its edge-tone for side-on flip depth."""
+        if x_scale >= 0.98 and y_scale >= 0.98 and not lift_px and not edge_t:
+            # A resting disc: blit the cached sprite
+            self.screen.blit(self._piece_sprite(piece_color), self._cell_rect(x, y))
+            return
+
         cx = x * self.cell_size + self.cell_size // 2
         cy = self.board_top + y * self.cell_size + self.cell_size // 2 - lift_px
         r = int(self.cell_size * 0.38)
         rx = max(1, int(r * x_scale))
         ry = max(1, int(r * y_scale))
 
-        if piece_color == spaceState.BLACK:
-            rim_color = (18, 18, 18)
-            face_fill = (38, 38, 38)
-            edge_fill = (10, 10, 10)
-        else:
-            rim_color = (190, 190, 190)
-            face_fill = (235, 235, 235)
-            edge_fill = (155, 155, 155)
-
+        rim_color, face_fill, edge_fill = _PIECE_COLORS[piece_color]
         fill_color = self._lerp_color(face_fill, edge_fill, edge_t)
 
         if x_scale >= 0.98 and y_scale >= 0.98:
@@ -156,35 +286,43 @@ class PygameUI:
         pygame.draw.circle(self.screen, (206, 232, 179), (cx, cy), hint_r)
         pygame.draw.circle(self.screen, (130, 162, 104), (cx, cy), hint_r, 1)
 
-    def _draw_top_bar(self):
-        self._top_buttons = []
-        bar = pygame.Rect(0, 0, self.width, self.top_bar_height)
-        self._draw_vertical_gradient(bar, (44, 44, 52), (30, 30, 36))
-        pygame.draw.line(self.screen, (82, 82, 95), (0, self.top_bar_height - 1), (self.width, self.top_bar_height - 1), 1)
-
-        label = self.font.render('Othello', True, (214, 214, 226))
-        self.screen.blit(label, (12, 10))
-
+    def _top_bar_layout(self):
         btn_w = 108
         btn_h = 34
         gap = 10
         y = 10
         reset_rect = pygame.Rect(self.width - btn_w - 12, y, btn_w, btn_h)
         menu_rect = pygame.Rect(reset_rect.left - btn_w - gap, y, btn_w, btn_h)
-
-        mouse_pos = pygame.mouse.get_pos()
-        for rect, label_txt, action in (
+        return (
             (menu_rect, 'Menu', self._go_to_menu),
             (reset_rect, 'Reset', self._reset_game),
-        ):
+        )
+
+    def _draw_top_bar(self, layer):
+        # The bar itself is part of the board layer; only the buttons (whose
+        # look follows the hover) are drawn here
+        self._top_buttons = []
+        bar = pygame.Rect(0, 0, self.width, self.top_bar_height)
+        self.screen.blit(layer, bar, bar)
+
+        mouse_pos = pygame.mouse.get_pos()
+        for rect, label_txt, action in self._top_bar_layout():
             hovered = rect.collidepoint(mouse_pos)
             bg = (70, 70, 85) if hovered else (56, 56, 68)
             self._draw_rounded_rect(rect, bg, radius=9, border_color=(108, 108, 128), border_width=1)
-            txt = self.font.render(label_txt, True, (228, 228, 238))
+            txt = self._text('body', label_txt, (228, 228, 238))
             self.screen.blit(txt, txt.get_rect(center=rect.center))
             self._top_buttons.append((rect, action))
+        return bar
+
+    def _cancel_ai(self):
+        self._ai_worker.cancel()
+        self._ai_pending_move = None
+        self._game_generation += 1
+        self._ai_stats = None
 
     def _go_to_menu(self):
+        self._cancel_ai()
         self._animations = []
         self.game_over = False
         self.game_over_text = ''
@@ -220,27 +358,11 @@ class PygameUI:
             self.game_over = False
             self.game_over_text = ''
 
-    def _draw_game_over_modal(self):
-        if not self.game_over:
-            self._game_over_buttons = []
-            return
-
-        self._game_over_buttons = []
-        shade = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        shade.fill((0, 0, 0, 120))
-        self.screen.blit(shade, (0, 0))
-
+    def _game_over_layout(self):
         modal_w, modal_h = min(520, self.width - 40), 220
         modal_x = (self.width - modal_w) // 2
         modal_y = self.board_top + (self.size * self.cell_size - modal_h) // 2
         rect = pygame.Rect(modal_x, modal_y, modal_w, modal_h)
-        self._draw_rounded_rect(rect, (34, 34, 44), radius=14, border_color=(78, 78, 98), border_width=1)
-
-        title_font = pygame.font.SysFont(None, 48)
-        t1 = title_font.render('Game Over', True, (233, 233, 242))
-        self.screen.blit(t1, t1.get_rect(centerx=rect.centerx, top=rect.top + 22))
-        t2 = self.font.render(self.game_over_text, True, (206, 206, 218))
-        self.screen.blit(t2, t2.get_rect(centerx=rect.centerx, top=rect.top + 80))
 
         btn_w, btn_h = 180, 42
         gap = 16
@@ -249,16 +371,33 @@ class PygameUI:
         y = rect.bottom - 62
         play_rect = pygame.Rect(start_x, y, btn_w, btn_h)
         menu_rect = pygame.Rect(start_x + btn_w + gap, y, btn_w, btn_h)
-
-        mouse_pos = pygame.mouse.get_pos()
-        for button_rect, label_txt, action in (
+        return rect, (
             (play_rect, 'Play Again', self._reset_game),
             (menu_rect, 'Back to Menu', self._go_to_menu),
-        ):
+        )
+
+    def _draw_game_over_modal(self):
+        if not self.game_over:
+            self._game_over_buttons = []
+            return
+
+        self._game_over_buttons = []
+        self.screen.blit(self._static_layer('shade', self._build_shade_layer, pygame.SRCALPHA), (0, 0))
+
+        rect, buttons = self._game_over_layout()
+        self._draw_rounded_rect(rect, (34, 34, 44), radius=14, border_color=(78, 78, 98), border_width=1)
+
+        t1 = self._text('modal_title', 'Game Over', (233, 233, 242))
+        self.screen.blit(t1, t1.get_rect(centerx=rect.centerx, top=rect.top + 22))
+        t2 = self._text('body', self.game_over_text, (206, 206, 218))
+        self.screen.blit(t2, t2.get_rect(centerx=rect.centerx, top=rect.top + 80))
+
+        mouse_pos = pygame.mouse.get_pos()
+        for button_rect, label_txt, action in buttons:
             hovered = button_rect.collidepoint(mouse_pos)
             bg = (56, 136, 84) if hovered else (46, 114, 70)
             self._draw_rounded_rect(button_rect, bg, radius=10, border_color=(98, 188, 128), border_width=1)
-            txt = self.font.render(label_txt, True, (232, 248, 236))
+            txt = self._text('body', label_txt, (232, 248, 236))
             self.screen.blit(txt, txt.get_rect(center=button_rect.center))
             self._game_over_buttons.append((button_rect, action))
 
@@ -276,7 +415,7 @@ class PygameUI:
         if border_color:
             pygame.draw.rect(self.screen, border_color, rect, border_width, border_radius=radius)
 
-    def _draw_menu_button(self, rect, label, active=False, hovered=False, font=None):
+    def _draw_menu_button(self, rect, label, active=False, hovered=False, font='body'):
         if active:
             bg, border, fg = (55, 140, 85), (100, 200, 130), (230, 255, 235)
         elif hovered:
@@ -284,8 +423,7 @@ class PygameUI:
         else:
             bg, border, fg = (46, 46, 58), (80, 80, 100), (185, 185, 200)
         self._draw_rounded_rect(rect, bg, radius=8, border_color=border, border_width=1)
-        f = font or self.font
-        surf = f.render(label, True, fg)
+        surf = self._text(font, label, fg)
         # Clip text to the button rect so it can never overflow
         text_rect = surf.get_rect(center=rect.center)
         self.screen.set_clip(rect)
@@ -300,27 +438,32 @@ class PygameUI:
                 return
 
     def draw_menu(self):
-        self._menu_buttons = []
+        """Draw the menu if its settings or the hovered button changed since
+        the last frame; returns the screen rects that need updating."""
         mouse_pos = pygame.mouse.get_pos()
+        self._drawn_frame = None
+        # button rects do not move, so last frame's tell what is hovered now
+        hovered = next((i for i, (r, _) in enumerate(getattr(self, '_menu_buttons', []))
+                        if r.collidepoint(mouse_pos)), None)
+        key = (self.black_mode, self.white_mode, self.ai_depth, self.ai_time_ms,
+               self.ai_evaluator, hovered)
+        if key == self._drawn_menu:
+            return []
+        self._drawn_menu = key
+        self._menu_buttons = []
 
         # Background
-        self._draw_vertical_gradient(
-            pygame.Rect(0, 0, self.width, self.height),
-            (22, 22, 30), (12, 12, 20)
-        )
+        self.screen.blit(self._static_layer('menu', self._build_menu_layer), (0, 0))
 
         # Card
-        card_w, card_h = min(480, self.width - 40), 420
+        card_w, card_h = min(480, self.width - 40), 480
         card_x = (self.width - card_w) // 2
         card_y = (self.height - card_h) // 2
         card = pygame.Rect(card_x, card_y, card_w, card_h)
         self._draw_rounded_rect(card, (32, 32, 44), radius=16, border_color=(60, 60, 80), border_width=1)
 
-        title_font = pygame.font.SysFont(None, 68)
-        sub_font = pygame.font.SysFont(None, 30)
-
         # Title
-        title_surf = title_font.render('Othello', True, (220, 220, 235))
+        title_surf = self._text('title', 'Othello', (220, 220, 235))
         self.screen.blit(title_surf, title_surf.get_rect(centerx=self.width // 2, top=card_y + 18))
 
         divider_y = card_y + 62
@@ -332,7 +475,7 @@ class PygameUI:
         btn_w, btn_h = 96, 42
 
         for player_label, attr in [('Black', 'black_mode'), ('White', 'white_mode')]:
-            lbl = sub_font.render(player_label, True, (160, 160, 178))
+            lbl = self._text('sub', player_label, (160, 160, 178))
             self.screen.blit(lbl, (col_label, row_y + 10))
             for i, option in enumerate(['Human', 'AI']):
                 bx = col_btn1 + i * (btn_w + 10)
@@ -340,26 +483,54 @@ class PygameUI:
                 active = getattr(self, attr) == option
                 self._draw_menu_button(r, option, active=active,
                                        hovered=(not active and r.collidepoint(mouse_pos)),
-                                       font=sub_font)
+                                       font='sub')
                 def _make_setter(a, v):
                     return lambda: setattr(self, a, v)
                 self._menu_buttons.append((r, _make_setter(attr, option)))
             row_y += 60
 
         # Difficulty
-        lbl = sub_font.render('Difficulty', True, (160, 160, 178))
+        lbl = self._text('sub', 'Difficulty', (160, 160, 178))
         self.screen.blit(lbl, (col_label, row_y + 10))
         diff_btn_w = 56
         diff_start_x = col_btn1
         for i, d in enumerate([1, 2, 3]):
             r = pygame.Rect(diff_start_x + i * (diff_btn_w + 10), row_y, diff_btn_w, btn_h)
-            active = self.ai_depth == d
+            active = self.ai_time_ms is None and self.ai_depth == d
             self._draw_menu_button(r, str(d), active=active,
                                    hovered=(not active and r.collidepoint(mouse_pos)),
-                                   font=sub_font)
+                                   font='sub')
             def _make_depth(val):
-                return lambda: setattr(self, 'ai_depth', val)
+                return lambda: self._set_difficulty(depth=val)
             self._menu_buttons.append((r, _make_depth(d)))
+        row_y += 60
+
+        # Time per move (alternative difficulty: search as deep as the budget allows)
+        lbl = self._text('sub', 'Time/move', (160, 160, 178))
+        self.screen.blit(lbl, (col_label, row_y + 10))
+        for i, (ms, text) in enumerate([(500, '0.5s'), (1000, '1s'), (3000, '3s')]):
+            r = pygame.Rect(diff_start_x + i * (diff_btn_w + 10), row_y, diff_btn_w, btn_h)
+            active = self.ai_time_ms == ms
+            self._draw_menu_button(r, text, active=active,
+                                   hovered=(not active and r.collidepoint(mouse_pos)),
+                                   font='sub')
+            def _make_time(val):
+                return lambda: self._set_difficulty(time_ms=val)
+            self._menu_buttons.append((r, _make_time(ms)))
+        row_y += 60
+
+        # Evaluation the AI searches with
+        lbl = self._text('sub', 'Evaluation', (160, 160, 178))
+        self.screen.blit(lbl, (col_label, row_y + 10))
+        for i, (name, text) in enumerate([('mobility', 'Basic'), ('pattern', 'Pattern')]):
+            r = pygame.Rect(col_btn1 + i * (btn_w + 10), row_y, btn_w, btn_h)
+            active = self.ai_evaluator == name
+            self._draw_menu_button(r, text, active=active,
+                                   hovered=(not active and r.collidepoint(mouse_pos)),
+                                   font='sub')
+            def _make_evaluator(val):
+                return lambda: setattr(self, 'ai_evaluator', val)
+            self._menu_buttons.append((r, _make_evaluator(name)))
         row_y += 66
 
         # Start button
@@ -368,11 +539,18 @@ class PygameUI:
         start_bg = (60, 155, 95) if start_hovered else (46, 130, 76)
         self._draw_rounded_rect(start_rect, start_bg, radius=10,
                                 border_color=(100, 200, 130), border_width=1)
-        start_lbl = sub_font.render('Start Game', True, (230, 255, 235))
+        start_lbl = self._text('sub', 'Start Game', (230, 255, 235))
         self.screen.set_clip(start_rect)
         self.screen.blit(start_lbl, start_lbl.get_rect(center=start_rect.center))
         self.screen.set_clip(None)
         self._menu_buttons.append((start_rect, self.setup_game))
+        return [self.screen.get_rect()]
+
+    def _set_difficulty(self, depth=None, time_ms=None):
+        # Difficulty is either a fixed depth or a time budget per move, not both
+        if depth is not None:
+            self.ai_depth = depth
+        self.ai_time_ms = time_ms
 
     def setup_game(self):
         # Configure players similar to the Tk UI
@@ -381,15 +559,18 @@ class PygameUI:
         from AI import AI
 
         if self.black_mode == 'AI':
-            black_player = AI(spaceState.BLACK, depth=ai_depth)
+            black_player = AI(spaceState.BLACK, depth=ai_depth, time_ms=self.ai_time_ms,
+                              evaluator=self.ai_evaluator, book=self._book)
         else:
             black_player = Player(spaceState.BLACK, mode='human')
 
         if self.white_mode == 'AI':
-            white_player = AI(spaceState.WHITE, depth=ai_depth)
+            white_player = AI(spaceState.WHITE, depth=ai_depth, time_ms=self.ai_time_ms,
+                              evaluator=self.ai_evaluator, book=self._book)
         else:
             white_player = Player(spaceState.WHITE, mode='human')
 
+        self._cancel_ai()
         self.game.reset(player1=black_player, player2=white_player)
         self._animations = []
         self.game_over = False
@@ -397,35 +578,8 @@ class PygameUI:
         self._game_over_buttons = []
         self.in_menu = False
 
-    def draw_board(self):
-        board_px = self.size * self.cell_size
-        board_bottom = self.board_top + board_px
-        self._draw_vertical_gradient(pygame.Rect(0, 0, self.width, self.height), (52, 36, 22), (30, 20, 12))
-        self._draw_top_bar()
-
-        frame_outer = pygame.Rect(14, self.board_top + 14, board_px - 28, board_px - 28)
-        frame_inner = frame_outer.inflate(-16, -16)
-        self._draw_vertical_gradient(frame_outer, (129, 89, 49), (83, 52, 28))
-        pygame.draw.rect(self.screen, (158, 116, 67), frame_outer, 2)
-        self._draw_vertical_gradient(frame_inner, (44, 118, 58), (22, 76, 38))
-
-        for y in range(self.size):
-            for x in range(self.size):
-                self._draw_cell(x, y)
-
-        # Static pieces — skip positions currently mid-animation
-        animating = self._animating_positions()
-        for y in range(self.size):
-            for x in range(self.size):
-                if (x, y) in animating:
-                    continue
-                cell = self.game.board.board[y][x]
-                if cell == spaceState.EMPTY:
-                    continue
-                self._draw_piece_at(x, y, cell)
-
-        # Animated pieces overlaid on top
-        now = pygame.time.get_ticks()
+    def _draw_animations(self, now):
+        # Animated pieces, drawn over their (already restored) cells
         piece_r = int(self.cell_size * 0.38)
         for anim in list(self._animations):
             elapsed = now - anim['start'] - anim['delay']
@@ -457,26 +611,109 @@ class PygameUI:
                         x_scale=xs, y_scale=y_scale, lift_px=lift_px, edge_t=edge_t
                     )
 
-        # Highlight possible moves
-        try:
-            moves = self.game.current_player.getPossibleMoves(self.game.board)
-        except Exception:
-            moves = []
-        for (mx, my) in moves:
-            self._draw_move_hint(mx, my)
+    def _cell_states(self, hints, now):
+        # {(x, y): what the cell shows}. Animating cells carry the clock, so
+        # they differ from frame to frame and are redrawn every frame.
+        grid = self.game.board.board
+        animating = self._animating_positions()
+        states = {}
+        for y in range(self.size):
+            row = grid[y]
+            for x in range(self.size):
+                if (x, y) in animating:
+                    states[x, y] = ('anim', now)
+                else:
+                    states[x, y] = (row[x], (x, y) in hints)
+        return states
 
-        # Status and scores area
-        black_score = self.game.player1.calculateScore(self.game.board)
-        white_score = self.game.player2.calculateScore(self.game.board)
+    def _status_lines(self):
+        # (status, AI stats, AI counters) lines of the panel below the board
+        black_score = self.game.score_for(self.game.player1)
+        white_score = self.game.score_for(self.game.player2)
         status = f'Current: {"Black" if self.game.current_player.color==spaceState.BLACK else "White"}   Black: {black_score} White: {white_score}'
-        surf = self.font.render(status, True, (234, 232, 226))
-        panel_rect = pygame.Rect(0, board_bottom, self.width, self.window_margin)
-        self._draw_vertical_gradient(panel_rect, (34, 34, 34), (20, 20, 20))
-        pygame.draw.line(self.screen, (66, 66, 66), (0, board_bottom), (self.width, board_bottom), 2)
-        self.screen.blit(surf, (12, board_bottom + 12))
+        if self._ai_worker.busy:
+            status += '   (thinking...)'
+        line = line2 = ''
+        if self._ai_stats is not None:
+            color, stats = self._ai_stats
+            side = 'Black' if color == spaceState.BLACK else 'White'
+            line = f'{side} AI: {stats.summary()}'
+            if stats.evaluations or stats.cutoffs:
+                line2 = f'evals {stats.evaluations}  cutoffs {stats.cutoffs}  tt cutoffs {stats.tt_cutoffs}'
+        return status, line, line2
 
+    def draw_board(self):
+        """Bring the screen up to date with the game. Only what changed since
+        the last frame is redrawn, over the cached board layer; returns the
+        screen rects that need updating (none on an idle frame)."""
+        layer = self._static_layer('board', self._build_board_layer)
+        self._drawn_menu = None
         self._update_game_over_state()
-        self._draw_game_over_modal()
+        now = pygame.time.get_ticks()
+        mouse_pos = pygame.mouse.get_pos()
+
+        # Highlight possible moves (cached on Game, so idle frames do no rule work)
+        try:
+            hints = set(self.game.current_moves)
+        except Exception:
+            hints = set()
+        cells = self._cell_states(hints, now)
+        top_hover = tuple(rect.collidepoint(mouse_pos) for rect, _, _ in self._top_bar_layout())
+        status = self._status_lines()
+        modal = None
+        if self.game_over:
+            modal = (self.game_over_text,) + tuple(
+                rect.collidepoint(mouse_pos) for rect, _, _ in self._game_over_layout()[1])
+        frame = (cells, top_hover, status, modal)
+        drawn = self._drawn_frame
+        if frame == drawn:
+            return []
+        self._drawn_frame = frame
+        # The game-over shade covers the whole window, so any change while the
+        # modal is up, or it coming or going, redraws everything
+        full = drawn is None or modal is not None or drawn[3] is not None
+
+        dirty = []
+        if full:
+            self.screen.blit(layer, (0, 0))
+            dirty.append(self.screen.get_rect())
+        if full or top_hover != drawn[1]:
+            rect = self._draw_top_bar(layer)
+            if not full:
+                dirty.append(rect)
+
+        changed = [pos for pos, state in cells.items() if full or drawn[0][pos] != state]
+        for x, y in changed:
+            rect = self._cell_rect(x, y)
+            if not full:
+                self.screen.blit(layer, rect, rect)
+                dirty.append(rect)
+            piece = cells[x, y][0]
+            if piece != 'anim' and piece != spaceState.EMPTY:
+                self.screen.blit(self._piece_sprite(piece), rect)
+        if self._animations:
+            self._draw_animations(now)
+        for x, y in changed:
+            if (x, y) in hints:
+                self._draw_move_hint(x, y)
+
+        # Status and scores area
+        if full or status != drawn[2]:
+            board_bottom = self.board_top + self.size * self.cell_size
+            panel_rect = pygame.Rect(0, board_bottom, self.width, self.window_margin)
+            if not full:
+                self.screen.blit(layer, panel_rect, panel_rect)
+                dirty.append(panel_rect)
+            surf = self._text('body', status[0], (234, 232, 226))
+            self.screen.blit(surf, (12, board_bottom + 12))
+            for row, text in enumerate(status[1:]):
+                if text:
+                    surf = self._text('small', text, (170, 170, 184))
+                    self.screen.blit(surf, (12, board_bottom + 48 + row * 24))
+
+        if full:
+            self._draw_game_over_modal()
+        return dirty
 
     def handle_click(self, pos):
         x_pix, y_pix = pos
@@ -499,8 +736,7 @@ class PygameUI:
         if self._animations_active():
             return
 
-        moves = list(self.game.current_player.getPossibleMoves(self.game.board))
-        if (x, y) not in moves:
+        if (x, y) not in self.game.current_moves:
             return
 
         result = self.game.play_turn(x, y)
@@ -509,33 +745,69 @@ class PygameUI:
         self._queue_animations(result)
 
     def ai_move_if_needed(self):
-        # If current player is AI, ask it to choose and play a move
+        # If current player is AI, start a background search for its move and
+        # play the move once the search is done and animations have settled
         try:
             cp = self.game.current_player
-            if self._animations_active():
-                return
             if self.game_over:
                 return
-            if getattr(cp, 'mode', 'human') == 'AI' and not self.game.check_game_over():
-                # choose using minimax if available
-                move = None
-                if hasattr(cp, 'choose_move_minimax'):
-                    move = cp.choose_move_minimax(self.game.board, depth=getattr(cp, 'depth', None))
-                if move is None and hasattr(cp, 'choose_move'):
-                    move = cp.choose_move(self.game.board)
-                if move:
-                    x, y = move
-                    result = self.game.play_turn(x, y)
-                    if result:
-                        self._queue_animations(result)
+            if getattr(cp, 'mode', 'human') != 'AI':
+                return
+            if self._ai_worker.busy:
+                done, move = self._ai_worker.poll()
+                if not done:
+                    return
+                # None means the search found nothing; the next frame asks again
+                self._ai_pending_move = move
+                if self._ai_worker.last_stats is not None:
+                    self._ai_stats = (cp.color, self._ai_worker.last_stats)
+            if self._ai_pending_move is None:
+                if not self.game.check_game_over():
+                    self._ai_worker.submit(cp, self.game.board,
+                                           token=(self._game_generation, cp.color))
+                return
+            if self._animations_active():
+                return
+            x, y = self._ai_pending_move
+            self._ai_pending_move = None
+            result = self.game.play_turn(x, y)
+            if result:
+                self._queue_animations(result)
         except Exception:
             logger.exception('Error during AI move')
 
+    def _idle(self):
+        # True when the screen cannot change without input: no animation is
+        # playing and no AI search is running, about to start or waiting to
+        # be played
+        if self.in_menu:
+            return True
+        if self._animations or self._ai_worker.busy or self._ai_pending_move is not None:
+            return False
+        return self.game_over or getattr(self.game.current_player, 'mode', 'human') != 'AI'
+
+    def _next_events(self):
+        # Poll while something is moving; otherwise sleep until input arrives
+        # or idle_timeout_ms passes
+        if not self._idle():
+            return pygame.event.get()
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
     def run(self):
+        # a board click waiting for its first frame, so the click-to-render
+        # delay can be read off the log (scripts/analyze_click_logs.py)
+        click_pending = False
         while self.running:
-            for event in pygame.event.get():
+            for event in self._next_events():
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # the window contents were lost; draw everything again
+                    self._drawn_frame = None
+                    self._drawn_menu = None
                 elif event.type == pygame.KEYDOWN:
                     if self.in_menu:
                         if event.key == pygame.K_b:
@@ -543,7 +815,7 @@ class PygameUI:
                         elif event.key == pygame.K_w:
                             self.white_mode = 'AI' if self.white_mode == 'Human' else 'Human'
                         elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3):
-                            self.ai_depth = int({pygame.K_1:1, pygame.K_2:2, pygame.K_3:3}[event.key])
+                            self._set_difficulty(depth=int({pygame.K_1:1, pygame.K_2:2, pygame.K_3:3}[event.key]))
                         elif event.key == pygame.K_s:
                             self.setup_game()
                         elif event.key == pygame.K_q:
@@ -555,17 +827,29 @@ class PygameUI:
                     if self.in_menu:
                         self.handle_menu_click(event.pos)
                     else:
+                        logger.debug('CLICK pixels=(%d,%d) -> board', *event.pos)
+                        click_pending = True
                         self.handle_click(event.pos)
 
             if self.in_menu:
-                self.draw_menu()
+                dirty = self.draw_menu()
             else:
                 self._update_animations()
-                self.draw_board()
+                dirty = self.draw_board()
                 # allow AI to play when it's their turn
                 self.ai_move_if_needed()
 
-            pygame.display.flip()
-            self.clock.tick(30)
-
+            # only the rects that changed go to the display; an idle frame
+            # sends none
+            if dirty:
+                pygame.display.update(dirty)
+                if click_pending:
+                    logger.debug('RENDER rects=%d after click', len(dirty))
+                    click_pending = False
+            self.clock.tick(self.fps)
+
+        self._ai_worker.close()
+        if self._book is not None:
+            self._book.close()
+            self._book = None
         pygame.quit()
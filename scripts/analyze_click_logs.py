@@ -1,73 +1,225 @@
-import re
+"""Match pointer events in UI logs and report dropped clicks and latencies.
+
+Usage: python scripts/analyze_click_logs.py [--window S] [--radius PX] [--show N] [LOG ...]
+
+Reads the logs (default: tests/logs/othello_ui_root.log and
+tests/logs/othello_ui.log, an older and a newer log of the same UI) line by
+line, merging them by timestamp, so a rotated set of any size can be given in
+any order. Four kinds of line are used:
+
+    ... CANVAS PRESS ... x=<x> y=<y>
+    ... CANVAS RELEASE ... x=<x> y=<y>
+    ... CLICK pixels=(<x>,<y>) ...
+    ... RENDER ...                      (first frame drawn after a click)
+
+Each release should be followed by a click, and each press by a release,
+within `window` seconds and `radius` pixels; the ones that are not are
+reported. The delays from each press to its click and from each click to the
+next render are printed as histograms. Events are joined in one pass over the
+merged stream, keeping only those still inside the window, so time and memory
+do not grow with the pairing.
+"""
+import argparse
+import heapq
 import os
-from datetime import datetime
+import re
+import sys
+import time
+from collections import deque
+from functools import lru_cache
 
 # locate logs under tests/logs
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 LOG_DIR = os.path.join(PROJECT_ROOT, 'tests', 'logs')
-DEBUG_LOG = os.path.join(LOG_DIR, 'othello_ui_debug.log')
-EVENT_LOG = os.path.join(LOG_DIR, 'othello_ui.log')
-
-# parse debug log for CANVAS PRESS/RELEASE
-press_re = re.compile(r'^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*CANVAS PRESS x=(?P<x>[-\d]+) y=(?P<y>[-\d]+)')
-release_re = re.compile(r'^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*CANVAS RELEASE x=(?P<x>[-\d]+) y=(?P<y>[-\d]+)')
-click_re = re.compile(r'^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*CLICK pixels=\((?P<x>[-\d]+),(?P<y>[-\d]+)\)')
-
-presses = []
-releases = []
-clicks = []
-
-with open(DEBUG_LOG, 'r') as f:
-    for line in f:
-        m = press_re.search(line)
-        if m:
-            ts = datetime.strptime(m.group('ts'), '%Y-%m-%d %H:%M:%S')
-            presses.append((ts, int(m.group('x')), int(m.group('y')), line.strip()))
-        m = release_re.search(line)
-        if m:
-            ts = datetime.strptime(m.group('ts'), '%Y-%m-%d %H:%M:%S')
-            releases.append((ts, int(m.group('x')), int(m.group('y')), line.strip()))
-
-with open(EVENT_LOG, 'r') as f:
-    for line in f:
-        m = click_re.search(line)
-        if m:
-            ts = datetime.strptime(m.group('ts'), '%Y-%m-%d %H:%M:%S')
-            clicks.append((ts, int(m.group('x')), int(m.group('y')), line.strip()))
-
-# For each release, find a matching click within 1s and within 10px
-issues = []
-for rel in releases[-200:]:  # analyze last 200 releases for speed
-    r_ts, rx, ry, r_line = rel
-    matched = False
-    for clk in clicks:
-        c_ts, cx, cy, c_line = clk
-        delta = (c_ts - r_ts).total_seconds()
-        if 0 <= delta <= 1.0 and abs(cx - rx) <= 10 and abs(cy - ry) <= 10:
-            matched = True
-            break
-    if not matched:
-        issues.append(rel)
-
-print(f'Total releases analyzed: {len(releases[-200:])}, unmatched releases: {len(issues)}')
-for ts, x, y, line in issues[:50]:
-    print(ts, x, y, line)
-
-# Summary of PRESS without RELEASE nearby
-# (find presses with no release within 1s)
-prs_issues = []
-for pr in presses[-200:]:
-    p_ts, px, py, p_line = pr
-    matched = False
-    for rl in releases:
-        r_ts, rx, ry, r_line = rl
-        delta = (r_ts - p_ts).total_seconds()
-        if 0 <= delta <= 1.0 and abs(px - rx) <= 10 and abs(py - ry) <= 10:
-            matched = True
-            break
-    if not matched:
-        prs_issues.append(pr)
-
-print(f'Presses without release (last 200): {len(prs_issues)}')
-for ts, x, y, line in prs_issues[:50]:
-    print(ts, x, y, line)
+DEFAULT_LOGS = (os.path.join(LOG_DIR, 'othello_ui_root.log'),
+                os.path.join(LOG_DIR, 'othello_ui.log'))
+
+PRESS, RELEASE, CLICK, RENDER = 'press', 'release', 'click', 'render'
+
+# Events with equal timestamps are taken in this order (debug logs only
+# have whole seconds)
+_RANK = {PRESS: 0, RELEASE: 1, CLICK: 2, RENDER: 3}
+
+_ts_re = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:[,.](\d{1,6}))?')
+_event_re = re.compile(r'CANVAS (?P<canvas>PRESS|RELEASE)\b.*?x=(?P<x>-?\d+) y=(?P<y>-?\d+)'
+                       r'|CLICK pixels=\((?P<cx>-?\d+),(?P<cy>-?\d+)\)'
+                       r'|(?P<render>\bRENDER\b)')
+
+# Latency histogram bucket upper bounds, in ms
+BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+@lru_cache(maxsize=4096)
+def _second(text):
+    # Epoch seconds of 'YYYY-MM-DD HH:MM:SS'; consecutive lines mostly share
+    # their second, so each is parsed once
+    return time.mktime(time.strptime(text, '%Y-%m-%d %H:%M:%S'))
+
+
+def iter_events(path):
+    """Yield (timestamp, rank, kind, x, y, line) for each event line of one
+    log, in file order. x and y are None for renders."""
+    with open(path, 'r', errors='replace') as f:
+        for line in f:
+            if 'CANVAS' not in line and 'CLICK' not in line and 'RENDER' not in line:
+                continue
+            m = _event_re.search(line)
+            if not m:
+                continue
+            t = _ts_re.match(line)
+            if not t:
+                continue
+            ts = _second(t.group(1))
+            if t.group(2):
+                ts += int(t.group(2)) / 10 ** len(t.group(2))
+            if m.group('canvas'):
+                kind = PRESS if m.group('canvas') == 'PRESS' else RELEASE
+                x, y = int(m.group('x')), int(m.group('y'))
+            elif m.group('cx') is not None:
+                kind, x, y = CLICK, int(m.group('cx')), int(m.group('cy'))
+            else:
+                kind, x, y = RENDER, None, None
+            yield ts, _RANK[kind], kind, x, y, line.rstrip('\n')
+
+
+def merged_events(paths):
+    # One time-ordered stream over every log
+    return heapq.merge(*(iter_events(path) for path in paths), key=lambda e: (e[0], e[1]))
+
+
+class Histogram:
+    def __init__(self, bounds_ms=BUCKETS_MS):
+        self.bounds = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        index = 0
+        while index < len(self.bounds) and ms > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def lines(self, width=40):
+        if not self.count:
+            return ['  (no samples)']
+        out = [f'  n={self.count} mean={self.total / self.count:.1f}ms max={self.max:.1f}ms']
+        top = max(self.counts)
+        lower = 0
+        for index, count in enumerate(self.counts):
+            if index < len(self.bounds):
+                label = f'{lower:>5}-{self.bounds[index]:<5}ms'
+                lower = self.bounds[index]
+            else:
+                label = f'{lower:>5}+     ms'
+            bar = '#' * (round(count * width / top) if count else 0)
+            out.append(f'  {label} {count:>7} {bar}')
+        return out
+
+
+class WindowJoin:
+    """Join each source event to the first later target event within
+    `window` seconds and, with a `radius`, within that many pixels on both
+    axes. Sources wait in a time-ordered queue and leave it once matched or
+    once older than the window, so only events inside the window are held.
+    A target resolves every waiting source it matches."""
+
+    def __init__(self, window, radius=None, keep=50):
+        self.window = window
+        self.radius = radius
+        self.keep = keep
+        self.pending = deque()
+        self.sources = 0
+        self.latency = Histogram()
+        self.unmatched = 0
+        # the first `keep` unmatched sources, to print
+        self.examples = []
+
+    def _expire(self, now):
+        while self.pending and now - self.pending[0][0] > self.window:
+            self._drop(self.pending.popleft())
+
+    def _drop(self, event):
+        self.unmatched += 1
+        if len(self.examples) < self.keep:
+            self.examples.append(event)
+
+    def source(self, event):
+        self._expire(event[0])
+        self.sources += 1
+        self.pending.append(event)
+
+    def target(self, event):
+        self._expire(event[0])
+        if not self.pending:
+            return
+        ts, radius = event[0], self.radius
+        waiting = deque()
+        for src in self.pending:
+            if radius is None or (abs(src[3] - event[3]) <= radius and abs(src[4] - event[4]) <= radius):
+                self.latency.add((ts - src[0]) * 1000.0)
+            else:
+                waiting.append(src)
+        self.pending = waiting
+
+    def finish(self):
+        while self.pending:
+            self._drop(self.pending.popleft())
+
+
+def analyze(events, window=1.0, radius=10, keep=50):
+    """Run the joins over a time-ordered event stream; returns a dict of
+    WindowJoin by name: 'release_click', 'press_release', 'press_click' and
+    'click_render'."""
+    joins = {
+        'release_click': WindowJoin(window, radius, keep),
+        'press_release': WindowJoin(window, radius, keep),
+        'press_click': WindowJoin(window, radius, keep),
+        'click_render': WindowJoin(window, None, keep),
+    }
+    feeds = {
+        PRESS: (('press_release', 'source'), ('press_click', 'source')),
+        RELEASE: (('press_release', 'target'), ('release_click', 'source')),
+        CLICK: (('release_click', 'target'), ('press_click', 'target'), ('click_render', 'source')),
+        RENDER: (('click_render', 'target'),),
+    }
+    for event in events:
+        for name, role in feeds[event[2]]:
+            getattr(joins[name], role)(event)
+    for join in joins.values():
+        join.finish()
+    return joins
+
+
+def _print_unmatched(title, join, show):
+    print(f'{title}: {join.unmatched} of {join.sources}')
+    for ts, _, _, x, y, line in join.examples[:show]:
+        print(' ', time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)), x, y, line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Match UI pointer events in logs.')
+    parser.add_argument('logs', nargs='*', help='log files, in any order (default: tests/logs)')
+    parser.add_argument('--window', type=float, default=1.0, help='max seconds between paired events')
+    parser.add_argument('--radius', type=int, default=10, help='max pixels between paired events')
+    parser.add_argument('--show', type=int, default=50, help='unmatched events to print per kind')
+    args = parser.parse_args(argv)
+
+    paths = args.logs or [path for path in DEFAULT_LOGS if os.path.exists(path)]
+    joins = analyze(merged_events(paths), args.window, args.radius, args.show)
+
+    _print_unmatched('Releases without a click', joins['release_click'], args.show)
+    _print_unmatched('Presses without a release', joins['press_release'], args.show)
+    for name, title in (('press_click', 'Press to click'), ('click_render', 'Click to render')):
+        print(f'{title} latency')
+        for line in joins[name].latency.lines():
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Benchmark NumPy batch evaluation (BatchEval) against the scalar evaluator.
+
+Usage: python scripts/bench_batch_eval.py [positions]
+
+Reports positions/sec for AI's per-board evaluation and for one
+BatchEval.evaluate_batch call over the same positions, checking that both give
+the same values.
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import AI as ai_module
+import BatchEval
+from tests.positions import random_positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark batch evaluation against the scalar evaluator.')
+    parser.add_argument('positions', type=int, nargs='?', default=20000,
+                        help='random positions to score (default 20000)')
+    args = parser.parse_args(argv)
+    count = args.positions
+    if not BatchEval.available():
+        print('numpy is not installed; BatchEval is unavailable')
+        return 1
+    pairs = [board.bitboards(color) for board, color in random_positions(count, seed=1)]
+
+    start = time.perf_counter()
+    scalar = [ai_module._evaluate_bits(own, opp, 8) for own, opp in pairs]
+    scalar_s = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = BatchEval.evaluate_bitboards(pairs, 8)
+    batch_s = time.perf_counter() - start
+    status = 'ok' if batch == scalar else 'MISMATCH'
+    print(f'{count} positions')
+    print(f'  scalar: {count / scalar_s:,.0f} positions/s')
+    print(f'  batch:  {count / batch_s:,.0f} positions/s ({scalar_s / batch_s:.1f}x) {status}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Solve a fixed set of endgame positions and log solve times.
+
+Usage: python scripts/bench_endgame.py [max_empties]
+
+Each position is solved exactly with Endgame.EndgameSolver, as
+AI.choose_move_minimax does from AI.endgame_empties down, and the value is
+checked against the known result. Positions with more than max_empties empties
+are skipped.
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import Bitboard
+import Endgame
+
+# (name, black bitboard, white bitboard, side to move, exact disc differential
+# for the side to move); bit y * 8 + x is square (x, y)
+POSITIONS = (
+    ('e10-101', 0x1818243203050301, 0x62675b4dfc7af49e, 'B', 36),
+    ('e10-202', 0x03070b0a1e2c0ec2, 0x90f8f4f0a1d3f109, 'B', -4),
+    ('e10-303', 0x2405073f23279f27, 0x98a8f8c05c5860c0, 'B', 6),
+    ('e12-101', 0x181824360b150100, 0x62675b49f46ad69e, 'B', 34),
+    ('e12-202', 0x03070b0a0e0c0e42, 0x90f8f4f0b1f37109, 'B', 4),
+    ('e12-303', 0x240507070377ff27, 0x98a8f8b87c080080, 'B', -6),
+    ('e14-101', 0x1878703c0c140100, 0x22070f43f26bd69e, 'B', 32),
+    ('e14-202', 0x03070b0206000342, 0x90f8f4f8b9fe7409, 'B', 8),
+    ('e14-303', 0x240517272317ff27, 0x98a8e8981c280080, 'B', -2),
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solve fixed endgame positions and log solve times.')
+    parser.add_argument('max_empties', type=int, nargs='?', default=14,
+                        help='skip positions with more empty squares (default 14)')
+    args = parser.parse_args(argv)
+    max_empties = args.max_empties
+    total = 0.0
+    failures = 0
+    for name, black, white, side, expected in POSITIONS:
+        empties = 64 - Bitboard.popcount(black | white)
+        if empties > max_empties:
+            continue
+        own, opp = (black, white) if side == 'B' else (white, black)
+        solver = Endgame.EndgameSolver(8)
+        start = time.perf_counter()
+        value, move = solver.solve(own, opp)
+        elapsed = time.perf_counter() - start
+        nodes = solver.nodes
+        total += elapsed
+        start = time.perf_counter()
+        wld, _ = solver.solve(own, opp, wld=True)
+        wld_elapsed = time.perf_counter() - start
+        ok = value == expected and wld == (expected > 0) - (expected < 0)
+        failures += not ok
+        index = move.bit_length() - 1
+        print(f'{name}: empties={empties} move={(index % 8, index // 8)} value={value:+d} '
+              f'nodes={nodes} time={elapsed:.3f}s wld={wld:+d} wld_time={wld_elapsed:.3f}s '
+              f'{"ok" if ok else f"WRONG (expected {expected:+d})"}')
+    print(f'total {total:.2f}s')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Measure the memory cost of boards and of a depth-4 search.
+
+Usage: python scripts/bench_memory.py [boards] [depth]
+
+Reports, for minimax and alpha-beta searches at `depth` from a fixed
+middle-game position, the peak traced allocation and the process's peak RSS,
+then bytes per Board (bitboards only, and with the cached grid view built) and
+per Player/AI object.
+"""
+import argparse
+import os
+import resource
+import sys
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from AI import AI, SEARCH_ALPHABETA, SEARCH_MINIMAX
+from Board import Board, spaceState
+from Player import Player
+
+# A fixed middle-game position, black to move
+_POSITION = (0x0000081c3c0c0000, 0x0000300000301000)
+
+
+def _peak_rss_kb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _bytes_per(make, count):
+    # Traced bytes per object for `count` objects built by make()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # the list holding them is not part of the objects
+    used -= sys.getsizeof(objects)
+    return used / count
+
+
+def _board_with_grid():
+    board = Board(8)
+    board.board
+    return board
+
+
+def _search(search, depth):
+    board = Board(8)
+    board.set_bitboards(*_POSITION)
+    ai = AI(spaceState.BLACK, depth=depth, search=search, endgame_empties=0)
+    tracemalloc.start()
+    move = ai.choose_move_minimax(board)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return move, ai.nodes, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the memory cost of boards and searches.')
+    parser.add_argument('boards', type=int, nargs='?', default=10000,
+                        help='objects to allocate per measurement (default 10000)')
+    parser.add_argument('depth', type=int, nargs='?', default=4,
+                        help='search depth (default 4)')
+    args = parser.parse_args(argv)
+    count, depth = args.boards, args.depth
+    # searches first, so the peak RSS they report is not the object lists'
+    print(f'depth-{depth} search from a middle-game position')
+    for search in (SEARCH_MINIMAX, SEARCH_ALPHABETA):
+        move, nodes, peak = _search(search, depth)
+        print(f'  {search:<9} move {move} nodes {nodes} '
+              f'peak traced {peak / 1024:.1f} KiB, peak RSS {_peak_rss_kb()} KiB')
+    print(f'bytes per object ({count} objects)')
+    for label, make in (('Board', lambda: Board(8)),
+                        ('Board + grid view', _board_with_grid),
+                        ('Player', lambda: Player(spaceState.BLACK)),
+                        ('AI (no table)', lambda: AI(spaceState.BLACK, tt_bytes=0))):
+        print(f'  {label:<18} {_bytes_per(make, count):8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark root-split parallel search against the serial alpha-beta search.
+
+Usage: python scripts/bench_parallel.py [depth] [workers ...]
+e.g.   python scripts/bench_parallel.py 7 1 2 4 8
+
+workers=1 is the plain serial search; higher counts use a process pool.
+Every parallel result is checked against the serial move.
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from AI import AI
+from Board import Board, spaceState
+
+
+def _positions():
+    # Start position plus a midgame reached by a fixed greedy line
+    positions = [('opening', Board(8), spaceState.BLACK)]
+    board = Board(8)
+    players = (AI(spaceState.BLACK), AI(spaceState.WHITE))
+    turn = 0
+    for _ in range(20):
+        move = players[turn].choose_move(board)
+        if move is None:
+            turn = 1 - turn
+            continue
+        players[turn].makeMove(move[0], move[1], board)
+        turn = 1 - turn
+    positions.append(('midgame', board, players[turn].color))
+    return positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare root-split parallel search with serial search.')
+    parser.add_argument('depth', type=int, nargs='?', default=6, help='search depth (default 6)')
+    parser.add_argument('workers', type=int, nargs='*', default=[1, 2, 4, 8],
+                        help='worker counts to time (default 1 2 4 8)')
+    args = parser.parse_args(argv)
+    depth = args.depth
+    worker_counts = args.workers
+    print(f'cpu_count={os.cpu_count()} depth={depth}')
+    for name, board, color in _positions():
+        serial = AI(color, depth=depth)
+        start = time.perf_counter()
+        expected = serial.choose_move_minimax(board)
+        serial_s = time.perf_counter() - start
+        print(f'{name}: serial move={expected} nodes={serial.nodes} time={serial_s:.2f}s')
+        for workers in worker_counts:
+            ai = AI(color, depth=depth, workers=workers)
+            try:
+                # spawn the pool with a depth-1 search, which stores nothing in
+                # any transposition table, so the timed search starts cold
+                ai.choose_move_minimax(board, depth=1)
+                start = time.perf_counter()
+                move = ai.choose_move_minimax(board)
+                elapsed = time.perf_counter() - start
+            finally:
+                ai.close()
+            status = 'ok' if move == expected else f'MISMATCH (serial {expected})'
+            print(f'  workers={workers:<2} move={move} nodes={ai.nodes} time={elapsed:.2f}s '
+                  f'speedup={serial_s / elapsed:.2f}x {status}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""Benchmark suite for the rule engine and the AI, without pygame.
+
+Usage:
+    python scripts/bench_suite.py [--depth N] [--out results.json]
+    python scripts/bench_suite.py --compare baseline.json [--threshold 0.15]
+
+Times Player.getPossibleMoves, Player.makeMove (with its undo),
+AI.evaluate_board and AI.choose_move_minimax at depths 1..N on the fixed
+positions below, and prints one line per benchmark. --out writes the results as
+JSON; a results file saved earlier serves as the baseline for --compare, which
+flags every benchmark that got more than `threshold` slower (and searches whose
+node counts changed) and exits with status 1 if any did.
+
+The suite runs in rounds of one short sample per benchmark and keeps each
+benchmark's fastest, so the samples of a benchmark are spread over the whole
+run. --compare times the benchmarks that look slower once more before
+reporting them, so a slow spell of a busy machine does not read as a
+regression.
+
+The positions are versioned by SUITE_VERSION: change it whenever POSITIONS or
+what a benchmark measures changes, since results of different versions do not
+compare.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from AI import AI
+from Board import Board, spaceState
+from Player import Player
+
+SUITE_VERSION = 1
+
+# Rounds of samples the suite takes by default (see run_suite), and the
+# length of one rules sample in seconds; a search sample is one search
+DEFAULT_ROUNDS = 20
+SAMPLE_SECONDS = 0.02
+
+# (name, black bitboard, white bitboard, side to move) on 8x8; bit y * 8 + x
+# is square (x, y). midgame-16 is the position bench_memory.py searches; the
+# others after the start position come from seeded random games, 6 to 50 plies in.
+POSITIONS = (
+    ('opening-start', 0x0000000810000000, 0x0000001008000000, 'B'),
+    ('opening-6', 0x0000000014080400, 0x0001021c08000000, 'B'),
+    ('midgame-16', 0x0000081c3c0c0000, 0x0000300000301000, 'B'),
+    ('midgame-20', 0x08182010383e4080, 0x00001c2f04000000, 'B'),
+    ('midgame-24', 0x806030080c030400, 0x0000003732f43810, 'B'),
+    ('endgame-26', 0x60300004e7868600, 0x00091a191878385c, 'B'),
+    ('endgame-10', 0x5080c0f8b0889d0e, 0x847e3f074f746241, 'B'),
+)
+
+
+def _setup(black, white, side):
+    board = Board(8)
+    board.set_bitboards(black, white)
+    color = spaceState.BLACK if side == 'B' else spaceState.WHITE
+    return board, color
+
+
+def _sampler(func, per=1):
+    # A function timing one short timeit run of `func`, sized on its first
+    # call to take about SAMPLE_SECONDS, and returning seconds per call
+    # (divided by `per`)
+    timer = timeit.Timer(func)
+    number = []
+
+    def sample():
+        if not number:
+            count, elapsed = timer.autorange()
+            number.append(max(1, int(count * SAMPLE_SECONDS / elapsed)))
+        return timer.timeit(number[0]) / number[0] / per
+    return sample
+
+
+def _bench_rules(name, board, color):
+    player = Player(color)
+    ai = AI(color, tt_bytes=0)
+    moves = player.getPossibleMoves(board)
+    benches = [
+        (f'getPossibleMoves/{name}', _sampler(lambda: player.getPossibleMoves(board)),
+         {'moves': len(moves)}),
+        (f'evaluate_board/{name}', _sampler(lambda: ai.evaluate_board(board)), {}),
+    ]
+    if moves:
+        def play_all():
+            for x, y in moves:
+                board.undo_move(x, y, player.makeMove(x, y, board))
+        benches.append((f'makeMove/{name}', _sampler(play_all, len(moves)), {'moves': len(moves)}))
+    return benches
+
+
+def _search_once(board, color, depth):
+    # (seconds, ai, move) of one search by a fresh AI, so every search starts
+    # from an empty table; making the AI is not timed. The endgame solver is
+    # off so each depth measures the search itself.
+    ai = AI(color, depth=depth, endgame_empties=0)
+    start = time.perf_counter()
+    move = ai.choose_move_minimax(board)
+    return time.perf_counter() - start, ai, move
+
+
+def _search_key(name, depth):
+    return f'choose_move_minimax/d{depth}/{name}'
+
+
+def _bench_search(name, board, color, depth):
+    # One sample is one search. An untimed first search fills the
+    # module-level caches and gives the node count and move.
+    _, ai, move = _search_once(board, color, depth)
+    return (_search_key(name, depth), lambda: _search_once(board, color, depth)[0],
+            {'nodes': ai.nodes, 'move': list(move) if move else None})
+
+
+def run_suite(depth=4, repeat=DEFAULT_ROUNDS, positions=POSITIONS, only=None):
+    # {benchmark key: {'seconds': ..., ...}} for every benchmark in the suite,
+    # or only those whose keys are in `only`.
+    # The suite runs `repeat` rounds of one sample per benchmark and each
+    # benchmark's fastest sample counts. Spreading a benchmark's samples over
+    # the whole run, rather than taking them back to back, keeps a slow spell
+    # of a busy or throttled machine from landing on all of them.
+    # Benchmarks outside `only` are never built, so their untimed warm-up
+    # searches are skipped too (rules samplers only size themselves when
+    # first sampled)
+    benches = []
+    for name, black, white, side in positions:
+        board, color = _setup(black, white, side)
+        benches.extend(bench for bench in _bench_rules(name, board, color)
+                       if only is None or bench[0] in only)
+        for d in range(1, depth + 1):
+            if only is None or _search_key(name, d) in only:
+                benches.append(_bench_search(name, board, color, d))
+    best = {}
+    for _ in range(repeat):
+        for key, sample, _ in benches:
+            seconds = sample()
+            if key not in best or seconds < best[key]:
+                best[key] = seconds
+    results = {}
+    for key, _, info in benches:
+        result = {'seconds': best[key]}
+        result.update(info)
+        if 'nodes' in info:
+            result['nps'] = info['nodes'] / best[key] if best[key] > 0 else 0.0
+        results[key] = result
+    return results
+
+
+def _slowdown(result, old):
+    return result['seconds'] / old['seconds'] if old['seconds'] > 0 else 1.0
+
+
+def compare(results, baseline, threshold=0.15):
+    # Lines describing benchmarks that regressed against `baseline` (both
+    # {key: {'seconds': ...}}): slower by more than `threshold`, or, for
+    # searches, a different node count
+    problems = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        ratio = _slowdown(result, old)
+        if ratio > 1.0 + threshold:
+            problems.append(f'REGRESSION {key}: {old["seconds"] * 1e6:.1f}us -> '
+                            f'{result["seconds"] * 1e6:.1f}us ({ratio - 1:+.0%})')
+        if 'nodes' in result and result['nodes'] != old.get('nodes'):
+            problems.append(f'NODES CHANGED {key}: {old.get("nodes")} -> {result["nodes"]}')
+    return problems
+
+
+def _describe(key, result):
+    text = f'{key:<42} {result["seconds"] * 1e6:12.1f}us'
+    if 'nps' in result:
+        text += f'  nodes {result["nodes"]:>7}  {result["nps"]:9.0f} nodes/s  move {result["move"]}'
+    elif 'moves' in result:
+        text += f'  ({result["moves"]} moves)'
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Othello rules and AI search.')
+    parser.add_argument('--depth', type=int, default=4, help='search depths 1..N')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_ROUNDS,
+                        help='rounds of samples; each benchmark\'s fastest counts (default %(default)s)')
+    parser.add_argument('--positions', help='comma-separated position names (default: all)')
+    parser.add_argument('--out', help='write the results as JSON')
+    parser.add_argument('--compare', help='baseline results JSON to check against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='slowdown ratio that counts as a regression (default 0.15)')
+    args = parser.parse_args(argv)
+
+    positions = POSITIONS
+    if args.positions:
+        wanted = set(args.positions.split(','))
+        positions = tuple(p for p in POSITIONS if p[0] in wanted)
+        unknown = wanted - {p[0] for p in positions}
+        if unknown:
+            parser.error('unknown positions: %s' % ', '.join(sorted(unknown)))
+
+    results = run_suite(args.depth, args.repeat, positions)
+    for key, result in results.items():
+        print(_describe(key, result))
+
+    if args.out:
+        report = {
+            'suite_version': SUITE_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'depth': args.depth,
+            'results': results,
+        }
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print(f'wrote {len(results)} results to {args.out}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('suite_version') != SUITE_VERSION:
+            print(f'baseline is suite version {baseline.get("suite_version")}, this is '
+                  f'{SUITE_VERSION}; results do not compare')
+            return 2
+        old = baseline['results']
+        slower = {key for key, result in results.items()
+                  if key in old and _slowdown(result, old[key]) > 1.0 + args.threshold}
+        if slower:
+            # time them again before reporting them: a real regression is
+            # still there, a slow spell of the machine has usually passed
+            print(f'timing {len(slower)} slower benchmark(s) again')
+            again = run_suite(args.depth, args.repeat, positions, only=slower)
+            for key, result in again.items():
+                if result['seconds'] < results[key]['seconds']:
+                    results[key] = result
+        problems = compare(results, old, args.threshold)
+        for line in problems:
+            print(line)
+        print(f'{len(problems)} problem(s) against {args.compare}')
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Measure what symmetric transposition-table keys buy in self-play.
+
+Usage: python scripts/bench_symmetry.py [games] [depth] [random_plies]
+
+Plays the same seeded self-play games with alpha-beta searchers using plain
+Zobrist keys, symmetric keys on every search (entries shared across the eight
+board symmetries) and the default, which uses symmetric keys only when the
+root position is itself symmetric. Reports table hit rates, nodes and time;
+all runs must choose the same moves, since only equal-depth entries ever cut.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from AI import AI
+from Board import spaceState
+from Game import Game
+
+
+def _play(games, depth, random_plies, symmetric):
+    hits = probes = nodes = 0
+    moves_played = []
+    start = time.perf_counter()
+    for index in range(games):
+        black = AI(spaceState.BLACK, depth=depth, symmetric_tt=symmetric, endgame_empties=0)
+        white = AI(spaceState.WHITE, depth=depth, symmetric_tt=symmetric, endgame_empties=0)
+        game = Game(8, player1=black, player2=white)
+        rng = random.Random(index)
+        ply = 0
+        while not game.check_game_over():
+            if ply < random_plies:
+                move = rng.choice(game.current_moves)
+            else:
+                player = game.current_player
+                move = player.choose_move_minimax(game.board)
+                nodes += player.nodes
+                if move is None:
+                    # every line loses by -inf (no moves); fall back like Tournament
+                    move = player.choose_move(game.board)
+            game.play_turn(*move)
+            moves_played.append(move)
+            ply += 1
+        for player in (black, white):
+            stats = player.tt.stats()
+            hits += stats['hits']
+            probes += stats['hits'] + stats['misses']
+    return {'hit_rate': hits / probes if probes else 0.0, 'hits': hits, 'probes': probes,
+            'nodes': nodes, 'seconds': time.perf_counter() - start, 'moves': moves_played}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure symmetric transposition-table keys in self-play.')
+    parser.add_argument('games', type=int, nargs='?', default=4,
+                        help='self-play games (default 4)')
+    parser.add_argument('depth', type=int, nargs='?', default=4,
+                        help='search depth (default 4)')
+    parser.add_argument('random_plies', type=int, nargs='?', default=0,
+                        help='random opening plies per game (default 0)')
+    args = parser.parse_args(argv)
+    games, depth, random_plies = args.games, args.depth, args.random_plies
+    print(f'{games} self-play games, depth {depth}, {random_plies} random opening plies')
+    results = {}
+    for label, symmetric in (('plain', False), ('always', True), ('auto', None)):
+        result = results[label] = _play(games, depth, random_plies, symmetric)
+        print(f'  {label:<6} hit rate {result["hit_rate"]:.2%} ({result["hits"]}/{result["probes"]}) '
+              f'nodes {result["nodes"]} time {result["seconds"]:.2f}s')
+    plain = results['plain']
+    for label in ('always', 'auto'):
+        result = results[label]
+        print(f'{label} vs plain: hit rate {plain["hit_rate"]:.2%} -> {result["hit_rate"]:.2%}, '
+              f'nodes {result["nodes"] / plain["nodes"] - 1:+.1%}, '
+              f'time {result["seconds"] / plain["seconds"] - 1:+.1%}, '
+              f'moves {"identical" if plain["moves"] == result["moves"] else "DIFFER"}')
+
+
+if __name__ == '__main__':
+    main()
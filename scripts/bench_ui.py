@@ -0,0 +1,78 @@
+"""Time the pygame UI's startup and frames.
+
+Usage: python scripts/bench_ui.py [frames]
+
+Reports the time to construct PygameUI (pygame and font setup) and to draw the
+first menu and board frames (which build the cached layers), then the mean time
+of a full menu redraw, a full board redraw, an idle board frame and a text
+render with and without the text cache. Runs on SDL's dummy video driver
+unless SDL_VIDEODRIVER is set, so no window opens.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from Game import Game
+from pygame_ui import PygameUI
+
+
+def _mean_ms(func, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the pygame UI's startup and frames.")
+    parser.add_argument('frames', type=int, nargs='?', default=200,
+                        help='frames per timed measurement (default 200)')
+    args = parser.parse_args(argv)
+    frames = args.frames
+
+    start = time.perf_counter()
+    ui = PygameUI(Game(8))
+    constructed = time.perf_counter()
+    ui.draw_menu()
+    menu_drawn = time.perf_counter()
+    ui.setup_game()
+    ui.draw_board()
+    board_drawn = time.perf_counter()
+    print('startup')
+    print(f'  construct          {(constructed - start) * 1000:8.2f} ms')
+    print(f'  first menu frame   {(menu_drawn - constructed) * 1000:8.2f} ms')
+    print(f'  first board frame  {(board_drawn - menu_drawn) * 1000:8.2f} ms')
+
+    def full_menu():
+        ui._drawn_menu = None
+        ui.draw_menu()
+
+    def full_board():
+        ui._drawn_frame = None
+        ui.draw_board()
+
+    def uncached_text():
+        ui._text_cache.clear()
+        ui._text('body', 'Current: Black   Black: 2 White: 2', (234, 232, 226))
+
+    print(f'per frame (mean of {frames})')
+    ui.in_menu = True
+    print(f'  menu, full redraw  {_mean_ms(full_menu, frames):8.3f} ms')
+    ui.in_menu = False
+    print(f'  board, full redraw {_mean_ms(full_board, frames):8.3f} ms')
+    print(f'  board, idle        {_mean_ms(ui.draw_board, frames):8.3f} ms')
+    print(f'  text, uncached     {_mean_ms(uncached_text, frames):8.3f} ms')
+    ui._text('body', 'Othello', (214, 214, 226))
+    print(f'  text, cached       '
+          f'{_mean_ms(lambda: ui._text("body", "Othello", (214, 214, 226)), frames):8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Random positions shared by the tests and the benchmark scripts.
+
+Callers put the project root on sys.path first and import this module as
+tests.positions.
+"""
+import random
+
+from Board import Board, spaceState
+from Player import Player
+
+
+def random_positions(count, size=8, seed=3):
+    # Play random games and snapshot (board, side to move) along the way
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board(size)
+        players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+        turn = 0
+        for _ in range(rng.randint(0, size * size - 8)):
+            moves = players[turn].getPossibleMoves(board)
+            if not moves:
+                turn = 1 - turn
+                moves = players[turn].getPossibleMoves(board)
+                if not moves:
+                    break
+            x, y = rng.choice(moves)
+            players[turn].makeMove(x, y, board)
+            turn = 1 - turn
+        positions.append((board, players[turn].color))
+    return positions
@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+import time
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from ai_worker import AIWorker
+from AI import AI
+from Board import Board, spaceState
+
+
+def _wait(worker, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        done, move = worker.poll()
+        if done:
+            return move
+        time.sleep(0.01)
+    raise AssertionError('AI worker did not answer in time')
+
+
+class TestAIWorker(unittest.TestCase):
+    def _check_mode(self, use_process):
+        worker = AIWorker(use_process=use_process)
+        try:
+            board = Board(8)
+            player = AI(spaceState.BLACK, depth=3)
+            worker.submit(player, board, token=('game', 1))
+            self.assertTrue(worker.busy)
+            move = _wait(worker)
+            self.assertEqual(move, AI(spaceState.BLACK, depth=3).choose_move_minimax(board))
+            self.assertFalse(worker.busy)
+            self.assertGreater(worker.last_stats.nodes, 0)
+
+            # a cancelled long search is dropped and the next request still answers
+            worker.submit(AI(spaceState.BLACK, depth=30), board)
+            worker.cancel()
+            self.assertFalse(worker.busy)
+            self.assertEqual(worker.poll(), (False, None))
+            worker.submit(player, board, token=('game', 1))
+            self.assertEqual(_wait(worker, timeout=10.0), move)
+        finally:
+            worker.close()
+
+    def test_thread_worker(self):
+        self._check_mode(use_process=False)
+
+    def test_process_worker(self):
+        self._check_mode(use_process=True)
+
+    def test_thread_worker_shares_the_table(self):
+        worker = AIWorker(use_process=False)
+        try:
+            player = AI(spaceState.BLACK, depth=3)
+            worker.submit(player, Board(8))
+            _wait(worker)
+            # the search filled the player's own table rather than a fresh copy's
+            self.assertGreater(player.tt.stores, 0)
+        finally:
+            worker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
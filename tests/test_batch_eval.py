@@ -0,0 +1,34 @@
+import unittest
+import os
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import AI as ai_module
+import BatchEval
+import Bitboard
+from tests.positions import random_positions
+
+
+@unittest.skipUnless(BatchEval.available(), 'numpy is not installed')
+class TestBatchEval(unittest.TestCase):
+    def test_batch_matches_scalar_evaluation(self):
+        positions = random_positions(30, seed=7)
+        pairs = [board.bitboards(color) for board, color in positions]
+        batch = BatchEval.evaluate_bitboards(pairs, 8)
+        self.assertEqual(batch, [ai_module._evaluate_bits(own, opp, 8) for own, opp in pairs])
+
+    def test_batch_legal_moves_match_bitboard(self):
+        positions = random_positions(30, seed=8)
+        own = BatchEval.bits_to_array([b.bitboards(c)[0] for b, c in positions], 8)
+        opp = BatchEval.bits_to_array([b.bitboards(c)[1] for b, c in positions], 8)
+        moves = BatchEval.legal_moves_batch(own, opp)
+        for index, (board, color) in enumerate(positions):
+            expected = BatchEval.bits_to_array(
+                [Bitboard.legal_moves(*board.bitboards(color), 8)], 8)[0]
+            self.assertTrue((moves[index] == expected).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import os
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Bitboard
+from Board import Board, spaceState
+from Player import Player
+
+
+def _reference_moves(player, board):
+    # Plain cell-by-cell scan used as an oracle for the bitboard engine
+    moves = []
+    for y in range(board.size):
+        for x in range(board.size):
+            if board.board[y][x] != spaceState.EMPTY:
+                continue
+            for dx, dy in Bitboard.DIRECTIONS:
+                if player.check_direction(x, y, dx, dy, player.opponent_color, board):
+                    moves.append((x, y))
+                    break
+    return moves
+
+
+class TestBitboard(unittest.TestCase):
+    def _perft(self, board, players, turn, depth):
+        if depth == 0:
+            return 1
+        moves = players[turn].getPossibleMoves(board)
+        if not moves:
+            if not players[1 - turn].getPossibleMoves(board):
+                return 1
+            return self._perft(board, players, 1 - turn, depth - 1)
+        total = 0
+        for x, y in moves:
+            child = Board(board.size)
+            child.set_bitboards(board.black, board.white)
+            players[turn].makeMove(x, y, child)
+            total += self._perft(child, players, 1 - turn, depth - 1)
+        return total
+
+    def test_start_position_perft(self):
+        players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+        counts = [self._perft(Board(8), players, 0, d) for d in range(1, 5)]
+        self.assertEqual(counts, [4, 12, 56, 244])
+
+    def test_moves_match_reference_scan(self):
+        for size in (4, 6, 8, 10):
+            board = Board(size)
+            players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+            turn = 0
+            for ply in range(size * size):
+                moves = players[turn].getPossibleMoves(board)
+                self.assertEqual(moves, _reference_moves(players[turn], board))
+                if not moves:
+                    turn = 1 - turn
+                    if not players[turn].getPossibleMoves(board):
+                        break
+                    continue
+                x, y = moves[(ply * 7) % len(moves)]
+                flipped = players[turn].makeMove(x, y, board)
+                self.assertTrue(flipped)
+                for fx, fy in flipped:
+                    self.assertEqual(board.board[fy][fx], players[turn].color)
+                turn = 1 - turn
+
+    def test_grid_assignment_round_trips(self):
+        board = Board(8)
+        grid = [row.copy() for row in board.board]
+        grid[0][0] = spaceState.BLACK
+        board.board = grid
+        self.assertEqual(board.get_piece(0, 0), spaceState.BLACK)
+        self.assertEqual(Bitboard.popcount(board.black), 3)
+        self.assertFalse(board.is_empty(0, 0))
+
+    def test_apply_and_undo_restore_position(self):
+        board = Board(8)
+        players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+        history = []
+        turn = 0
+        for ply in range(30):
+            moves = players[turn].getPossibleMoves(board)
+            if not moves:
+                turn = 1 - turn
+                continue
+            x, y = moves[(ply * 5) % len(moves)]
+            before = (board.black, board.white)
+            flipped = players[turn].makeMove(x, y, board)
+            history.append((x, y, flipped, before))
+            turn = 1 - turn
+        for x, y, flipped, before in reversed(history):
+            board.undo_move(x, y, flipped)
+            self.assertEqual((board.black, board.white), before)
+        self.assertEqual([row.count(spaceState.EMPTY) for row in board.board], [8, 8, 8, 6, 6, 8, 8, 8])
+        self.assertEqual(board.apply_move(0, 0, spaceState.BLACK), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import random
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Bitboard
+import Endgame
+from AI import AI
+from Board import Board, spaceState
+from Player import Player
+
+
+def _endgame_positions(count, size, empties, seed):
+    # Random games stopped at `empties` empty squares, with the side to move
+    # having a legal move; returns (board, color) pairs
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board(size)
+        players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+        turn = 0
+        while size * size - Bitboard.popcount(board.black | board.white) > empties:
+            moves = players[turn].getPossibleMoves(board)
+            if not moves:
+                turn = 1 - turn
+                moves = players[turn].getPossibleMoves(board)
+                if not moves:
+                    break
+            players[turn].makeMove(*rng.choice(moves), board)
+            turn = 1 - turn
+        remaining = size * size - Bitboard.popcount(board.black | board.white)
+        if remaining == empties and players[turn].getPossibleMoves(board):
+            positions.append((board, players[turn].color))
+    return positions
+
+
+def _full_search(own, opp, size, passed=False):
+    # Plain negamax to the end of the game
+    legal = Bitboard.legal_moves(own, opp, size)
+    if not legal:
+        if passed:
+            return Endgame.final_score(own, opp, size)
+        return -_full_search(opp, own, size, True)
+    best = None
+    for move in Bitboard.iter_bits(legal):
+        flips = Bitboard.flips_for_bit(own, opp, move, size)
+        value = -_full_search(opp & ~flips, own | flips | move, size)
+        best = value if best is None else max(best, value)
+    return best
+
+
+class TestEndgame(unittest.TestCase):
+    def test_solver_matches_full_search(self):
+        for size, empties in ((4, 8), (6, 7), (8, 7)):
+            for board, color in _endgame_positions(6, size, empties, seed=size):
+                own, opp = board.bitboards(color)
+                solver = Endgame.EndgameSolver(size)
+                value, move = solver.solve(own, opp)
+                expected = _full_search(own, opp, size)
+                self.assertEqual(value, expected)
+                flips = Bitboard.flips_for_bit(own, opp, move, size)
+                self.assertEqual(-_full_search(opp & ~flips, own | flips | move, size), expected)
+                wld, _ = solver.solve(own, opp, wld=True)
+                self.assertEqual(wld, (expected > 0) - (expected < 0))
+
+    def test_final_score_gives_empties_to_winner(self):
+        self.assertEqual(Endgame.final_score(0b111, 0b1000, 4), 2 + 12)
+        self.assertEqual(Endgame.final_score(0b1, 0b110, 4), -1 - 13)
+        self.assertEqual(Endgame.final_score(0b1, 0b10, 4), 0)
+
+    def test_ai_switches_to_solver(self):
+        for board, color in _endgame_positions(3, 8, 7, seed=21):
+            own, opp = board.bitboards(color)
+            expected = _full_search(own, opp, 8)
+            ai = AI(color, depth=1, endgame_empties=7)
+            x, y = ai.choose_move_minimax(board)
+            self.assertEqual(ai.completed_depth, 7)
+            move = Bitboard.bit(x, y, 8)
+            flips = Bitboard.flips_for_bit(own, opp, move, 8)
+            self.assertEqual(-_full_search(opp & ~flips, own | flips | move, 8), expected)
+
+    def test_solver_disabled_below_threshold(self):
+        board, color = _endgame_positions(1, 8, 10, seed=4)[0]
+        ai = AI(color, depth=1, endgame_empties=9)
+        ai.choose_move_minimax(board)
+        self.assertEqual(ai.completed_depth, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
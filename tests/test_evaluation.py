@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Bitboard
+import Evaluation
+from AI import AI
+from Board import Board, spaceState
+from Player import Player
+from tests.positions import random_positions
+
+
+def _random_bitboards(count, size=8, seed=3):
+    # (own, opp) bitboards of the side to move in random positions
+    return [board.bitboards(color) for board, color in random_positions(count, size, seed)]
+
+
+def _edge_code(own, opp, cells, size):
+    code = 0
+    for i, (x, y) in enumerate(cells):
+        b = Bitboard.bit(x, y, size)
+        code += 3 ** i * (1 if own & b else 2 if opp & b else 0)
+    return code
+
+
+class TestPatternEvaluator(unittest.TestCase):
+    def test_edge_lines_read_the_four_edges(self):
+        for size in (4, 6, 8):
+            lk = Evaluation.PatternEvaluator().lookups(size)
+            edges = [[(x, 0) for x in range(size)], [(x, size - 1) for x in range(size)],
+                     [(0, y) for y in range(size)], [(size - 1, y) for y in range(size)]]
+            for own, opp in _random_bitboards(20, size=size, seed=size):
+                codes = [lk.ternary[o] + 2 * lk.ternary[p]
+                         for o, p in zip(lk.edge_lines(own), lk.edge_lines(opp))]
+                self.assertEqual(codes, [_edge_code(own, opp, cells, size) for cells in edges])
+
+    def test_square_sum_matches_weights(self):
+        tables = Evaluation.default_tables(8)
+        lk = Evaluation.PatternEvaluator().lookups(8)
+        for own, _ in _random_bitboards(20):
+            expected = sum(w for i, w in enumerate(tables.squares) if own >> i & 1)
+            self.assertEqual(lk.square_sum(own), expected)
+
+    def test_evaluation_is_zero_sum(self):
+        evaluator = Evaluation.get_evaluator('pattern')
+        for own, opp in _random_bitboards(30, seed=4):
+            self.assertEqual(evaluator.evaluate(own, opp, 8), -evaluator.evaluate(opp, own, 8))
+
+    def test_tables_round_trip_through_file(self):
+        tables = Evaluation.default_tables(6)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'weights.bin')
+            tables.save(path)
+            loaded = Evaluation.PatternTables.load(path)
+            evaluator = Evaluation.get_evaluator('pattern:' + path)
+        self.assertEqual(loaded.squares, tables.squares)
+        self.assertEqual(loaded.edges, tables.edges)
+        self.assertEqual((loaded.mobility, loaded.frontier), (tables.mobility, tables.frontier))
+        self.assertIn(6, evaluator.tables)
+
+    def test_ai_searches_with_chosen_evaluator(self):
+        board = Board(8)
+        default = AI(spaceState.BLACK, depth=3)
+        self.assertIsInstance(default.evaluator, Evaluation.MobilityEvaluator)
+        pattern = AI(spaceState.BLACK, depth=3, evaluator='pattern')
+        self.assertIn(pattern.choose_move_minimax(board), Player(spaceState.BLACK).getPossibleMoves(board))
+        own, opp = board.bitboards(spaceState.BLACK)
+        self.assertEqual(pattern.evaluate_board(board), pattern.evaluator.evaluate(own, opp, 8))
+
+    def test_unknown_evaluator_rejected(self):
+        with self.assertRaises(ValueError):
+            Evaluation.get_evaluator('oracle')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import os
+import random
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from Board import spaceState
+from Game import Game
+
+
+class TestGameRuleCache(unittest.TestCase):
+    def test_cached_state_tracks_full_recount(self):
+        rng = random.Random(4)
+        for size in (6, 8):
+            game = Game(size)
+            while not game.check_game_over():
+                player = game.current_player
+                self.assertEqual(list(game.current_moves), player.getPossibleMoves(game.board))
+                self.assertEqual(game.black_score, game.player1.calculateScore(game.board))
+                self.assertEqual(game.white_score, game.player2.calculateScore(game.board))
+                self.assertTrue(game.play_turn(*rng.choice(game.current_moves)))
+            self.assertEqual(game.current_moves, ())
+            self.assertEqual(game.black_score + game.white_score,
+                             sum(cell != spaceState.EMPTY for row in game.board.board for cell in row))
+
+    def test_idle_reads_reuse_cache(self):
+        game = Game(8)
+        first = game.current_moves
+        self.assertIs(game.current_moves, first)
+        game.play_turn(*first[0])
+        self.assertIsNot(game.current_moves, first)
+
+    def test_outside_board_change_is_noticed(self):
+        game = Game(8)
+        self.assertEqual(game.black_score, 2)
+        game.player1.makeMove(3, 2, game.board)
+        self.assertEqual(game.black_score, 4)
+        self.assertEqual(game.white_score, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import GameRecord
+from Game import Game
+
+
+def _random_game(seed, size=6, stop=None):
+    # A game of random legal moves through Game.play_turn, optionally cut
+    # off after `stop` moves
+    rng = random.Random(seed)
+    game = Game(size)
+    while not game.check_game_over() and (stop is None or len(game.history) < stop):
+        game.play_turn(*rng.choice(game.current_moves))
+    return game
+
+
+def _game_with_pass(size=6):
+    for seed in range(500):
+        game = _random_game(seed, size)
+        if None in game.history:
+            return game
+    raise AssertionError('no random game with a pass')
+
+
+class TestGameRecord(unittest.TestCase):
+    def test_encode_decode_round_trip(self):
+        game = _game_with_pass()
+        record = GameRecord.GameRecord.from_game(game)
+        data = record.encode()
+        self.assertEqual(len(data), 6 + len(game.history))
+        decoded, end = GameRecord.GameRecord.decode(data)
+        self.assertEqual(decoded, record)
+        self.assertEqual(end, len(data))
+        self.assertEqual(decoded.plies(), game.history)
+        self.assertIn(GameRecord.PASS, decoded.moves)
+        self.assertTrue(decoded.finished)
+
+    def test_replays_agree_with_the_game(self):
+        for seed in range(20):
+            game = _random_game(seed, size=8 if seed % 2 else 6)
+            record = GameRecord.GameRecord.from_game(game)
+            self.assertEqual(GameRecord.replay_bitboards(record), (game.board.black, game.board.white))
+            replayed = GameRecord.replay(record)
+            self.assertEqual(replayed.history, game.history)
+            self.assertEqual((replayed.board.black, replayed.board.white),
+                             (game.board.black, game.board.white))
+
+    def test_unfinished_game(self):
+        record = GameRecord.GameRecord.from_game(_random_game(1, stop=5))
+        self.assertFalse(record.finished)
+        self.assertEqual(len(record.moves), 5)
+        GameRecord.replay_bitboards(record)
+
+    def test_bad_records_are_rejected(self):
+        record = GameRecord.GameRecord.from_game(_game_with_pass())
+        moves = bytearray(record.moves)
+        moves[0] = moves[1]
+        bad_move = GameRecord.GameRecord(record.size, moves, record.black_score, record.white_score)
+        missing_pass = GameRecord.GameRecord(record.size, record.moves.replace(bytes([GameRecord.PASS]), b''),
+                                             record.black_score, record.white_score)
+        wrong_score = GameRecord.GameRecord(record.size, record.moves, record.black_score + 1,
+                                            record.white_score - 1)
+        for bad in (bad_move, missing_pass, wrong_score):
+            with self.assertRaises(ValueError):
+                GameRecord.replay_bitboards(bad)
+            with self.assertRaises(ValueError):
+                GameRecord.replay(bad)
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'games.bin')
+        self.records = [GameRecord.GameRecord.from_game(_random_game(seed)) for seed in range(30)]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, records):
+        with GameRecord.ArchiveWriter(self.path) as archive:
+            return [archive.append(record) for record in records]
+
+    def test_append_random_access_and_scan(self):
+        self.assertEqual(self._write(self.records[:10]), list(range(10)))
+        # reopening appends after the games already there
+        self.assertEqual(self._write(self.records[10:]), list(range(10, 30)))
+        with GameRecord.ArchiveReader(self.path) as archive:
+            self.assertEqual(len(archive), 30)
+            self.assertEqual(archive[17], self.records[17])
+            self.assertEqual(archive[-1], self.records[-1])
+            self.assertEqual(list(archive), self.records)
+            with self.assertRaises(IndexError):
+                archive[30]
+
+    def test_reader_without_index_scans(self):
+        self._write(self.records)
+        os.remove(GameRecord.index_path(self.path))
+        with GameRecord.ArchiveReader(self.path) as archive:
+            self.assertEqual(len(archive), 30)
+            self.assertEqual(archive[29], self.records[29])
+
+    def test_writer_repairs_torn_tail(self):
+        self._write(self.records[:5])
+        # a game written without its index entry, then half of another
+        with open(self.path, 'ab') as f:
+            f.write(self.records[5].encode())
+            f.write(self.records[6].encode()[:10])
+        with open(GameRecord.index_path(self.path), 'ab') as f:
+            f.write(b'\x01\x02\x03')
+        self._write(self.records[7:9])
+        with GameRecord.ArchiveReader(self.path) as archive:
+            self.assertEqual(list(archive), self.records[:6] + self.records[7:9])
+            self.assertEqual(archive[6], self.records[7])
+
+    def test_not_an_archive(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'something else entirely')
+        with self.assertRaises(ValueError):
+            GameRecord.ArchiveReader(self.path)
+        with self.assertRaises(ValueError):
+            GameRecord.ArchiveWriter(self.path)
+        self.assertFalse(os.path.exists(GameRecord.index_path(self.path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
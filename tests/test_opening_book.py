@@ -0,0 +1,111 @@
+import unittest
+import os
+import pickle
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Bitboard
+import OpeningBook
+import Symmetry
+from AI import AI
+from Board import Board, spaceState
+
+
+def _variants(black, white, size):
+    return [(Symmetry.transform(black, t, size), Symmetry.transform(white, t, size))
+            for t in range(len(Symmetry.TRANSFORMS))]
+
+
+def _positions(size, plies):
+    # Every (black, white, color) up to `plies` moves from the start
+    start = Board(size)
+    frontier = [(start.black, start.white, spaceState.BLACK)]
+    found = []
+    for _ in range(plies):
+        found.extend(frontier)
+        frontier = [child for pos in frontier for child in OpeningBook._children(*pos, size)]
+    return found
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_transform_matches_square_mapping(self):
+        for size in (4, 5, 8):
+            for t in range(len(Symmetry.TRANSFORMS)):
+                for index in range(size * size):
+                    x, y = Symmetry.transform_square(index % size, index // size, t, size)
+                    self.assertEqual(Symmetry.transform(1 << index, t, size), Bitboard.bit(x, y, size))
+                self.assertEqual(Symmetry.transform(Symmetry.transform(0b1011, t, size),
+                                                    Symmetry.INVERSE[t], size), 0b1011)
+
+    def test_canonical_is_shared_by_all_variants(self):
+        for black, white, _ in _positions(8, 4):
+            cb, cw, t = Symmetry.canonical(black, white, 8)
+            self.assertEqual((Symmetry.transform(black, t, 8), Symmetry.transform(white, t, 8)), (cb, cw))
+            for vb, vw in _variants(black, white, 8):
+                self.assertEqual(Symmetry.canonical(vb, vw, 8)[:2], (cb, cw))
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'test.book')
+        self.entries = OpeningBook.build_book(size=6, plies=4, depth=2)
+        OpeningBook.write_book(self.path, self.entries, 6)
+        self.book = OpeningBook.OpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+        self._tmp.cleanup()
+
+    def _move_value(self, board, color, move):
+        ai = AI(color, search='minimax', endgame_empties=0)
+        flipped = ai.makeMove(move[0], move[1], board)
+        try:
+            return ai.Minimax(board, 1, False)
+        finally:
+            board.undo_move(move[0], move[1], flipped)
+
+    def test_lookup_finds_best_move_in_every_symmetric_variant(self):
+        self.assertEqual(len(self.book), len(self.entries))
+        for black, white, color in _positions(6, 4):
+            for vb, vw in _variants(black, white, 6):
+                board = Board(6)
+                board.set_bitboards(vb, vw)
+                move = self.book.lookup(board, color)
+                self.assertIsNotNone(move)
+                own, opp = board.bitboards(color)
+                values = [self._move_value(board, color, m)
+                          for m in Bitboard.iter_squares(Bitboard.legal_moves(own, opp, 6), 6)]
+                self.assertEqual(self._move_value(board, color, move), max(values))
+
+    def test_ai_plays_book_moves_without_searching(self):
+        ai = AI(spaceState.BLACK, depth=3, book=self.path)
+        board = Board(6)
+        move = ai.choose_move_minimax(board)
+        self.assertEqual(move, self.book.lookup(board, spaceState.BLACK))
+        self.assertEqual(ai.nodes, 0)
+        copy = pickle.loads(pickle.dumps(ai))
+        self.assertEqual(copy.choose_move_minimax(board), move)
+        copy.book.close()
+        ai.book.close()
+
+    def test_unknown_position_misses(self):
+        board = Board(8)
+        self.assertIsNone(self.book.lookup(board, spaceState.BLACK))
+        board = Board(6)
+        board.set_bitboards(0b111, 0b111000)
+        self.assertIsNone(self.book.lookup(board, spaceState.BLACK))
+
+    def test_rejects_other_files(self):
+        other = os.path.join(self._tmp.name, 'other.bin')
+        with open(other, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            OpeningBook.OpeningBook(other)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Perft
+from Board import spaceState
+from Game import Game
+from Player import Player
+
+# White to move with nine empties; its tree has passes and early game ends
+_LATE = (0x043c142224383020, 0xa8c1ebdddbc7ce8e, False)
+_LATE_COUNTS = (1, 6, 20, 90, 271, 887, 2084, 4292, 5955, 6666, 6915)
+
+
+class _NoSkipGame(Game):
+    # play_turn with its skip-turn branch broken: the side that cannot move
+    # is left to move
+    def play_turn(self, x, y):
+        result = super().play_turn(x, y)
+        if result is not None and self.history[-1] is None:
+            self.history.pop()
+            self.switch_player()
+        return result
+
+
+class TestPerft(unittest.TestCase):
+    def test_start_position_counts(self):
+        black, white, black_to_move = Perft.start_position(8)
+        for depth in range(7):
+            self.assertEqual(Perft.perft(black, white, black_to_move, depth), Perft.START_COUNTS[depth])
+
+    def test_backends_agree_from_the_start(self):
+        results, agreed = Perft.cross_check(*Perft.start_position(8), 4)
+        self.assertTrue(agreed)
+        self.assertEqual(results['grid'][0], Perft.START_COUNTS[4])
+        self.assertIn('game', results)
+
+    def test_passes_and_game_ends(self):
+        for depth, expected in enumerate(_LATE_COUNTS):
+            self.assertEqual(Perft.perft(*_LATE, depth), expected)
+        results, agreed = Perft.cross_check(*_LATE, 5)
+        self.assertTrue(agreed, results)
+
+    def test_game_backend_checks_play_turn_passes(self):
+        rules = Perft._make('game', 8)
+        rules.game = _NoSkipGame(8, player1=Player(spaceState.BLACK), player2=Player(spaceState.WHITE))
+        with self.assertRaises(AssertionError):
+            Perft._subtree(rules, rules.load(*_LATE), 5)
+
+    def test_divide_sums_to_perft(self):
+        split = Perft.divide(*_LATE, 4, backend='grid')
+        self.assertEqual(len(split), _LATE_COUNTS[1])
+        self.assertEqual(sum(split.values()), _LATE_COUNTS[4])
+
+    def test_small_board(self):
+        results, agreed = Perft.cross_check(*Perft.start_position(6), 5, size=6)
+        self.assertTrue(agreed)
+
+
+if __name__ == '__main__':
+    unittest.main()
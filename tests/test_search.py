@@ -0,0 +1,57 @@
+import unittest
+import os
+import sys
+import time
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from AI import AI, SEARCH_MINIMAX, SEARCH_ALPHABETA
+from Board import Board, spaceState
+from tests.positions import random_positions
+
+
+class TestSearch(unittest.TestCase):
+    def test_alphabeta_matches_minimax(self):
+        for board, color in random_positions(12):
+            for depth in (1, 2, 3):
+                # endgame solving off, so late positions compare the heuristic searches too
+                plain = AI(color, search=SEARCH_MINIMAX, endgame_empties=0)
+                pruned = AI(color, search=SEARCH_ALPHABETA, endgame_empties=0)
+                self.assertEqual(pruned.choose_move_minimax(board, depth),
+                                 plain.choose_move_minimax(board, depth))
+
+    def test_alphabeta_visits_fewer_nodes(self):
+        plain = AI(spaceState.BLACK, search=SEARCH_MINIMAX)
+        pruned = AI(spaceState.BLACK, search=SEARCH_ALPHABETA)
+        plain.choose_move_minimax(Board(8), 4)
+        pruned.choose_move_minimax(Board(8), 4)
+        self.assertLess(pruned.nodes, plain.nodes)
+
+    def test_time_budget_returns_last_completed_iteration(self):
+        board, color = random_positions(1, seed=11)[0]
+        timed = AI(color, time_ms=150)
+        start = time.perf_counter()
+        move = timed.choose_move_minimax(board)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 1.0)
+        self.assertGreaterEqual(timed.completed_depth, 1)
+        fixed = AI(color)
+        self.assertEqual(move, fixed.choose_move_minimax(board, timed.completed_depth))
+
+    def test_parallel_root_split_matches_serial(self):
+        positions = random_positions(6, seed=5)
+        parallel = {}
+        try:
+            for board, color in positions:
+                searcher = parallel.setdefault(color, AI(color, workers=2))
+                for depth in (2, 3):
+                    self.assertEqual(searcher.choose_move_minimax(board, depth),
+                                     AI(color).choose_move_minimax(board, depth))
+        finally:
+            for searcher in parallel.values():
+                searcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
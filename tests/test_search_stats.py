@@ -0,0 +1,81 @@
+import unittest
+import contextlib
+import os
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import SearchStats
+from AI import AI, SEARCH_MINIMAX
+from Board import Board, spaceState
+
+
+def _position():
+    board = Board(8)
+    board.set_bitboards(0x0000081c3c0c0000, 0x0000300000301000)
+    return board
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_alphabeta_stats(self):
+        ai = AI(spaceState.BLACK, depth=4, endgame_empties=0)
+        ai.choose_move_minimax(_position())
+        stats = ai.stats
+        self.assertEqual((stats.method, stats.depth, stats.searches), ('alphabeta', 4, 1))
+        self.assertEqual(stats.nodes, ai.nodes)
+        # one root expansion per iteration, one timing per depth
+        self.assertEqual(stats.expanded[0], 4)
+        self.assertEqual(stats.depth_searches, [0, 1, 1, 1, 1])
+        self.assertEqual(sum(stats.depth_nodes), ai.nodes)
+        self.assertGreater(stats.evaluations, 0)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertLessEqual(stats.tt_hits, stats.tt_probes)
+        self.assertEqual(len(stats.branching()), 4)
+
+    def test_minimax_counts_every_child(self):
+        ai = AI(spaceState.BLACK, depth=3, search=SEARCH_MINIMAX, endgame_empties=0)
+        ai.choose_move_minimax(_position())
+        stats = ai.stats
+        # every node below the root is some expanded node's child, and the
+        # leaves are exactly the evaluations
+        self.assertEqual(sum(stats.children), ai.nodes)
+        self.assertEqual(stats.children[2], stats.evaluations)
+        self.assertEqual(stats.cutoffs, 0)
+
+    def test_merge_and_round_trip(self):
+        ai = AI(spaceState.BLACK, depth=2, endgame_empties=0)
+        board = _position()
+        ai.choose_move_minimax(board)
+        first = ai.stats
+        ai.choose_move_minimax(board, 3)
+        second = ai.stats
+        total = SearchStats.aggregate([first, None, second])
+        self.assertEqual(total.searches, 2)
+        self.assertEqual(total.nodes, first.nodes + second.nodes)
+        self.assertEqual(total.depth_searches, [0, 2, 2, 1])
+        self.assertEqual(total.method, 'alphabeta')
+        copy = SearchStats.SearchStats.from_dict(total.to_dict())
+        self.assertEqual(copy.to_dict(), total.to_dict())
+
+    def test_profile_hook_wraps_each_search(self):
+        calls = []
+
+        @contextlib.contextmanager
+        def hook():
+            calls.append('enter')
+            yield
+            calls.append('exit')
+
+        ai = AI(spaceState.BLACK, depth=2, endgame_empties=0)
+        ai.profile_hook = hook
+        ai.choose_move_minimax(_position())
+        self.assertEqual(calls, ['enter', 'exit'])
+        ai.profile_hook = None
+        move, profile = SearchStats.profile_move(ai, _position())
+        self.assertIsNotNone(move)
+        self.assertGreater(profile.total_calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
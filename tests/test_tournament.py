@@ -0,0 +1,75 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import GameRecord
+import Tournament
+
+
+class TestTournament(unittest.TestCase):
+    def test_match_streams_records_and_tallies(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'games.jsonl')
+            summary = Tournament.run_match('greedy', 'alphabeta:1', 6, workers=1, size=6,
+                                           random_plies=2, seed=3, out=out)
+            with open(out) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(summary['games'], 6)
+        self.assertEqual(len(records), 6)
+        self.assertEqual(summary['wins'] + summary['losses'] + summary['draws'], 6)
+        # colours alternate and the random openings never repeat
+        self.assertEqual([r['black'] for r in records].count('greedy'), 3)
+        self.assertEqual(len({(r['opening'], r['black']) for r in records}), 6)
+        for r in records:
+            self.assertLessEqual(r['black_score'] + r['white_score'], 36)
+            self.assertTrue(r['moves'].startswith(r['opening']))
+
+    def test_match_aggregates_search_stats(self):
+        summary = Tournament.run_match('alphabeta:2', 'minimax:1', 2, workers=1, size=6,
+                                       random_plies=2, seed=1, stats=True)
+        a, b = summary['stats']['a'], summary['stats']['b']
+        self.assertGreater(a.searches, 0)
+        self.assertGreater(a.cutoffs, 0)
+        self.assertGreater(b.nodes, 0)
+        self.assertEqual(b.cutoffs, 0)
+
+    def test_match_archives_games(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'games.jsonl')
+            archive = os.path.join(tmp, 'games.bin')
+            Tournament.run_match('greedy', 'greedy', 4, workers=1, size=6, random_plies=2,
+                                 seed=2, out=out, archive=archive)
+            with open(out) as f:
+                records = [json.loads(line) for line in f]
+            with GameRecord.ArchiveReader(archive) as games:
+                self.assertEqual(len(games), 4)
+                for record, game in zip(records, games):
+                    self.assertNotIn('game_record', record)
+                    self.assertEqual((game.black_score, game.white_score),
+                                     (record['black_score'], record['white_score']))
+                    GameRecord.replay_bitboards(game)
+
+    def test_elo_difference(self):
+        self.assertEqual(Tournament.elo_difference(0.5), 0.0)
+        self.assertAlmostEqual(Tournament.elo_difference(0.75), 190.8, places=1)
+        self.assertEqual(Tournament.elo_difference(1.0), float('inf'))
+
+    def test_evaluator_suffix(self):
+        agent = Tournament.make_agent('alphabeta:2@pattern', None)
+        self.assertEqual(agent.depth, 2)
+        self.assertEqual(agent.evaluator.name, 'pattern')
+        with self.assertRaises(ValueError):
+            Tournament.make_agent('alphabeta:2@oracle', None)
+
+    def test_unknown_agent_rejected(self):
+        with self.assertRaises(ValueError):
+            Tournament.make_agent('oracle:9', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
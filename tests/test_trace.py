@@ -0,0 +1,44 @@
+import unittest
+import logging
+import os
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Trace
+from Game import Game
+
+
+class TestTrace(unittest.TestCase):
+    def tearDown(self):
+        Trace.disable()
+
+    def test_disabled_tracer_records_nothing(self):
+        Trace.disable()
+        with self.assertNoLogs('Board', level=logging.DEBUG):
+            Game(8).current_player.getPossibleMoves(Game(8).board)
+        self.assertEqual(Trace.snapshot(), {})
+
+    def test_play_turn_logs_one_aggregated_record(self):
+        Trace.enable()
+        game = Game(8)
+        x, y = game.current_player.getPossibleMoves(game.board)[0]
+        with self.assertLogs('Game', level=logging.DEBUG) as logs:
+            game.play_turn(x, y)
+        summaries = [line for line in logs.output if 'play_turn trace:' in line]
+        self.assertEqual(len(summaries), 1)
+        self.assertIn('getPossibleMoves=', summaries[0])
+        self.assertEqual(Trace.snapshot(), {})
+
+    def test_sampled_per_call_records(self):
+        Trace.enable(sample=4)
+        game = Game(8)
+        with self.assertLogs('Board', level=logging.DEBUG) as logs:
+            for _ in range(8):
+                game.board.is_empty(0, 0)
+        self.assertEqual(len(logs.output), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
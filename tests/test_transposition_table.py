@@ -0,0 +1,115 @@
+import unittest
+import os
+import random
+import sys
+
+# Ensure project root is importable when running tests directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import Bitboard
+import Evaluation
+import Symmetry
+import TranspositionTable as tt
+from AI import AI, SEARCH_MINIMAX
+from Board import Board, spaceState
+from Player import Player
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_incremental_hash_matches_full_hash(self):
+        board = Board(8)
+        players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+        key = tt.hash_position(board.black, board.white, True, 8)
+        turn = 0
+        for ply in range(20):
+            moves = players[turn].getPossibleMoves(board)
+            x, y = moves[ply % len(moves)]
+            own, opp = board.bitboards(players[turn].color)
+            flips = Bitboard.flip_mask(own, opp, x, y, 8)
+            key = tt.update_hash(key, Bitboard.bit(x, y, 8), flips, turn == 0, 8)
+            players[turn].makeMove(x, y, board)
+            turn = 1 - turn
+            self.assertEqual(key, tt.hash_position(board.black, board.white, turn == 0, 8))
+
+    def test_symmetric_keys_follow_moves_and_match_across_variants(self):
+        board = Board(8)
+        players = (Player(spaceState.BLACK), Player(spaceState.WHITE))
+        keys = tt.hash_variants(board.black, board.white, True, 8)
+        turn = 0
+        for ply in range(16):
+            moves = players[turn].getPossibleMoves(board)
+            x, y = moves[ply % len(moves)]
+            own, opp = board.bitboards(players[turn].color)
+            flips = Bitboard.flip_mask(own, opp, x, y, 8)
+            keys = tt.update_variants(keys, Bitboard.bit(x, y, 8), flips, turn == 0, 8)
+            players[turn].makeMove(x, y, board)
+            turn = 1 - turn
+            self.assertEqual(keys, tt.hash_variants(board.black, board.white, turn == 0, 8))
+            key, t = tt.canonical_key(keys)
+            self.assertEqual(key, tt.hash_position(Symmetry.transform(board.black, t, 8),
+                                                   Symmetry.transform(board.white, t, 8), turn == 0, 8))
+            for v in range(len(Symmetry.TRANSFORMS)):
+                variant = tt.hash_variants(Symmetry.transform(board.black, v, 8),
+                                           Symmetry.transform(board.white, v, 8), turn == 0, 8)
+                self.assertEqual(tt.canonical_key(variant)[0], key)
+
+    def test_symmetric_table_keeps_search_result(self):
+        board = Board(8)
+        self.assertTrue(Symmetry.is_symmetric(board.black, board.white, 8))
+        plain = AI(spaceState.BLACK, symmetric_tt=False)
+        shared = AI(spaceState.BLACK, symmetric_tt=True)
+        opponent = Player(spaceState.WHITE)
+        for _ in range(5):
+            move = plain.choose_move_minimax(board, 4)
+            self.assertEqual(shared.choose_move_minimax(board, 4), move)
+            plain.makeMove(move[0], move[1], board)
+            reply = opponent.getPossibleMoves(board)[-1]
+            opponent.makeMove(reply[0], reply[1], board)
+
+    def test_asymmetric_evaluator_keeps_plain_keys(self):
+        self.assertTrue(Evaluation.get_evaluator('pattern').symmetric)
+        board = Board(8)
+        defaults = Evaluation.default_tables(8)
+        for seed in range(3):
+            # random per-square weights score mirror images differently
+            rng = random.Random(seed)
+            tables = Evaluation.PatternTables(8, [rng.uniform(-50, 50) for _ in range(64)],
+                                              defaults.edges, mobility=defaults.mobility)
+            self.assertFalse(tables.is_symmetric())
+            evaluator = Evaluation.PatternEvaluator(tables)
+            self.assertFalse(evaluator.symmetric)
+            move = AI(spaceState.BLACK, evaluator=evaluator, symmetric_tt=False).choose_move_minimax(board, 4)
+            for symmetric_tt in (None, True):
+                ai = AI(spaceState.BLACK, evaluator=evaluator, symmetric_tt=symmetric_tt)
+                self.assertEqual(ai.choose_move_minimax(board, 4), move)
+
+    def test_depth_preferred_replacement(self):
+        table = tt.TranspositionTable(max_bytes=1)
+        self.assertEqual(table.buckets, 1)
+        table.store(1, 5, 0.5, tt.EXACT, 0)
+        table.store(2, 2, 0.1, tt.EXACT, 0)
+        # the deeper entry keeps its slot, the shallower one goes to the other tier
+        self.assertEqual(table.probe(1)[1], 5)
+        self.assertEqual(table.probe(2)[1], 2)
+        table.store(3, 1, 0.2, tt.LOWER, 0)
+        self.assertIsNone(table.probe(2))
+        self.assertIsNotNone(table.probe(1))
+        stats = table.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['collisions']), (3, 1, 1))
+
+    def test_table_reused_across_moves_keeps_minimax_choice(self):
+        board = Board(8)
+        searcher = AI(spaceState.BLACK, depth=3)
+        reference = AI(spaceState.BLACK, depth=3, search=SEARCH_MINIMAX)
+        opponent = Player(spaceState.WHITE)
+        for _ in range(6):
+            move = searcher.choose_move_minimax(board)
+            self.assertEqual(move, reference.choose_move_minimax(board))
+            searcher.makeMove(move[0], move[1], board)
+            reply = opponent.getPossibleMoves(board)[0]
+            opponent.makeMove(reply[0], reply[1], board)
+        self.assertGreater(searcher.tt.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()